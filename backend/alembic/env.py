@@ -0,0 +1,57 @@
+from logging.config import fileConfig
+
+from sqlalchemy import engine_from_config, pool
+
+from alembic import context
+
+from app.core.config import settings
+from app.models.base import Base
+import app.models  # noqa: F401  (registra todos os modelos no metadata)
+
+# Objeto de configuração do Alembic (acesso ao alembic.ini)
+config = context.config
+
+# A URL do banco sempre vem das configurações da aplicação
+config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
+
+# Configuração de logging do alembic.ini
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+# Metadata usado pelo --autogenerate
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Executa as migrações em modo 'offline' (gera apenas o SQL)"""
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Executa as migrações conectado ao banco"""
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
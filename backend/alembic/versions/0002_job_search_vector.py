@@ -0,0 +1,38 @@
+"""job full-text search vector
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 22:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Cópia fixa da expressão de app.models.user.JOB_SEARCH_DOCUMENT nesta revisão
+JOB_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(requirements, '')), 'B') || "
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({JOB_SEARCH_DOCUMENT}) STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_jobs_search_vector")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,39 @@
+"""keyset pagination indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 22:41:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_jobs_active_created_at_id "
+        "ON jobs (created_at DESC, id DESC) WHERE is_active"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_jobs_company_created_at_id "
+        "ON jobs (company_id, created_at DESC, id DESC)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_applications_job_created_at_id "
+        "ON applications (job_id, created_at DESC, id DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_applications_job_created_at_id")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_company_created_at_id")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_active_created_at_id")
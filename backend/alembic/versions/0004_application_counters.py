@@ -0,0 +1,61 @@
+"""denormalized application counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 22:42:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ['PENDING', 'REVIEWED', 'INTERVIEW', 'ACCEPTED', 'REJECTED']
+COUNTER_COLUMNS = ['application_count'] + [f'{s.lower()}_application_count' for s in STATUSES]
+
+
+def upgrade() -> None:
+    for table in ('jobs', 'companies'):
+        for column in COUNTER_COLUMNS:
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} INTEGER NOT NULL DEFAULT 0"
+            )
+
+    # Preenche os contadores a partir das aplicações existentes
+    status_counts = ", ".join(
+        f"count(a.id) FILTER (WHERE a.status = '{s}') AS {s.lower()}_application_count"
+        for s in STATUSES
+    )
+    assignments = ", ".join(f"{c} = t.{c}" for c in COUNTER_COLUMNS)
+    op.execute(f"""
+        UPDATE jobs AS j SET {assignments}
+        FROM (
+            SELECT jobs.id AS job_id, count(a.id) AS application_count, {status_counts}
+            FROM jobs LEFT JOIN applications a ON a.job_id = jobs.id
+            GROUP BY jobs.id
+        ) AS t
+        WHERE j.id = t.job_id
+    """)
+    sums = ", ".join(f"coalesce(sum(jobs.{c}), 0) AS {c}" for c in COUNTER_COLUMNS)
+    op.execute(f"""
+        UPDATE companies AS c SET {assignments}
+        FROM (
+            SELECT companies.id AS company_id, {sums}
+            FROM companies LEFT JOIN jobs ON jobs.company_id = companies.id
+            GROUP BY companies.id
+        ) AS t
+        WHERE c.id = t.company_id
+    """)
+
+
+def downgrade() -> None:
+    for table in ('jobs', 'companies'):
+        for column in COUNTER_COLUMNS:
+            op.drop_column(table, column)
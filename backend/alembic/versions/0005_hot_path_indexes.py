@@ -0,0 +1,87 @@
+"""hot path indexes and unique application per candidate
+
+Índices para os filtros de jobs.py, company.py e auth/profile:
+- jobs (company_id) WHERE is_active: vagas ativas de uma empresa
+- companies (user_id) e profiles (user_id): busca do perfil do usuário logado
+- UNIQUE applications (candidate_id, job_id): impede candidaturas duplicadas
+  e atende às consultas por candidato (coluna inicial do índice)
+
+applications.job_id, jobs.company_id e jobs.is_active já são atendidos pelos
+índices compostos/parciais da revisão 0003.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 22:43:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ['PENDING', 'REVIEWED', 'INTERVIEW', 'ACCEPTED', 'REJECTED']
+COUNTER_COLUMNS = ['application_count'] + [f'{s.lower()}_application_count' for s in STATUSES]
+
+
+def _recount_application_counters() -> None:
+    """Recalcula os contadores da revisão 0004 após remover duplicatas"""
+    status_counts = ", ".join(
+        f"count(a.id) FILTER (WHERE a.status = '{s}') AS {s.lower()}_application_count"
+        for s in STATUSES
+    )
+    assignments = ", ".join(f"{c} = t.{c}" for c in COUNTER_COLUMNS)
+    op.execute(f"""
+        UPDATE jobs AS j SET {assignments}
+        FROM (
+            SELECT jobs.id AS job_id, count(a.id) AS application_count, {status_counts}
+            FROM jobs LEFT JOIN applications a ON a.job_id = jobs.id
+            GROUP BY jobs.id
+        ) AS t
+        WHERE j.id = t.job_id
+    """)
+    sums = ", ".join(f"coalesce(sum(jobs.{c}), 0) AS {c}" for c in COUNTER_COLUMNS)
+    op.execute(f"""
+        UPDATE companies AS c SET {assignments}
+        FROM (
+            SELECT companies.id AS company_id, {sums}
+            FROM companies LEFT JOIN jobs ON jobs.company_id = companies.id
+            GROUP BY companies.id
+        ) AS t
+        WHERE c.id = t.company_id
+    """)
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_jobs_company_active ON jobs (company_id) WHERE is_active")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_companies_user_id ON companies (user_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_profiles_user_id ON profiles (user_id)")
+
+    constraints = sa.inspect(op.get_bind()).get_unique_constraints('applications')
+    if not any(c['name'] == 'uq_applications_candidate_job' for c in constraints):
+        # Remove candidaturas duplicadas, mantendo a mais antiga
+        removed = op.get_bind().execute(sa.text("""
+            DELETE FROM applications a
+            USING applications b
+            WHERE a.candidate_id = b.candidate_id
+              AND a.job_id = b.job_id
+              AND a.id > b.id
+        """)).rowcount
+        if removed:
+            _recount_application_counters()
+        op.create_unique_constraint(
+            'uq_applications_candidate_job', 'applications', ['candidate_id', 'job_id']
+        )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_applications_candidate_job', 'applications', type_='unique')
+    op.execute("DROP INDEX IF EXISTS ix_profiles_user_id")
+    op.execute("DROP INDEX IF EXISTS ix_companies_user_id")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_company_active")
@@ -0,0 +1,58 @@
+"""ai usage rollups
+
+Tabela com o consumo agregado das chamadas de IA (tokens, segundos de áudio,
+caracteres de TTS, latência e custo estimado) por rota, provedor e modelo,
+gravada periodicamente por cada worker.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 23:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_usage_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('period_end', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('worker', sa.String(length=255), nullable=False),
+        sa.Column('route', sa.String(length=255), nullable=False),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('operation', sa.String(length=50), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('calls', sa.Integer(), nullable=False),
+        sa.Column('errors', sa.Integer(), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False),
+        sa.Column('audio_seconds', sa.Float(), nullable=False),
+        sa.Column('characters', sa.Integer(), nullable=False),
+        sa.Column('latency_ms_total', sa.Float(), nullable=False),
+        sa.Column('latency_ms_max', sa.Float(), nullable=False),
+        sa.Column('cost_usd', sa.Numeric(precision=12, scale=6), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ai_usage_rollups_id'), 'ai_usage_rollups', ['id'], unique=False)
+    op.create_index('ix_ai_usage_rollups_period_start', 'ai_usage_rollups', ['period_start'], unique=False)
+    op.create_index('ix_ai_usage_rollups_route_period', 'ai_usage_rollups', ['route', 'period_start'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_usage_rollups_route_period', table_name='ai_usage_rollups')
+    op.drop_index('ix_ai_usage_rollups_period_start', table_name='ai_usage_rollups')
+    op.drop_index(op.f('ix_ai_usage_rollups_id'), table_name='ai_usage_rollups')
+    op.drop_table('ai_usage_rollups')
@@ -0,0 +1,36 @@
+"""interview sessions
+
+Colunas para guardar no servidor as sessões do chatbot de entrevista
+(session_id, configuração e histórico), para que cada turno envie só a
+nova mensagem.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 23:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('interview_simulations', sa.Column('session_id', sa.String(length=64), nullable=True))
+    op.add_column('interview_simulations', sa.Column('config', sa.Text(), nullable=True))
+    op.add_column('interview_simulations', sa.Column('conversation_history', sa.Text(), nullable=True))
+    op.create_index(op.f('ix_interview_simulations_session_id'), 'interview_simulations', ['session_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_interview_simulations_session_id'), table_name='interview_simulations')
+    op.drop_column('interview_simulations', 'conversation_history')
+    op.drop_column('interview_simulations', 'config')
+    op.drop_column('interview_simulations', 'session_id')
@@ -0,0 +1,31 @@
+"""interview history summary
+
+Resumo incremental das mensagens mais antigas de cada sessão do chatbot de
+entrevista e quantas mensagens ele já cobre.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('interview_simulations', sa.Column('history_summary', sa.Text(), nullable=True))
+    op.add_column('interview_simulations', sa.Column('summarized_messages', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('interview_simulations', 'summarized_messages')
+    op.drop_column('interview_simulations', 'history_summary')
@@ -0,0 +1,47 @@
+"""interview questions
+
+Banco de perguntas de entrevista pré-geradas por tipo, nível e área de foco,
+usado para abrir as entrevistas sem esperar o LLM.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'interview_questions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('interview_type', sa.String(length=50), nullable=False),
+        sa.Column('difficulty_level', sa.String(length=50), nullable=False),
+        sa.Column('focus_area', sa.String(length=100), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('question_type', sa.String(length=50), nullable=True),
+        sa.Column('question_text', sa.Text(), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_interview_questions_id'), 'interview_questions', ['id'], unique=False)
+    op.create_index('ix_interview_questions_pool', 'interview_questions', ['interview_type', 'difficulty_level', 'focus_area', 'kind'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_interview_questions_pool', table_name='interview_questions')
+    op.drop_index(op.f('ix_interview_questions_id'), table_name='interview_questions')
+    op.drop_table('interview_questions')
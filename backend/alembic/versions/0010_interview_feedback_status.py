@@ -0,0 +1,29 @@
+"""interview feedback status
+
+Estado da geração do feedback da entrevista, que passou a rodar em segundo
+plano (pending, running, completed, failed).
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 01:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('interview_simulations', sa.Column('feedback_status', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('interview_simulations', 'feedback_status')
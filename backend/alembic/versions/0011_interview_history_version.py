@@ -0,0 +1,33 @@
+"""interview history version
+
+Versão do histórico de cada sessão do chatbot de entrevista, incrementada a
+cada gravação; os workers comparam com a cópia em memória e as gravações são
+condicionais, então turnos atendidos por workers diferentes não se perdem.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'interview_simulations',
+        sa.Column('history_version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('interview_simulations', 'history_version')
@@ -1,39 +1,49 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from datetime import timedelta
 from typing import Optional
 
-from ..db.database import get_db
+from ..db.database import AsyncSessionLocal, get_async_db
 from ..models.user import User, Profile, Company, UserType
 from ..schemas.user import UserCreate, User as UserSchema, Token
 from ..core.security import (
-    verify_password, 
-    get_password_hash, 
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
-    get_current_user_email
+    verify_token
 )
 from ..core.config import settings
+from ..core.user_cache import user_cache
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 # Configuração OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+# Mesma origem do token, mas sem 401 automático (rotas com outras formas de acesso)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """Autentica um usuário verificando email e senha"""
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    valid, new_hash = await verify_password_async(password, user.password_hash)
+    if not valid:
         return None
+    if new_hash:
+        # Custo do bcrypt mudou: atualiza o hash aproveitando a senha em claro
+        user.password_hash = new_hash
+        await db.commit()
     return user
 
 @router.post("/register", response_model=UserSchema)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Registra um novo usuário"""
     # Verificar se o email já existe
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -41,7 +51,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Criar novo usuário
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -49,8 +59,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # Criar perfil padrão para o usuário
     if user_data.user_type == UserType.CANDIDATE:
@@ -71,7 +81,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
             experience_summary=""
         )
         db.add(profile)
-        db.commit()
+        await db.commit()
     elif user_data.user_type == UserType.COMPANY:
         company = Company(
             user_id=db_user.id,
@@ -85,14 +95,14 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
             inclusion_policies=""
         )
         db.add(company)
-        db.commit()
+        await db.commit()
     
     return db_user
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """Faz login do usuário e retorna token JWT"""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -109,36 +119,63 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     # Criar token de acesso
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "uid": user.id, "type": user.user_type.value},
+        expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
     """Obtém o usuário atual baseado no token JWT"""
-    print(f'🔍 Validando token: {token[:20]}...' if token else '❌ Token não fornecido')
-    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    email = get_current_user_email(token)
-    print(f'📧 Email extraído do token: {email}')
+    payload = verify_token(token)
+    if payload is None:
+        raise credentials_exception
     
-    if email is None:
-        print('❌ Email não encontrado no token')
+    user_id = payload.get("uid")
+    if user_id is not None:
+        user = user_cache.get(user_id)
+        if user is not None:
+            return user
+        condition = User.id == user_id
+    elif payload.get("sub") is not None:
+        # Tokens emitidos antes da claim uid
+        condition = User.email == payload["sub"]
+    else:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    # O perfil é carregado junto: lazy load não funciona com a sessão assíncrona
+    user = await db.scalar(select(User).options(selectinload(User.profile)).where(condition))
     if user is None:
-        print(f'❌ Usuário não encontrado no banco para email: {email}')
         raise credentials_exception
     
-    print(f'✅ Usuário autenticado: {user.id} ({user.email})')
+    # A instância é compartilhada entre requisições pelo cache,
+    # então sai da sessão desta requisição
+    db.expunge(user)
+    if user.profile is not None:
+        db.expunge(user.profile)
+    user_cache.set(user)
     return user
 
+async def get_websocket_user(token: str) -> Optional[User]:
+    """
+    Usuário do token recebido numa conexão WebSocket, ou None se inválido. O
+    navegador não envia o header Authorization no WebSocket e o token não vai
+    na URL (acabaria em logs de acesso e proxies): o cliente o envia na
+    primeira mensagem. A sessão do banco é fechada logo após a consulta para
+    não prender uma conexão do pool enquanto o WebSocket estiver aberto.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            return await get_current_user(token, db)
+    except HTTPException:
+        return None
+
 @router.get("/me", response_model=UserSchema)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Retorna informações do usuário atual"""
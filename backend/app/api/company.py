@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from typing import List, Optional
 from datetime import datetime
 
-from ..db.database import get_db
+from ..db.database import get_async_db, get_async_read_db
+from ..db.application_counters import counter_updates, job_removed_updates
 from ..models.user import User, Company, Job
-from ..models.application import Application
+from ..models.application import Application, ApplicationStatus
 from ..schemas.company import (
     Company as CompanySchema,
     CompanyCreate,
@@ -15,13 +17,14 @@ from ..schemas.company import (
 )
 from ..schemas.job import Job as JobSchema, JobCreate, JobUpdate
 from ..api.auth import get_current_user
+from ..utils.pagination import apply_keyset, next_cursor, set_next_cursor
 
 router = APIRouter(prefix="/company", tags=["company"])
 
 @router.get("/profile", response_model=CompanySchema)
 async def get_company_profile(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Retorna o perfil da empresa do usuário logado"""
     
@@ -31,7 +34,7 @@ async def get_company_profile(
             detail="Apenas empresas podem acessar este endpoint"
         )
     
-    company = db.query(Company).filter(Company.user_id == current_user.id).first()
+    company = await db.scalar(select(Company).where(Company.user_id == current_user.id))
     
     if not company:
         # Criar perfil padrão da empresa se não existir
@@ -47,11 +50,11 @@ async def get_company_profile(
             inclusion_policies=""
         )
         db.add(company)
-        db.commit()
-        db.refresh(company)
+        await db.commit()
+        await db.refresh(company)
     
     # Contar vagas
-    job_count = db.query(Job).filter(Job.company_id == company.id).count()
+    job_count = await db.scalar(select(func.count(Job.id)).where(Job.company_id == company.id))
     
     return {
         "id": company.id,
@@ -78,7 +81,7 @@ async def get_company_profile(
 async def update_company_profile(
     company_update: CompanyUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualiza o perfil da empresa"""
     
@@ -88,7 +91,7 @@ async def update_company_profile(
             detail="Apenas empresas podem acessar este endpoint"
         )
     
-    company = db.query(Company).filter(Company.user_id == current_user.id).first()
+    company = await db.scalar(select(Company).where(Company.user_id == current_user.id))
     
     if not company:
         # Criar novo perfil da empresa
@@ -101,11 +104,11 @@ async def update_company_profile(
         for field, value in update_data.items():
             setattr(company, field, value)
     
-    db.commit()
-    db.refresh(company)
+    await db.commit()
+    await db.refresh(company)
     
     # Contar vagas
-    job_count = db.query(Job).filter(Job.company_id == company.id).count()
+    job_count = await db.scalar(select(func.count(Job.id)).where(Job.company_id == company.id))
     
     return {
         "id": company.id,
@@ -132,7 +135,7 @@ async def update_company_profile(
 async def create_job(
     job_data: JobCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Cria uma nova vaga"""
     
@@ -143,7 +146,7 @@ async def create_job(
         )
     
     # Verificar se a empresa tem perfil
-    company = db.query(Company).filter(Company.user_id == current_user.id).first()
+    company = await db.scalar(select(Company).where(Company.user_id == current_user.id))
     if not company:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -165,8 +168,8 @@ async def create_job(
     )
     
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    await db.commit()
+    await db.refresh(job)
     
     return {
         "id": job.id,
@@ -196,8 +199,11 @@ async def create_job(
 
 @router.get("/jobs", response_model=List[JobSchema])
 async def get_company_jobs(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Número de resultados por página"),
+    after: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Lista todas as vagas da empresa"""
     
@@ -207,20 +213,21 @@ async def get_company_jobs(
             detail="Apenas empresas podem acessar este endpoint"
         )
     
-    company = db.query(Company).filter(Company.user_id == current_user.id).first()
+    company = await db.scalar(select(Company).where(Company.user_id == current_user.id))
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Perfil da empresa não encontrado"
         )
     
-    jobs = db.query(Job).filter(Job.company_id == company.id).all()
+    query = apply_keyset(select(Job).where(Job.company_id == company.id), Job, after)
+    if limit:
+        query = query.limit(limit)
+    jobs = (await db.scalars(query)).all()
+    set_next_cursor(response, next_cursor(jobs, limit))
     
     result = []
     for job in jobs:
-        # Contar aplicações
-        application_count = db.query(Application).filter(Application.job_id == job.id).count()
-        
         result.append({
             "id": job.id,
             "title": job.title,
@@ -244,7 +251,7 @@ async def get_company_jobs(
                 "location": company.location,
                 "is_inclusive": company.is_inclusive
             },
-            "application_count": application_count
+            "application_count": job.application_count
         })
     
     return result
@@ -254,7 +261,7 @@ async def update_job(
     job_id: int,
     job_update: JobUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualiza uma vaga"""
     
@@ -265,14 +272,14 @@ async def update_job(
         )
     
     # Verificar se a vaga existe e pertence à empresa
-    company = db.query(Company).filter(Company.user_id == current_user.id).first()
+    company = await db.scalar(select(Company).where(Company.user_id == current_user.id))
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Perfil da empresa não encontrado"
         )
     
-    job = db.query(Job).filter(Job.id == job_id, Job.company_id == company.id).first()
+    job = await db.scalar(select(Job).where(Job.id == job_id, Job.company_id == company.id))
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -284,11 +291,8 @@ async def update_job(
     for field, value in update_data.items():
         setattr(job, field, value)
     
-    db.commit()
-    db.refresh(job)
-    
-    # Contar aplicações
-    application_count = db.query(Application).filter(Application.job_id == job.id).count()
+    await db.commit()
+    await db.refresh(job)
     
     return {
         "id": job.id,
@@ -313,14 +317,14 @@ async def update_job(
             "location": company.location,
             "is_inclusive": company.is_inclusive
         },
-        "application_count": application_count
+        "application_count": job.application_count
     }
 
 @router.delete("/jobs/{job_id}")
 async def delete_job(
     job_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Deleta uma vaga"""
     
@@ -331,30 +335,32 @@ async def delete_job(
         )
     
     # Verificar se a vaga existe e pertence à empresa
-    company = db.query(Company).filter(Company.user_id == current_user.id).first()
+    company = await db.scalar(select(Company).where(Company.user_id == current_user.id))
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Perfil da empresa não encontrado"
         )
     
-    job = db.query(Job).filter(Job.id == job_id, Job.company_id == company.id).first()
+    job = await db.scalar(select(Job).where(Job.id == job_id, Job.company_id == company.id))
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Vaga não encontrada ou não pertence à sua empresa"
         )
     
-    # Deletar vaga
-    db.delete(job)
-    db.commit()
+    # Deletar vaga, descontando seus contadores dos totais da empresa
+    for statement in job_removed_updates(job):
+        await db.execute(statement)
+    await db.delete(job)
+    await db.commit()
     
     return {"message": "Vaga deletada com sucesso"}
 
 @router.get("/stats", response_model=CompanyStats)
 async def get_company_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Retorna estatísticas da empresa"""
     
@@ -364,31 +370,29 @@ async def get_company_stats(
             detail="Apenas empresas podem acessar este endpoint"
         )
     
-    company = db.query(Company).filter(Company.user_id == current_user.id).first()
+    company = await db.scalar(select(Company).where(Company.user_id == current_user.id))
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Perfil da empresa não encontrado"
         )
     
-    # Contar vagas
-    total_jobs = db.query(Job).filter(Job.company_id == company.id).count()
-    active_jobs = db.query(Job).filter(Job.company_id == company.id, Job.is_active == True).count()
-    
-    # Contar aplicações
-    job_ids = [job.id for job in db.query(Job).filter(Job.company_id == company.id).all()]
-    total_applications = db.query(Application).filter(Application.job_id.in_(job_ids)).count()
-    pending_applications = db.query(Application).filter(Application.job_id.in_(job_ids), Application.status == "pending").count()
-    accepted_applications = db.query(Application).filter(Application.job_id.in_(job_ids), Application.status == "accepted").count()
-    rejected_applications = db.query(Application).filter(Application.job_id.in_(job_ids), Application.status == "rejected").count()
+    # Contar vagas (total e ativas) em uma única consulta
+    total_jobs, active_jobs = (await db.execute(
+        select(
+            func.count(Job.id),
+            func.count(Job.id).filter(Job.is_active == True)
+        ).where(Job.company_id == company.id)
+    )).one()
     
+    # Aplicações vêm dos contadores mantidos pela empresa
     return CompanyStats(
         total_jobs=total_jobs,
         active_jobs=active_jobs,
-        total_applications=total_applications,
-        pending_applications=pending_applications,
-        accepted_applications=accepted_applications,
-        rejected_applications=rejected_applications
+        total_applications=company.application_count,
+        pending_applications=company.pending_application_count,
+        accepted_applications=company.accepted_application_count,
+        rejected_applications=company.rejected_application_count
     )
 
 @router.put("/applications/{application_id}/status")
@@ -396,7 +400,7 @@ async def update_application_status(
     application_id: int,
     status_update: ApplicationStatusUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualiza o status de uma aplicação"""
     
@@ -407,7 +411,7 @@ async def update_application_status(
         )
     
     # Verificar se a aplicação existe
-    application = db.query(Application).filter(Application.id == application_id).first()
+    application = await db.scalar(select(Application).where(Application.id == application_id))
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -415,8 +419,10 @@ async def update_application_status(
         )
     
     # Verificar se a vaga pertence à empresa
-    job = db.query(Job).filter(Job.id == application.job_id).first()
-    company = db.query(Company).filter(Company.id == job.company_id, Company.user_id == current_user.id).first()
+    job = await db.scalar(select(Job).where(Job.id == application.job_id))
+    company = await db.scalar(
+        select(Company).where(Company.id == job.company_id, Company.user_id == current_user.id)
+    )
     
     if not company:
         raise HTTPException(
@@ -424,9 +430,21 @@ async def update_application_status(
             detail="Aplicação não pertence à sua empresa"
         )
     
-    # Atualizar status
-    application.status = status_update.status
-    db.commit()
-    db.refresh(application)
+    try:
+        new_status = ApplicationStatus(status_update.status)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Status de aplicação inválido"
+        )
+    
+    # Atualizar status e contadores na mesma transação
+    old_status = application.status
+    application.status = new_status
+    if old_status != new_status:
+        for statement in counter_updates(job.id, job.company_id, added=new_status, removed=old_status):
+            await db.execute(statement)
+    await db.commit()
+    await db.refresh(application)
     
     return {"message": "Status da aplicação atualizado com sucesso"}
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, HTTPException
+import asyncio
 from PIL import Image
 import os
 import io
 import hashlib
 import base64
 from dotenv import load_dotenv
-from ..utils.openai_client import get_openai_client
+from ..utils.openai_client import get_async_openai_client
+from ..utils.llm_cache import llm_cache, make_cache_key
+from ..utils.bulkhead import BulkheadFullError
+from ..utils.resilience import call_upstream
+from ..core.config import settings
 
 # Carrega chave do .env
 load_dotenv()
@@ -29,8 +34,11 @@ def sha256_bytes(b: bytes) -> str:
     h.update(b)
     return h.hexdigest()
 
-def descrever_imagem_(caminho_imagem: str, prompt_extra: str | None = None) -> str:
-    img_bytes, mime = preprocess_image_bytes(caminho_imagem, max_width=1024, jpeg_quality=75)
+async def descrever_imagem_(caminho_imagem: str, prompt_extra: str | None = None) -> str:
+    # Redimensionamento com PIL é CPU intensivo: roda fora do event loop
+    img_bytes, mime = await asyncio.to_thread(
+        preprocess_image_bytes, caminho_imagem, max_width=1024, jpeg_quality=75
+    )
 
     base_prompt = """
     <persona>
@@ -97,31 +105,43 @@ def descrever_imagem_(caminho_imagem: str, prompt_extra: str | None = None) -> s
     else:
         full_prompt = base_prompt
 
-    data_url = f"data:{mime};base64,{base64.b64encode(img_bytes).decode('utf-8')}"
-    try:
-        client = get_openai_client()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": full_prompt},
-                        {"type": "image_url", "image_url": {"url": data_url}},
-                    ],
-                }
-            ],
-            max_tokens=600,
-            temperature=0.0,
+    async def solicitar_descricao() -> str:
+        data_url = f"data:{mime};base64,{base64.b64encode(img_bytes).decode('utf-8')}"
+        client = get_async_openai_client()
+        response = await call_upstream(
+            "openai",
+            lambda: client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": full_prompt},
+                            {"type": "image_url", "image_url": {"url": data_url}},
+                        ],
+                    }
+                ],
+                max_tokens=600,
+                temperature=0.0,
+                timeout=settings.openai_vision_timeout
+            ),
+            bulkhead="openai_vision",
+            operation="vision",
+            model="gpt-4o-mini"
         )
+        return response.choices[0].message.content
 
-        descricao = response.choices[0].message.content
-        return descricao
+    # A chave usa o hash da imagem já processada: a mesma tela não é descrita duas vezes
+    cache_key = make_cache_key("gpt-4o-mini", full_prompt, max_tokens=600, temperature=0.0, image=sha256_bytes(img_bytes))
+    try:
+        return await llm_cache.get_or_set("image_description", cache_key, solicitar_descricao)
+    except BulkheadFullError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao chamar API: {e}")
 
 @router.post("/imagem")
-def descrever_imagem(nome_arquivo: str, prompt_extra: str | None = None):
+async def descrever_imagem(nome_arquivo: str, prompt_extra: str | None = None):
     # Defina o diretório base DENTRO do container
     diretorio_base_container = "/app/screenshots"
     
@@ -137,5 +157,5 @@ def descrever_imagem(nome_arquivo: str, prompt_extra: str | None = None):
         raise HTTPException(status_code=404, detail="Arquivo não encontrado.")
 
     # Chame a função interna com o caminho completo e correto
-    descricao = descrever_imagem_(caminho_completo, prompt_extra)
+    descricao = await descrever_imagem_(caminho_completo, prompt_extra)
     return {"descricao": descricao}
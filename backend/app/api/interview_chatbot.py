@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from functools import lru_cache
 from datetime import datetime
 import httpx
 import os
@@ -11,6 +13,15 @@ from ..db.database import get_db
 from ..models.user import User
 from ..api.auth import get_current_user
 from ..schemas.simulation import SimulationConfig, SimulationAnswer
+from ..core.config import settings
+from ..utils.perplexity_client import get_perplexity_client
+from ..utils.bulkhead import BulkheadFullError, bulkhead
+from ..utils.resilience import call_upstream
+from ..utils.ai_usage import ai_usage
+from ..utils.interview_sessions import InterviewSession, interview_sessions
+from ..utils.interview_memory import format_transcript, prompt_context, recent_window_start, schedule_summary
+from ..utils.interview_feedback import FeedbackJob, feedback_jobs
+from ..utils.question_bank import question_bank
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -18,15 +29,16 @@ load_dotenv()
 router = APIRouter(prefix="/interview-chatbot", tags=["interview-chatbot"])
 
 # Configuração da API da Perplexity
-API_KEY = os.getenv("PERPLEXITY_API_KEY")
+API_KEY = settings.perplexity_api_key or os.getenv("PERPLEXITY_API_KEY")
 
-# Função para fazer chamadas diretas à API da Perplexity usando httpx
-async def call_perplexity_api(messages: List[dict], model: str = "sonar-pro") -> str:
-    """Faz chamada direta à API da Perplexity usando httpx"""
+# Modelos tentados em ordem pelo entrevistador (o segundo é o fallback)
+INTERVIEW_MODELS = ["llama-3.1-sonar-small-128k-online", "sonar-pro"]
+
+def validate_perplexity_messages(messages: List[dict]):
+    """Valida o formato das mensagens antes de enviar à Perplexity"""
     if not API_KEY:
         raise ValueError("PERPLEXITY_API_KEY não configurada")
     
-    # Validar formato das mensagens
     for i, msg in enumerate(messages):
         if not isinstance(msg, dict) or "role" not in msg or "content" not in msg:
             raise ValueError(f"Mensagem {i} inválida: {msg}")
@@ -34,8 +46,13 @@ async def call_perplexity_api(messages: List[dict], model: str = "sonar-pro") ->
             raise ValueError(f"Role inválida na mensagem {i}: {msg['role']}")
         if not isinstance(msg["content"], str) or not msg["content"].strip():
             raise ValueError(f"Conteúdo inválido na mensagem {i}: {msg['content']}")
+
+# Função para fazer chamadas diretas à API da Perplexity usando httpx
+async def call_perplexity_api(messages: List[dict], model: str = "sonar-pro") -> str:
+    """Faz chamada direta à API da Perplexity usando httpx"""
+    validate_perplexity_messages(messages)
     
-    url = "https://api.perplexity.ai/chat/completions"
+    url = "/chat/completions"
     headers = {
         "Authorization": f"Bearer {API_KEY}",
         "Content-Type": "application/json"
@@ -49,24 +66,89 @@ async def call_perplexity_api(messages: List[dict], model: str = "sonar-pro") ->
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload, timeout=30.0)
+        # Cliente compartilhado: reaproveita conexões (keep-alive/HTTP/2) entre mensagens
+        client = get_perplexity_client()
+        
+        async def post_completion() -> httpx.Response:
+            response = await client.post(url, headers=headers, json=payload)
             response.raise_for_status()
-            
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
-            
+            return response
+        
+        # Breaker e retries com jitter (429/5xx/timeouts) dentro do orçamento de tempo
+        response = await call_upstream(
+            "perplexity", post_completion, bulkhead="perplexity", operation="chat", model=model
+        )
+        
+        data = response.json()
+        return data["choices"][0]["message"]["content"]
+    
     except httpx.HTTPStatusError as e:
         error_detail = e.response.text
         print(f"Erro HTTP na API Perplexity: {e.response.status_code}")
         print(f"Detalhes do erro: {error_detail}")
         print(f"Payload enviado: {json.dumps(payload, indent=2, ensure_ascii=False)}")
         raise Exception(f"Erro na API Perplexity ({e.response.status_code}): {error_detail}")
+    except BulkheadFullError:
+        raise
     except Exception as e:
         print(f"Erro ao chamar API Perplexity: {e}")
         print(f"Payload enviado: {json.dumps(payload, indent=2, ensure_ascii=False)}")
         raise Exception(f"Erro técnico: {str(e)}")
 
+async def stream_perplexity_api(messages: List[dict], model: str = "sonar-pro") -> AsyncIterator[str]:
+    """Versão em streaming de call_perplexity_api: produz os trechos da resposta conforme chegam"""
+    validate_perplexity_messages(messages)
+    
+    headers = {
+        "Authorization": f"Bearer {API_KEY}",
+        "Content-Type": "application/json",
+        "Accept": "text/event-stream"
+    }
+    payload = {
+        "model": model,
+        "messages": messages,
+        "max_tokens": 1000,
+        "temperature": 0.7,
+        "stream": True
+    }
+    client = get_perplexity_client()
+    
+    async def open_stream() -> httpx.Response:
+        request = client.build_request("POST", "/chat/completions", headers=headers, json=payload)
+        response = await client.send(request, stream=True)
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+        return response
+    
+    # A vaga do bulkhead fica ocupada até o fim do stream; os retries do
+    # call_upstream valem apenas para a abertura (antes do primeiro token)
+    async with bulkhead("perplexity"):
+        response = await call_upstream("perplexity", open_stream, operation="chat_stream", model=model)
+        usage = None
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                usage = chunk.get("usage") or usage
+                choices = chunk.get("choices") or []
+                content = choices[0].get("delta", {}).get("content") if choices else None
+                if content:
+                    yield content
+        finally:
+            await response.aclose()
+            if usage:
+                ai_usage.record_tokens(
+                    "perplexity", "chat_stream", model,
+                    prompt_tokens=usage.get("prompt_tokens") or 0,
+                    completion_tokens=usage.get("completion_tokens") or 0
+                )
+
 def validate_message_alternation(messages: List[dict]) -> List[dict]:
     """Valida e corrige a alternância de mensagens user/assistant"""
     if len(messages) <= 1:  # Apenas system message
@@ -110,15 +192,23 @@ def validate_message_alternation(messages: List[dict]) -> List[dict]:
     
     return validated_messages
 
-def build_conversation_context(conversation_history: List[dict] = None) -> str:
-    """Constrói um resumo do contexto da conversa para o modelo - genérico para qualquer área"""
-    if not conversation_history or len(conversation_history) == 0:
+def build_conversation_context(conversation_history: List[dict] = None, summary: str = "") -> str:
+    """
+    Constrói um resumo do contexto da conversa para o modelo - genérico para qualquer área.
+    summary é o resumo incremental dos turnos que já saíram do histórico recente.
+    """
+    if not conversation_history and not summary:
         return ""
     
     context_parts = []
     
+    if summary:
+        context_parts.append("RESUMO DA ENTREVISTA ATÉ AQUI (turnos anteriores):")
+        context_parts.append(summary)
+        context_parts.append("")
+    
     # Analisar as respostas do candidato para extrair informações importantes
-    candidate_responses = [msg for msg in conversation_history if msg.get("role") == "candidate"]
+    candidate_responses = [msg for msg in conversation_history or [] if msg.get("role") == "candidate"]
     
     if candidate_responses:
         context_parts.append("CONTEXTO DA CONVERSA ATÉ AGORA:")
@@ -208,8 +298,9 @@ def build_conversation_context(conversation_history: List[dict] = None) -> str:
             for mention in education_mentions[:2]:  # Limitar a 2 menções
                 context_parts.append(f"- {mention}")
             context_parts.append("")
-        
-        # Adicionar instruções genéricas para usar o contexto
+    
+    # Adicionar instruções genéricas para usar o contexto
+    if context_parts:
         context_parts.append("INSTRUÇÕES PARA USAR O CONTEXTO:")
         context_parts.append("- Use essas informações para fazer perguntas de follow-up relevantes")
         context_parts.append("- Referencie experiências e competências mencionadas pelo candidato")
@@ -224,39 +315,39 @@ def build_conversation_context(conversation_history: List[dict] = None) -> str:
     
     return "\n".join(context_parts)
 
+# Mapear áreas de foco para tipos de vaga (genérico)
+JOB_TYPE_BY_FOCUS_AREA = {
+    # Tecnologia
+    "frontend": "Desenvolvedor Frontend",
+    "backend": "Desenvolvedor Backend", 
+    "fullstack": "Desenvolvedor Full Stack",
+    "mobile": "Desenvolvedor Mobile",
+    "devops": "Especialista DevOps",
+    "data": "Cientista de Dados",
+    "ai": "Especialista em IA/ML",
+    "security": "Especialista em Segurança",
+    
+    # Outras áreas (exemplos genéricos)
+    "marketing": "Profissional de Marketing",
+    "vendas": "Profissional de Vendas",
+    "rh": "Profissional de Recursos Humanos",
+    "financeiro": "Profissional Financeiro",
+    "comercial": "Profissional Comercial",
+    "operacional": "Profissional Operacional",
+    "gerencial": "Profissional Gerencial",
+    "administrativo": "Profissional Administrativo"
+}
+
 def determine_job_type_from_focus_areas(focus_areas: List[str]) -> str:
     """Determina o tipo de vaga baseado nas áreas de foco selecionadas"""
     if not focus_areas:
         return "vaga profissional"
     
-    # Mapear áreas de foco para tipos de vaga (genérico)
-    job_type_mapping = {
-        # Tecnologia
-        "frontend": "Desenvolvedor Frontend",
-        "backend": "Desenvolvedor Backend", 
-        "fullstack": "Desenvolvedor Full Stack",
-        "mobile": "Desenvolvedor Mobile",
-        "devops": "Especialista DevOps",
-        "data": "Cientista de Dados",
-        "ai": "Especialista em IA/ML",
-        "security": "Especialista em Segurança",
-        
-        # Outras áreas (exemplos genéricos)
-        "marketing": "Profissional de Marketing",
-        "vendas": "Profissional de Vendas",
-        "rh": "Profissional de Recursos Humanos",
-        "financeiro": "Profissional Financeiro",
-        "comercial": "Profissional Comercial",
-        "operacional": "Profissional Operacional",
-        "gerencial": "Profissional Gerencial",
-        "administrativo": "Profissional Administrativo"
-    }
-    
     # Se há múltiplas áreas, criar descrição combinada
     if len(focus_areas) == 1:
-        return job_type_mapping.get(focus_areas[0], "vaga profissional")
+        return JOB_TYPE_BY_FOCUS_AREA.get(focus_areas[0], "vaga profissional")
     elif len(focus_areas) == 2:
-        types = [job_type_mapping.get(area, area) for area in focus_areas]
+        types = [JOB_TYPE_BY_FOCUS_AREA.get(area, area) for area in focus_areas]
         return f"vaga de {types[0]} e {types[1]}"
     else:
         # Múltiplas áreas - usar descrição genérica mais específica
@@ -272,48 +363,83 @@ def determine_job_type_from_focus_areas(focus_areas: List[str]) -> str:
             return "Profissional Gerencial e Operacional"
         else:
             # Para qualquer combinação, criar descrição genérica
-            types = [job_type_mapping.get(area, area) for area in focus_areas[:2]]  # Limitar a 2
+            types = [JOB_TYPE_BY_FOCUS_AREA.get(area, area) for area in focus_areas[:2]]  # Limitar a 2
             return f"vaga multidisciplinar ({' e '.join(types)})"
 
+# Mapear tipos de entrevista
+INTERVIEW_TYPE_LABELS = {
+    "technical": "Entrevista Técnica",
+    "behavioral": "Entrevista Comportamental com RH", 
+    "mixed": "Entrevista Mista (Técnica e Comportamental)",
+    "case_study": "Estudo de Caso"
+}
+
+# Mapear níveis de dificuldade
+DIFFICULTY_LABELS = {
+    "beginner": "Iniciante",
+    "intermediate": "Intermediário", 
+    "advanced": "Avançado",
+    "expert": "Especialista"
+}
+
+# Mapear áreas de foco
+FOCUS_AREA_LABELS = {
+    "frontend": "Desenvolvimento Frontend (HTML, CSS, JavaScript, React, Vue, Angular)",
+    "backend": "Desenvolvimento Backend (Node.js, Python, Java, C#, APIs, Bancos de Dados)",
+    "fullstack": "Desenvolvimento Full Stack (Frontend + Backend)",
+    "mobile": "Desenvolvimento Mobile (React Native, Flutter, iOS, Android)",
+    "devops": "DevOps & Infrastructure (Docker, Kubernetes, AWS, Azure, CI/CD)",
+    "data": "Data Science & Analytics (Python, R, Machine Learning, Big Data)",
+    "ai": "AI & Machine Learning (Deep Learning, NLP, Computer Vision)",
+    "security": "Cybersecurity (Segurança da Informação, Ethical Hacking)"
+}
+
+def prompt_fingerprint(config: SimulationConfig, user_profile: dict = None) -> tuple:
+    """Chave estável (e barata de calcular) da configuração e do perfil que determinam o prompt"""
+    profile = tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in (user_profile or {}).items()
+    ))
+    return (
+        config.interview_type,
+        config.difficulty_level,
+        config.duration,
+        config.interaction_mode,
+        tuple(config.focus_areas),
+        profile
+    )
+
+@lru_cache(maxsize=256)
+def _compiled_interview_prompt(fingerprint: tuple) -> str:
+    interview_type, difficulty_level, duration, interaction_mode, focus_areas, profile = fingerprint
+    config = SimulationConfig(
+        interview_type=interview_type,
+        difficulty_level=difficulty_level,
+        duration=duration,
+        interaction_mode=interaction_mode,
+        focus_areas=list(focus_areas)
+    )
+    user_profile = {key: list(value) if isinstance(value, tuple) else value for key, value in profile}
+    return render_interview_prompt(config, user_profile or None)
+
 def create_interview_prompt(config: SimulationConfig, user_profile: dict = None) -> str:
+    """
+    Prompt do entrevistador para a configuração, compilado uma vez por
+    impressão digital (config + perfil) e reaproveitado nos turnos seguintes.
+    """
+    return _compiled_interview_prompt(prompt_fingerprint(config, user_profile))
+
+def render_interview_prompt(config: SimulationConfig, user_profile: dict = None) -> str:
     """Cria um prompt personalizado baseado na configuração da simulação"""
     
-    # Mapear tipos de entrevista
-    interview_type_map = {
-        "technical": "Entrevista Técnica",
-        "behavioral": "Entrevista Comportamental com RH", 
-        "mixed": "Entrevista Mista (Técnica e Comportamental)",
-        "case_study": "Estudo de Caso"
-    }
-    
-    # Mapear níveis de dificuldade
-    difficulty_map = {
-        "beginner": "Iniciante",
-        "intermediate": "Intermediário", 
-        "advanced": "Avançado",
-        "expert": "Especialista"
-    }
-    
-    # Mapear áreas de foco
-    focus_areas_map = {
-        "frontend": "Desenvolvimento Frontend (HTML, CSS, JavaScript, React, Vue, Angular)",
-        "backend": "Desenvolvimento Backend (Node.js, Python, Java, C#, APIs, Bancos de Dados)",
-        "fullstack": "Desenvolvimento Full Stack (Frontend + Backend)",
-        "mobile": "Desenvolvimento Mobile (React Native, Flutter, iOS, Android)",
-        "devops": "DevOps & Infrastructure (Docker, Kubernetes, AWS, Azure, CI/CD)",
-        "data": "Data Science & Analytics (Python, R, Machine Learning, Big Data)",
-        "ai": "AI & Machine Learning (Deep Learning, NLP, Computer Vision)",
-        "security": "Cybersecurity (Segurança da Informação, Ethical Hacking)"
-    }
-    
-    interview_type = interview_type_map.get(config.interview_type, "Entrevista Técnica")
-    difficulty = difficulty_map.get(config.difficulty_level, "Intermediário")
+    interview_type = INTERVIEW_TYPE_LABELS.get(config.interview_type, "Entrevista Técnica")
+    difficulty = DIFFICULTY_LABELS.get(config.difficulty_level, "Intermediário")
     
     # Construir áreas de foco (obrigatórias)
     if not config.focus_areas:
         raise ValueError("Áreas de foco são obrigatórias para determinar o tipo de vaga")
     
-    focus_list = [focus_areas_map.get(area, area) for area in config.focus_areas]
+    focus_list = [FOCUS_AREA_LABELS.get(area, area) for area in config.focus_areas]
     focus_text = f"\n\nÁREAS DE FOCO SELECIONADAS:\n{chr(10).join(f'- {area}' for area in focus_list)}"
     
     # Determinar tipo de vaga baseado nas áreas de foco
@@ -384,44 +510,57 @@ Vamos começar com uma saudação calorosa e uma pergunta simples pra você se s
 
 Lembre-se: isso é um diálogo, então responda como se estivesse realmente conversando comigo!
 """
-
-
+    
+    
     return prompt
 
-async def entrevista_bot(pergunta: str, config: SimulationConfig, user_profile: dict = None, conversation_history: List[dict] = None) -> str:
+def build_interview_messages(pergunta: str, config: SimulationConfig, user_profile: dict = None, conversation_history: List[dict] = None, summary: str = "") -> List[dict]:
+    """
+    Monta as mensagens enviadas ao entrevistador (prompt, histórico e pergunta atual).
+    Do histórico entram só as mensagens recentes que cabem no orçamento de tokens;
+    as anteriores chegam pelo summary (ver utils/interview_memory.py).
+    """
+    if conversation_history:
+        start = recent_window_start(conversation_history, 0, settings.interview_history_token_budget)
+        conversation_history = conversation_history[start:]
+    
+    # Criar prompt base (memoizado por configuração)
+    system_prompt = create_interview_prompt(config, user_profile)
+    
+    # Construir contexto da conversa
+    conversation_context = build_conversation_context(conversation_history, summary)
+    
+    # Combinar prompt base com contexto: a parte estática vem primeiro e é
+    # idêntica em todos os turnos, o que permite cache de prefixo no provedor
+    if conversation_context:
+        system_prompt = system_prompt + "\n\n" + conversation_context
+    
+    # Construir histórico da conversa com alternância correta
+    messages = [{"role": "system", "content": system_prompt}]
+    
+    # Adicionar histórico da conversa se disponível
+    if conversation_history:
+        for msg in conversation_history:
+            # Validar formato da mensagem do histórico
+            if isinstance(msg, dict) and "role" in msg and "content" in msg:
+                role = "user" if msg["role"] == "candidate" else "assistant"
+                content = str(msg["content"]).strip()
+                if content:  # Só adicionar se houver conteúdo
+                    messages.append({
+                        "role": role,
+                        "content": content
+                    })
+    
+    # Adicionar pergunta atual
+    messages.append({"role": "user", "content": pergunta})
+    
+    # Validar alternância das mensagens
+    return validate_message_alternation(messages)
+
+async def entrevista_bot(pergunta: str, config: SimulationConfig, user_profile: dict = None, conversation_history: List[dict] = None, summary: str = "") -> str:
     """Função principal do chatbot de entrevista"""
     try:
-        # Criar prompt base
-        system_prompt = create_interview_prompt(config, user_profile)
-        
-        # Construir contexto da conversa
-        conversation_context = build_conversation_context(conversation_history)
-        
-        # Combinar prompt base com contexto
-        if conversation_context:
-            system_prompt = system_prompt + "\n\n" + conversation_context
-        
-        # Construir histórico da conversa com alternância correta
-        messages = [{"role": "system", "content": system_prompt}]
-        
-        # Adicionar histórico da conversa se disponível
-        if conversation_history:
-            for msg in conversation_history[-10:]:  # Manter apenas últimas 10 mensagens
-                # Validar formato da mensagem do histórico
-                if isinstance(msg, dict) and "role" in msg and "content" in msg:
-                    role = "user" if msg["role"] == "candidate" else "assistant"
-                    content = str(msg["content"]).strip()
-                    if content:  # Só adicionar se houver conteúdo
-                        messages.append({
-                            "role": role,
-                            "content": content
-                        })
-        
-        # Adicionar pergunta atual
-        messages.append({"role": "user", "content": pergunta})
-        
-        # Validar alternância das mensagens
-        messages = validate_message_alternation(messages)
+        messages = build_interview_messages(pergunta, config, user_profile, conversation_history, summary)
         
         # Debug: Log das mensagens antes de enviar
         print(f"Enviando {len(messages)} mensagens para a API Perplexity")
@@ -431,21 +570,167 @@ async def entrevista_bot(pergunta: str, config: SimulationConfig, user_profile:
         # Usar a nova função de chamada direta
         try:
             # Tentar primeiro com modelo mais estável
-            response = await call_perplexity_api(messages, "llama-3.1-sonar-small-128k-online")
+            response = await call_perplexity_api(messages, INTERVIEW_MODELS[0])
             return response
+        except BulkheadFullError:
+            raise
         except Exception as e:
             print(f"Erro na chamada da API: {e}")
             # Fallback: tentar com modelo sonar-pro
             try:
-                response = await call_perplexity_api(messages, "sonar-pro")
+                response = await call_perplexity_api(messages, INTERVIEW_MODELS[1])
                 return response
             except Exception as e2:
                 print(f"Erro no fallback: {e2}")
                 raise e2
-        
+    
+    except BulkheadFullError:
+        raise
     except Exception as e:
         return f"Desculpe, ocorreu um erro técnico. Por favor, tente novamente. Erro: {str(e)}"
 
+async def entrevista_bot_stream(pergunta: str, config: SimulationConfig, user_profile: dict = None, conversation_history: List[dict] = None, summary: str = "") -> AsyncIterator[str]:
+    """Como entrevista_bot, mas produz a resposta em trechos conforme o modelo gera"""
+    try:
+        messages = build_interview_messages(pergunta, config, user_profile, conversation_history, summary)
+    except Exception as e:
+        yield f"Desculpe, ocorreu um erro técnico. Por favor, tente novamente. Erro: {str(e)}"
+        return
+    
+    for i, model in enumerate(INTERVIEW_MODELS):
+        stream = stream_perplexity_api(messages, model)
+        # O fallback de modelo só é possível antes do primeiro trecho
+        try:
+            first = await stream.__anext__()
+        except StopAsyncIteration:
+            return
+        except BulkheadFullError:
+            raise
+        except Exception as e:
+            await stream.aclose()
+            print(f"Erro no streaming com {model}: {e}")
+            if i == len(INTERVIEW_MODELS) - 1:
+                yield f"Desculpe, ocorreu um erro técnico. Por favor, tente novamente. Erro: {str(e)}"
+                return
+            continue
+        
+        yield first
+        async for piece in stream:
+            yield piece
+        return
+
+async def single_chunk(text: str) -> AsyncIterator[str]:
+    """Texto já pronto (ex.: abertura do banco de perguntas) no formato de stream"""
+    yield text
+
+def build_user_profile(current_user: User) -> dict:
+    """Perfil do candidato usado nos prompts do entrevistador"""
+    user_name = current_user.email.split('@')[0]  # Usar email como fallback
+    if current_user.profile:
+        if current_user.profile.first_name and current_user.profile.last_name:
+            user_name = f"{current_user.profile.first_name} {current_user.profile.last_name}"
+        elif current_user.profile.first_name:
+            user_name = current_user.profile.first_name
+    
+    return {
+        "name": user_name,
+        "experience_level": "Intermediário",  # Em produção, viria do banco
+        "main_area": "Desenvolvimento Full Stack",
+        "skills": ["JavaScript", "Python", "React", "Node.js"]
+    }
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+def history_entry(role: str, content: str, **extra) -> dict:
+    """Mensagem no formato do histórico da sessão (candidate/interviewer)"""
+    return {"role": role, "content": content, "timestamp": datetime.now().isoformat(), **extra}
+
+async def resolve_chat_session(message_data: dict, current_user: User, require_message: bool = True) -> InterviewSession:
+    """Sessão do turno atual; clientes antigos que reenviam config e histórico adotam uma nova"""
+    session_id = message_data.get("session_id")
+    user_message = message_data.get("message", "")
+    
+    if not session_id or (require_message and not user_message):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="session_id e message são obrigatórios" if require_message else "session_id é obrigatório"
+        )
+    
+    session = await interview_sessions.get(session_id, current_user.id)
+    if session is not None:
+        return session
+    
+    config_data = message_data.get("config")
+    if not config_data or not session_id.startswith(f"chat_{current_user.id}_"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sessão de entrevista não encontrada ou expirada"
+        )
+    
+    config = SimulationConfig(**config_data)
+    history = [
+        history_entry("candidate" if msg["role"] == "candidate" else "interviewer", str(msg["content"]))
+        for msg in message_data.get("conversation_history") or []
+        if isinstance(msg, dict) and "role" in msg and "content" in msg
+    ]
+    # O histórico enviado por esses clientes já termina com a mensagem atual
+    if user_message and history and history[-1]["role"] == "candidate" and history[-1]["content"].strip() == user_message.strip():
+        history.pop()
+    
+    return await interview_sessions.create(
+        current_user.id,
+        config.model_dump(),
+        determine_job_type_from_focus_areas(config.focus_areas),
+        session_id=session_id,
+        history=history
+    )
+
+async def sse_interview_response(
+    tokens: AsyncIterator[str],
+    meta: dict,
+    content_key: str,
+    on_complete: Optional[Callable[[dict], Awaitable[None]]] = None
+) -> StreamingResponse:
+    """
+    Resposta SSE: evento meta, um evento token por trecho e done com o texto
+    completo em content_key (mesmo campo da versão sem streaming).
+    O primeiro trecho é aguardado antes de responder, para que bulkhead cheio
+    ou circuito aberto ainda retornem 429/503 em vez de um stream quebrado.
+    on_complete recebe o payload do done (ex.: gravar o turno na sessão).
+    """
+    try:
+        first = await tokens.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    
+    async def events():
+        parts = [first] if first else []
+        yield _sse_event("meta", meta)
+        try:
+            if first:
+                yield _sse_event("token", {"content": first})
+            async for piece in tokens:
+                parts.append(piece)
+                yield _sse_event("token", {"content": piece})
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Erro durante o streaming: {str(e)}"})
+            return
+        done = {
+            content_key: "".join(parts),
+            "timestamp": datetime.now(),
+            "message_id": f"msg_{int(datetime.now().timestamp())}"
+        }
+        if on_complete is not None:
+            await on_complete(done)
+        yield _sse_event("done", done)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/start-interview")
 async def start_interview(
     config: SimulationConfig,
@@ -456,32 +741,29 @@ async def start_interview(
     
     try:
         # Buscar perfil do usuário
-        user_name = current_user.email.split('@')[0]  # Usar email como fallback
-        if current_user.profile:
-            if current_user.profile.first_name and current_user.profile.last_name:
-                user_name = f"{current_user.profile.first_name} {current_user.profile.last_name}"
-            elif current_user.profile.first_name:
-                user_name = current_user.profile.first_name
-        
-        user_profile = {
-            "name": user_name,
-            "experience_level": "Intermediário",  # Em produção, viria do banco
-            "main_area": "Desenvolvimento Full Stack",
-            "skills": ["JavaScript", "Python", "React", "Node.js"]
-        }
+        user_profile = build_user_profile(current_user)
         
-        # Criar prompt inicial
-        system_prompt = create_interview_prompt(config, user_profile)
+        # Sessão guardada no servidor: os próximos turnos enviam só a mensagem
+        session = await interview_sessions.create(
+            current_user.id,
+            config.model_dump(),
+            determine_job_type_from_focus_areas(config.focus_areas)
+        )
         
-        # Gerar primeira pergunta
-        first_question = await entrevista_bot(
-            "Inicie a entrevista com uma saudação e a primeira pergunta.",
-            config, 
-            user_profile
+        # Abertura do banco pré-gerado; sem pool para a configuração, gera com o LLM
+        first_question = await question_bank.opening_question(
+            config.interview_type, config.difficulty_level, config.focus_areas
         )
+        if first_question is None:
+            first_question = await entrevista_bot(
+                "Inicie a entrevista com uma saudação e a primeira pergunta.",
+                config, 
+                user_profile
+            )
+        await interview_sessions.append(session, history_entry("interviewer", first_question))
         
         return {
-            "session_id": f"chat_{current_user.id}_{int(datetime.now().timestamp())}",
+            "session_id": session.session_id,
             "interview_type": config.interview_type,
             "difficulty_level": config.difficulty_level,
             "duration": config.duration,
@@ -489,9 +771,11 @@ async def start_interview(
             "focus_areas": config.focus_areas,
             "first_question": first_question,
             "user_profile": user_profile,
-            "started_at": datetime.now()
+            "started_at": session.started_at
         }
-        
+    
+    except BulkheadFullError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -504,91 +788,142 @@ async def chat_with_interviewer(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Processa mensagem do candidato e retorna resposta do entrevistador"""
+    """
+    Processa mensagem do candidato e retorna resposta do entrevistador.
+    Basta enviar session_id e message; config e conversation_history só são
+    usados por clientes antigos quando a sessão não está no servidor.
+    """
     
     try:
-        session_id = message_data.get("session_id")
-        user_message = message_data.get("message", "")
-        config_data = message_data.get("config")
-        conversation_history = message_data.get("conversation_history", [])
-        
-        if not session_id or not user_message or not config_data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="session_id, message e config são obrigatórios"
-            )
-        
-        # Reconstruir configuração
-        config = SimulationConfig(**config_data)
+        session = await resolve_chat_session(message_data, current_user)
+        user_message = message_data["message"]
+        config = SimulationConfig(**session.config)
         
         # Buscar perfil do usuário
-        user_name = current_user.email.split('@')[0]  # Usar email como fallback
-        if current_user.profile:
-            if current_user.profile.first_name and current_user.profile.last_name:
-                user_name = f"{current_user.profile.first_name} {current_user.profile.last_name}"
-            elif current_user.profile.first_name:
-                user_name = current_user.profile.first_name
-        
-        user_profile = {
-            "name": user_name,
-            "experience_level": "Intermediário",
-            "main_area": "Desenvolvimento Full Stack", 
-            "skills": ["JavaScript", "Python", "React", "Node.js"]
-        }
+        user_profile = build_user_profile(current_user)
         
-        # Processar mensagem
+        # Processar mensagem com o resumo dos turnos antigos e as mensagens recentes
+        summary, recent_history = prompt_context(session)
         response = await entrevista_bot(
             user_message,
             config,
             user_profile,
-            conversation_history
+            recent_history,
+            summary
+        )
+        
+        message_id = f"msg_{int(datetime.now().timestamp())}"
+        await interview_sessions.append(
+            session,
+            history_entry("candidate", user_message),
+            history_entry("interviewer", response, message_id=message_id)
         )
+        schedule_summary(session)
         
         return {
-            "session_id": session_id,
+            "session_id": session.session_id,
             "interviewer_response": response,
             "timestamp": datetime.now(),
-            "message_id": f"msg_{int(datetime.now().timestamp())}"
+            "message_id": message_id
         }
-        
+    
+    except (BulkheadFullError, HTTPException):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao processar mensagem: {str(e)}"
         )
 
-@router.post("/end-interview")
-async def end_interview(
-    session_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+@router.post("/start-interview/stream")
+async def start_interview_stream(
+    config: SimulationConfig,
+    current_user: User = Depends(get_current_user)
 ):
-    """Finaliza a entrevista e gera feedback"""
+    """Como /start-interview, mas envia a primeira pergunta por SSE conforme é gerada"""
     
     try:
-        session_id = session_data.get("session_id")
-        conversation_history = session_data.get("conversation_history", [])
-        config_data = session_data.get("config")
-        
-        if not session_id or not config_data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="session_id e config são obrigatórios"
+        user_profile = build_user_profile(current_user)
+        session = await interview_sessions.create(
+            current_user.id,
+            config.model_dump(),
+            determine_job_type_from_focus_areas(config.focus_areas)
+        )
+        meta = {
+            "session_id": session.session_id,
+            "interview_type": config.interview_type,
+            "difficulty_level": config.difficulty_level,
+            "duration": config.duration,
+            "interaction_mode": config.interaction_mode,
+            "focus_areas": config.focus_areas,
+            "user_profile": user_profile,
+            "started_at": session.started_at
+        }
+        opening = await question_bank.opening_question(
+            config.interview_type, config.difficulty_level, config.focus_areas
+        )
+        if opening is not None:
+            tokens = single_chunk(opening)
+        else:
+            tokens = entrevista_bot_stream(
+                "Inicie a entrevista com uma saudação e a primeira pergunta.",
+                config,
+                user_profile
             )
         
-        # Reconstruir configuração
-        config = SimulationConfig(**config_data)
+        async def save_first_question(done: dict):
+            await interview_sessions.append(session, history_entry("interviewer", done["first_question"]))
         
-        # Buscar perfil do usuário
-        user_profile = {
-            "name": current_user.name,
-            "experience_level": "Intermediário",
-            "main_area": "Desenvolvimento Full Stack",
-            "skills": ["JavaScript", "Python", "React", "Node.js"]
-        }
+        return await sse_interview_response(tokens, meta, "first_question", on_complete=save_first_question)
+    
+    except BulkheadFullError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao iniciar entrevista: {str(e)}"
+        )
+
+@router.post("/chat/stream")
+async def chat_with_interviewer_stream(
+    message_data: dict,
+    current_user: User = Depends(get_current_user)
+):
+    """Como /chat, mas envia a resposta do entrevistador por SSE conforme é gerada"""
+    
+    session = await resolve_chat_session(message_data, current_user)
+    user_message = message_data["message"]
+    
+    try:
+        config = SimulationConfig(**session.config)
+        user_profile = build_user_profile(current_user)
+        summary, recent_history = prompt_context(session)
+        tokens = entrevista_bot_stream(user_message, config, user_profile, recent_history, summary)
+        
+        async def save_turn(done: dict):
+            await interview_sessions.append(
+                session,
+                history_entry("candidate", user_message),
+                history_entry("interviewer", done["interviewer_response"], message_id=done["message_id"])
+            )
+            schedule_summary(session)
         
-        # Gerar feedback final
-        feedback_prompt = f"""
+        return await sse_interview_response(
+            tokens, {"session_id": session.session_id}, "interviewer_response", on_complete=save_turn
+        )
+    
+    except BulkheadFullError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao processar mensagem: {str(e)}"
+        )
+
+async def generate_interview_feedback(config: SimulationConfig, user_profile: dict, conversation_history: List[dict], summary: str = "") -> str:
+    """Feedback final da entrevista com pontuação; levanta exceção se nenhum modelo responder"""
+    summary_section = f"RESUMO DO INÍCIO DA ENTREVISTA:\n{summary}\n\n" if summary else ""
+    feedback_prompt = f"""
         Baseado na entrevista realizada, forneça um feedback detalhado e construtivo.
         
         CONFIGURAÇÃO DA ENTREVISTA:
@@ -597,8 +932,8 @@ async def end_interview(
         - Duração: {config.duration} minutos
         - Áreas de Foco: {', '.join(config.focus_areas)}
         
-        HISTÓRICO DA CONVERSA:
-        {chr(10).join([f"{msg['role']}: {msg['content']}" for msg in conversation_history])}
+        {summary_section}HISTÓRICO DA CONVERSA:
+        {format_transcript(conversation_history)}
         
         Forneça um feedback estruturado incluindo:
         1. Pontos fortes observados
@@ -606,21 +941,82 @@ async def end_interview(
         3. Sugestões específicas
         4. Recomendações de estudo
         5. Próximos passos
-        """
-        
-        feedback = await entrevista_bot(feedback_prompt, config, user_profile)
-        
-        return {
-            "session_id": session_id,
-            "feedback": feedback,
-            "completed_at": datetime.now(),
-            "total_messages": len(conversation_history),
-            "interview_type": config.interview_type,
-            "difficulty_level": config.difficulty_level
-        }
         
+        Termine com uma linha no formato "PONTUAÇÃO: N", com N de 0 a 100 para o desempenho geral.
+        """
+    messages = build_interview_messages(feedback_prompt, config, user_profile)
+    
+    last_error = None
+    for model in INTERVIEW_MODELS:
+        try:
+            return await call_perplexity_api(messages, model)
+        except Exception as e:
+            print(f"Erro ao gerar feedback com {model}: {e}")
+            last_error = e
+    raise last_error
+
+def feedback_job_response(job: FeedbackJob) -> dict:
+    return {**job.to_dict(), "status_url": f"/api/v1/interview-chatbot/end-interview/{job.job_id}"}
+
+@router.post("/end-interview", status_code=status.HTTP_202_ACCEPTED)
+async def end_interview(
+    session_data: dict,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Finaliza a entrevista e agenda a geração do feedback em segundo plano.
+    Responde na hora com o job_id; o resultado (feedback e score) sai em
+    GET /end-interview/{job_id} e fica gravado na sessão.
+    """
+    
+    try:
+        session_id = session_data.get("session_id")
+        if session_id:
+            # Repetir a chamada devolve o job existente, a menos que ele tenha falhado
+            existing = await feedback_jobs.get(feedback_jobs.job_id_for(session_id), current_user.id)
+            if existing is not None and existing.status != "failed":
+                return feedback_job_response(existing)
+        
+        session = await resolve_chat_session(session_data, current_user, require_message=False)
+        config = SimulationConfig(**session.config)
+        user_profile = build_user_profile(current_user)
+        summary, recent_history = prompt_context(session)
+        recent_history = list(recent_history)
+        
+        async def generate() -> str:
+            feedback = await generate_interview_feedback(config, user_profile, recent_history, summary)
+            # A sessão só é encerrada com o feedback pronto, para permitir nova tentativa
+            await interview_sessions.complete(session)
+            return feedback
+        
+        job = await feedback_jobs.submit(
+            session.session_id,
+            current_user.id,
+            generate,
+            total_messages=len(session.history),
+            interview_type=config.interview_type,
+            difficulty_level=config.difficulty_level
+        )
+        return feedback_job_response(job)
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao finalizar entrevista: {str(e)}"
         )
+
+@router.get("/end-interview/{job_id}")
+async def get_interview_feedback(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Estado da geração do feedback: pending, running, completed (com feedback e score) ou failed"""
+    job = await feedback_jobs.get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Feedback não encontrado"
+        )
+    return feedback_job_response(job)
@@ -0,0 +1,458 @@
+"""
+Entrevista por voz em tempo real via WebSocket (fala → transcrição → LLM → fala)
+
+Em vez de três requisições por turno (/voice/transcribe, /chat, /voice/speak),
+uma única conexão recebe o áudio enquanto o candidato fala, transcreve em
+paralelo, envia a resposta do entrevistador conforme é gerada e sintetiza cada
+frase assim que ela fica completa, então o primeiro áudio chega antes de o
+LLM terminar.
+
+Conexão: /api/v1/interview-chatbot/voice?session_id=...&audio_format=webm
+(a sessão vem de /start-interview). O token não vai na URL, que acaba em logs:
+a primeira mensagem depois de aberta a conexão é {"type": "auth", "token": "..."},
+com o mesmo JWT do header Authorization, em até
+interview_voice_auth_timeout_seconds; senão a conexão é fechada com 1008.
+Transcrições parciais só com &partial_transcripts=true: cada uma reenvia ao
+Whisper o áudio do turno inteiro, então ficam limitadas a
+interview_voice_max_partials_per_turn por turno, a cada
+interview_voice_partial_interval_seconds, e aparecem como
+transcription_partial em /metrics/ai-usage.
+
+Cliente → servidor
+- {"type": "auth", "token": "..."}: primeira mensagem, obrigatória
+- frames binários: trechos de áudio do turno (ex.: MediaRecorder em webm; os
+  trechos concatenados precisam formar um arquivo válido)
+- {"type": "end_turn"}: o candidato terminou de falar
+- {"type": "text", "message": "..."}: turno digitado, sem transcrição
+- {"type": "replay"}: fala de novo a última mensagem do entrevistador (ex.: a abertura)
+- {"type": "cancel"}: interrompe a resposta em andamento (o candidato voltou a falar)
+
+Servidor → cliente
+- {"type": "ready", "session_id"}
+- {"type": "partial_transcript", "text"}: durante a fala, se pedido na conexão
+- {"type": "transcript", "text"}: transcrição final do turno
+- {"type": "token", "content"}: trecho da resposta do entrevistador
+- {"type": "audio", "seq", "text", "format", "bytes"} seguido de um frame binário com o mp3 da frase
+- {"type": "done", "interviewer_response", "message_id", "timestamp"}: texto completo, já gravado na sessão
+- {"type": "turn_metrics", ...}: latências do turno em ms, enviado depois do último áudio
+- {"type": "replay_done", "sentences"}: fim do áudio pedido por replay
+- {"type": "cancelled"} e {"type": "error", "stage", "detail"}
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable, Deque, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, WebSocketException, status
+
+from ..api.auth import get_websocket_user
+from ..core.config import settings
+from ..models.user import User
+from ..schemas.simulation import SimulationConfig
+from ..utils.bulkhead import BulkheadFullError
+from ..utils.interview_memory import prompt_context, schedule_summary
+from ..utils.interview_sessions import InterviewSession, interview_sessions
+from ..utils.speech import synthesize_speech, transcribe_audio
+from ..utils.voice_latency import voice_latency
+from .interview_chatbot import build_user_profile, entrevista_bot_stream, history_entry
+
+router = APIRouter(prefix="/interview-chatbot", tags=["interview-chatbot"])
+logger = logging.getLogger(__name__)
+
+AUDIO_FORMATS = {"webm", "ogg", "mp4", "m4a", "mp3", "wav"}
+
+# Fim de frase: pontuação seguida de espaço (aspas e parênteses de fechamento incluídos)
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s+")
+
+def split_sentences(buffer: str, min_chars: int) -> Tuple[List[str], str]:
+    """Frases completas do buffer e o resto ainda incompleto; frases curtas se juntam à seguinte"""
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(buffer):
+        if match.end() - start >= min_chars:
+            sentences.append(buffer[start:match.end()].strip())
+            start = match.end()
+    return sentences, buffer[start:]
+
+def _elapsed_ms(start: Optional[float], end: Optional[float]) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    return round((end - start) * 1000, 1)
+
+class VoiceChannel:
+    """Envio serializado: tokens, transcrições e áudios saem de tarefas diferentes"""
+    
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self._lock = asyncio.Lock()
+    
+    async def send(self, event: str, **data):
+        message = json.dumps({"type": event, **data}, ensure_ascii=False, default=str)
+        async with self._lock:
+            await self.websocket.send_text(message)
+    
+    async def send_audio(self, seq: int, text: str, audio: bytes):
+        header = json.dumps({"type": "audio", "seq": seq, "text": text, "format": "mp3", "bytes": len(audio)}, ensure_ascii=False)
+        # Cabeçalho e frame binário juntos, sem outra mensagem entre eles
+        async with self._lock:
+            await self.websocket.send_text(header)
+            await self.websocket.send_bytes(audio)
+
+class SentenceSpeaker:
+    """Sintetiza as frases à frente da que está sendo enviada e envia os áudios na ordem das frases
+    
+    No máximo interview_voice_tts_lookahead sínteses ficam em andamento (ou
+    prontas e ainda não enviadas) por conexão; as demais frases esperam a vez,
+    para uma resposta longa não ocupar sozinha o bulkhead openai_tts.
+    """
+    
+    def __init__(self, channel: VoiceChannel, lookahead: Optional[int] = None):
+        self.channel = channel
+        self.lookahead = max(1, lookahead or settings.interview_voice_tts_lookahead)
+        self.sentences = 0
+        self.first_audio_at: Optional[float] = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._waiting: Deque[list] = deque()  # frases ainda sem síntese iniciada
+        self._started = 0  # sínteses iniciadas e ainda não enviadas
+        self._sender = asyncio.create_task(self._send_in_order())
+    
+    def say(self, text: str):
+        text = text.strip()
+        if not text:
+            return
+        item = [self.sentences, text, None]
+        self._waiting.append(item)
+        self._queue.put_nowait(item)
+        self.sentences += 1
+        self._start_syntheses()
+    
+    def _start_syntheses(self):
+        # Em ordem: a próxima frase a enviar sempre tem a síntese iniciada
+        while self._waiting and self._started < self.lookahead:
+            item = self._waiting.popleft()
+            item[2] = asyncio.create_task(synthesize_speech(
+                item[1], model=settings.interview_voice_tts_model, voice=settings.interview_voice_tts_voice
+            ))
+            self._started += 1
+    
+    async def _send_in_order(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            seq, text, synthesis = item
+            try:
+                audio = await synthesis
+            except Exception as e:
+                # Sem o áudio da frase, o texto já enviado continua valendo
+                detail = "Serviço de voz ocupado" if isinstance(e, BulkheadFullError) else str(e)
+                self._release()
+                await self.channel.send("error", stage="tts", seq=seq, detail=detail)
+                continue
+            await self.channel.send_audio(seq, text, audio)
+            self._release()
+            if self.first_audio_at is None:
+                self.first_audio_at = time.perf_counter()
+    
+    def _release(self):
+        self._started -= 1
+        self._start_syntheses()
+    
+    async def finish(self):
+        """Espera o envio de todas as frases"""
+        self._queue.put_nowait(None)
+        await self._sender
+    
+    def cancel(self):
+        self._sender.cancel()
+        self._waiting.clear()
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None and item[2] is not None:
+                item[2].cancel()
+
+class VoiceTurn:
+    """Áudio do turno em andamento e a transcrição parcial mais recente"""
+    
+    def __init__(self):
+        self.audio = bytearray()
+        self.started_at: Optional[float] = None
+        self.last_partial_at = 0.0
+        self.partials = 0  # transcrições parciais iniciadas no turno
+        self.partial_text = ""
+        self.partial_bytes = 0  # bytes de áudio cobertos por partial_text
+        self.partial_task: Optional[asyncio.Task] = None
+        self.partial_task_bytes = 0  # bytes de áudio da transcrição parcial em andamento
+
+class VoiceInterview:
+    """Estado de uma conexão: turno atual e resposta do entrevistador em andamento"""
+    
+    def __init__(self, channel: VoiceChannel, session: InterviewSession, user_profile: dict, filename: str,
+                 partial_transcripts: bool = False):
+        self.channel = channel
+        self.session = session
+        self.user_profile = user_profile
+        self.filename = filename
+        self.partial_transcripts = partial_transcripts
+        self.turn = VoiceTurn()
+        self.reply_task: Optional[asyncio.Task] = None
+        self._replies: Set[asyncio.Task] = set()
+    
+    async def add_audio(self, chunk: bytes):
+        turn = self.turn
+        if len(turn.audio) + len(chunk) > settings.interview_voice_max_turn_bytes:
+            await self.channel.send("error", stage="audio", detail="Áudio do turno excede o tamanho máximo")
+            return
+        now = time.perf_counter()
+        if turn.started_at is None:
+            turn.started_at = turn.last_partial_at = now
+        turn.audio.extend(chunk)
+        
+        # Uma transcrição parcial por vez, no máximo a cada intervalo e poucas por turno: cada
+        # uma reenvia o turno inteiro (os trechos do MediaRecorder não são decodificáveis sozinhos)
+        if not self.partial_transcripts or turn.partials >= settings.interview_voice_max_partials_per_turn:
+            return
+        if turn.partial_task is None and now - turn.last_partial_at >= settings.interview_voice_partial_interval_seconds:
+            turn.last_partial_at = now
+            turn.partials += 1
+            turn.partial_task_bytes = len(turn.audio)
+            turn.partial_task = asyncio.create_task(self._transcribe_partial(turn, bytes(turn.audio)))
+    
+    async def _transcribe_partial(self, turn: VoiceTurn, audio: bytes):
+        try:
+            text = await transcribe_audio(audio, self.filename, operation="transcription_partial")
+        except Exception as e:
+            # A transcrição final do turno ainda cobre todo o áudio
+            logger.info(f"Transcrição parcial falhou: {e}")
+            return
+        finally:
+            turn.partial_task = None
+        turn.partial_text, turn.partial_bytes = text, len(audio)
+        if turn is self.turn:
+            await self.channel.send("partial_transcript", text=text)
+    
+    def _start_reply(self, reply: Callable[[], Awaitable[None]]):
+        # As respostas ficam na ordem dos turnos: cada uma espera a anterior
+        previous = self.reply_task
+        
+        async def run():
+            if previous is not None:
+                await asyncio.wait({previous})
+            try:
+                await reply()
+            except Exception as e:
+                logger.warning(f"Erro no turno de voz da sessão {self.session.session_id}: {e}")
+                try:
+                    await self.channel.send("error", stage="turn", detail=str(e))
+                except Exception:
+                    pass  # Conexão já fechada
+        
+        self.reply_task = asyncio.create_task(run())
+        self._replies.add(self.reply_task)
+        self.reply_task.add_done_callback(self._replies.discard)
+    
+    async def end_turn(self):
+        turn, self.turn = self.turn, VoiceTurn()
+        if not turn.audio:
+            await self.channel.send("error", stage="audio", detail="Nenhum áudio recebido neste turno")
+            return
+        speech_end = time.perf_counter()
+        self._start_reply(lambda: self._answer_audio(turn, speech_end))
+    
+    def text_turn(self, message: str):
+        speech_end = time.perf_counter()
+        self._start_reply(lambda: self._answer(message, speech_end, stt_ms=None))
+    
+    def replay(self):
+        last = next((msg for msg in reversed(self.session.history) if msg.get("role") == "interviewer"), None)
+        if last is not None:
+            self._start_reply(lambda: self._speak(last["content"]))
+    
+    async def cancel(self):
+        """Interrompe a resposta em andamento e as que aguardam; turnos sem texto completo são descartados"""
+        for task in list(self._replies):
+            task.cancel()
+        await self.channel.send("cancelled")
+    
+    def close(self):
+        for task in list(self._replies):
+            task.cancel()
+        if self.turn.partial_task is not None:
+            self.turn.partial_task.cancel()
+    
+    async def _answer_audio(self, turn: VoiceTurn, speech_end: float):
+        audio_size = len(turn.audio)
+        # Parcial em andamento com todo o áudio: esperar por ela sai mais barato que transcrever de novo
+        if turn.partial_task is not None and turn.partial_task_bytes == audio_size:
+            await asyncio.wait({turn.partial_task})
+        partial_reused = bool(turn.partial_text) and turn.partial_bytes == audio_size
+        if partial_reused:
+            transcript = turn.partial_text
+        else:
+            try:
+                transcript = await transcribe_audio(bytes(turn.audio), self.filename)
+            except Exception as e:
+                detail = "Serviço de transcrição ocupado" if isinstance(e, BulkheadFullError) else str(e)
+                await self.channel.send("error", stage="stt", detail=detail)
+                return
+        
+        await self.channel.send("transcript", text=transcript)
+        if not transcript.strip():
+            await self.channel.send("error", stage="stt", detail="Não foi possível entender o áudio")
+            return
+        await self._answer(
+            transcript, speech_end,
+            stt_ms=_elapsed_ms(speech_end, time.perf_counter()),
+            audio_bytes=audio_size,
+            partial_reused=partial_reused
+        )
+    
+    async def _answer(self, message: str, speech_end: float, stt_ms: Optional[float],
+                      audio_bytes: int = 0, partial_reused: bool = False):
+        """Resposta do entrevistador em tokens e, frase a frase, em áudio"""
+        message = message.strip()
+        if not message:
+            return
+        transcript_at = time.perf_counter()
+        config = SimulationConfig(**self.session.config)
+        summary, recent_history = prompt_context(self.session)
+        
+        speaker = SentenceSpeaker(self.channel)
+        parts: List[str] = []
+        pending = ""
+        first_token_at = None
+        try:
+            try:
+                async for piece in entrevista_bot_stream(message, config, self.user_profile, recent_history, summary):
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    parts.append(piece)
+                    await self.channel.send("token", content=piece)
+                    sentences, pending = split_sentences(pending + piece, settings.interview_voice_min_sentence_chars)
+                    for sentence in sentences:
+                        speaker.say(sentence)
+            except BulkheadFullError:
+                speaker.cancel()
+                await self.channel.send("error", stage="llm", detail="Serviço de entrevista ocupado, tente novamente em instantes")
+                return
+            speaker.say(pending)
+            
+            response = "".join(parts)
+            message_id = f"msg_{int(datetime.now().timestamp())}"
+            await interview_sessions.append(
+                self.session,
+                history_entry("candidate", message),
+                history_entry("interviewer", response, message_id=message_id)
+            )
+            schedule_summary(self.session)
+            await self.channel.send("done", interviewer_response=response, message_id=message_id, timestamp=datetime.now())
+            
+            await speaker.finish()
+        except BaseException:
+            speaker.cancel()
+            raise
+        
+        stages = {
+            "stt_ms": stt_ms,
+            "llm_first_token_ms": _elapsed_ms(transcript_at, first_token_at),
+            "first_audio_ms": _elapsed_ms(speech_end, speaker.first_audio_at),
+            "total_ms": _elapsed_ms(speech_end, time.perf_counter()),
+        }
+        voice_latency.record(stages, partial_reused=partial_reused)
+        await self.channel.send(
+            "turn_metrics",
+            **stages,
+            audio_bytes=audio_bytes,
+            sentences=speaker.sentences,
+            partial_transcript_reused=partial_reused
+        )
+    
+    async def _speak(self, text: str):
+        speaker = SentenceSpeaker(self.channel)
+        try:
+            sentences, rest = split_sentences(text + " ", settings.interview_voice_min_sentence_chars)
+            for sentence in sentences + [rest]:
+                speaker.say(sentence)
+            await speaker.finish()
+        except BaseException:
+            speaker.cancel()
+            raise
+        await self.channel.send("replay_done", sentences=speaker.sentences)
+
+async def _authenticate(websocket: WebSocket) -> Optional[User]:
+    """Usuário do token da primeira mensagem ({"type": "auth", "token": "..."}), ou None"""
+    try:
+        message = await asyncio.wait_for(
+            websocket.receive_text(), timeout=settings.interview_voice_auth_timeout_seconds
+        )
+        event = json.loads(message)
+    except (asyncio.TimeoutError, KeyError, ValueError):
+        # Sem mensagem a tempo, frame binário ou JSON inválido
+        return None
+    if not isinstance(event, dict) or event.get("type") != "auth" or not isinstance(event.get("token"), str):
+        return None
+    return await get_websocket_user(event["token"])
+
+@router.websocket("/voice")
+async def voice_interview(
+    websocket: WebSocket,
+    session_id: str = Query(...),
+    audio_format: str = Query("webm"),
+    partial_transcripts: bool = Query(False)
+):
+    """Entrevista por voz em tempo real (protocolo na documentação do módulo)"""
+    if audio_format not in AUDIO_FORMATS:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Formato de áudio não suportado")
+    
+    await websocket.accept()
+    try:
+        current_user = await _authenticate(websocket)
+    except WebSocketDisconnect:
+        return
+    if current_user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Credenciais inválidas")
+        return
+    session = await interview_sessions.get(session_id, current_user.id)
+    if session is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Sessão de entrevista não encontrada ou expirada")
+        return
+    
+    channel = VoiceChannel(websocket)
+    interview = VoiceInterview(
+        channel, session, build_user_profile(current_user), f"audio.{audio_format}", partial_transcripts=partial_transcripts
+    )
+    voice_latency.active_connections += 1
+    try:
+        await channel.send("ready", session_id=session.session_id)
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                await interview.add_audio(message["bytes"])
+                continue
+            
+            try:
+                event = json.loads(message.get("text") or "")
+            except ValueError:
+                event = None
+            kind = event.get("type") if isinstance(event, dict) else None
+            if kind == "end_turn":
+                await interview.end_turn()
+            elif kind == "text":
+                interview.text_turn(str(event.get("message", "")))
+            elif kind == "replay":
+                interview.replay()
+            elif kind == "cancel":
+                await interview.cancel()
+            else:
+                await channel.send("error", stage="protocol", detail="Mensagem não reconhecida")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        voice_latency.active_connections -= 1
+        interview.close()
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import and_, or_, func, literal_column, select
 from typing import Optional, List
 from datetime import datetime
 
-from ..db.database import get_db
-from ..models.user import User, Job, Company
-from ..models.application import Application
+from ..db.database import get_async_db, get_async_read_db
+from ..db.application_counters import counter_updates
+from ..models.user import User, Job, Company, JOB_SEARCH_CONFIG
+from ..models.application import Application, ApplicationStatus
 from ..schemas.job import (
     Job as JobSchema,
     JobCreate,
@@ -16,11 +18,45 @@ from ..schemas.job import (
     ApplicationResponse
 )
 from ..api.auth import get_current_user
+from ..utils.pagination import apply_keyset, next_cursor, set_next_cursor
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
+# Configuração textual do Postgres (constante, nunca vem do usuário)
+SEARCH_CONFIG = literal_column(f"'{JOB_SEARCH_CONFIG}'::regconfig")
+
+# Opções dos trechos destacados retornados na busca
+SEARCH_HEADLINE_OPTIONS = (
+    'StartSel=<mark>, StopSel=</mark>, MaxWords=25, MinWords=10, '
+    'MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+def _serialize_job(job: Job, company_info: Optional[dict], **extra) -> dict:
+    """Converte uma vaga no formato de resposta da API"""
+    return {
+        **extra,
+        "id": job.id,
+        "title": job.title,
+        "description": job.description,
+        "requirements": job.requirements,
+        "benefits": job.benefits,
+        "location": job.location,
+        "remote_work": job.remote_work,
+        "salary_min": job.salary_min,
+        "salary_max": job.salary_max,
+        "employment_type": job.employment_type,
+        "company_id": job.company_id,
+        "is_active": job.is_active,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "company": company_info,
+        "application_count": job.application_count
+    }
+
 @router.get("/", response_model=List[JobSchema])
 async def list_jobs(
+    response: Response,
+    q: Optional[str] = Query(None, description="Busca textual em título, descrição e requisitos"),
     title: Optional[str] = Query(None, description="Filtrar por título da vaga"),
     location: Optional[str] = Query(None, description="Filtrar por localização"),
     remote_work: Optional[bool] = Query(None, description="Filtrar por trabalho remoto"),
@@ -30,11 +66,37 @@ async def list_jobs(
     company_id: Optional[int] = Query(None, description="ID da empresa"),
     limit: int = Query(20, ge=1, le=100, description="Número de resultados por página"),
     offset: int = Query(0, ge=0, description="Número de resultados para pular"),
-    db: Session = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Lista vagas com filtros opcionais"""
     
-    query = db.query(Job).filter(Job.is_active == True)
+    search = q.strip() if q else None
+    
+    if after and (offset or search):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O cursor 'after' não pode ser combinado com offset ou busca textual"
+        )
+    
+    query = (
+        select(Job, Company)
+        .outerjoin(Company, Company.id == Job.company_id)
+        .where(Job.is_active == True)
+    )
+    
+    # Modo busca: usa o índice GIN de search_vector e ordena por relevância
+    if search:
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, search)
+        rank = func.ts_rank(Job.search_vector, ts_query).label("rank")
+        highlight = func.ts_headline(
+            SEARCH_CONFIG, Job.description, ts_query, SEARCH_HEADLINE_OPTIONS
+        ).label("highlight")
+        query = (
+            query.add_columns(rank, highlight)
+            .filter(Job.search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), Job.id.desc())
+        )
     
     # Aplicar filtros
     if title:
@@ -58,35 +120,21 @@ async def list_jobs(
     if company_id:
         query = query.filter(Job.company_id == company_id)
     
-    # Aplicar paginação
-    jobs = query.offset(offset).limit(limit).all()
+    # Aplicar paginação: por relevância na busca, por cursor (created_at, id) nos demais casos
+    if not search:
+        query = apply_keyset(query, Job, after)
+    rows = (await db.execute(query.offset(offset).limit(limit))).all()
+    
+    if not search:
+        set_next_cursor(response, next_cursor([row.Job for row in rows], limit))
     
-    # Adicionar informações da empresa e contagem de aplicações
+    # Montar resposta com informações da empresa e contagem de aplicações
     result = []
-    for job in jobs:
-        job_dict = {
-            "id": job.id,
-            "title": job.title,
-            "description": job.description,
-            "requirements": job.requirements,
-            "benefits": job.benefits,
-            "location": job.location,
-            "remote_work": job.remote_work,
-            "salary_min": job.salary_min,
-            "salary_max": job.salary_max,
-            "employment_type": job.employment_type,
-            "company_id": job.company_id,
-            "is_active": job.is_active,
-            "created_at": job.created_at,
-            "updated_at": job.updated_at,
-            "company": None,
-            "application_count": 0
-        }
-        
-        # Buscar informações da empresa
-        company = db.query(Company).filter(Company.id == job.company_id).first()
+    for row in rows:
+        company = row.Company
+        company_info = None
         if company:
-            job_dict["company"] = {
+            company_info = {
                 "id": company.id,
                 "name": company.name,
                 "industry": company.industry,
@@ -95,31 +143,36 @@ async def list_jobs(
                 "is_inclusive": company.is_inclusive
             }
         
-        # Contar aplicações
-        application_count = db.query(Application).filter(Application.job_id == job.id).count()
-        job_dict["application_count"] = application_count
+        extra = {}
+        if "rank" in row._fields:
+            extra = {"rank": row.rank, "highlight": row.highlight}
         
-        result.append(job_dict)
+        result.append(_serialize_job(row.Job, company_info, **extra))
     
     return result
 
 @router.get("/{job_id}", response_model=JobSchema)
 async def get_job(
     job_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Retorna detalhes de uma vaga específica"""
     
-    job = db.query(Job).filter(Job.id == job_id, Job.is_active == True).first()
+    row = (await db.execute(
+        select(Job, Company)
+        .outerjoin(Company, Company.id == Job.company_id)
+        .where(Job.id == job_id, Job.is_active == True)
+    )).first()
     
-    if not job:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Vaga não encontrada"
         )
     
-    # Buscar informações da empresa
-    company = db.query(Company).filter(Company.id == job.company_id).first()
+    job, company = row
+    
+    # Informações da empresa
     company_info = None
     if company:
         company_info = {
@@ -134,39 +187,19 @@ async def get_job(
             "inclusion_policies": company.inclusion_policies
         }
     
-    # Contar aplicações
-    application_count = db.query(Application).filter(Application.job_id == job.id).count()
-    
-    return {
-        "id": job.id,
-        "title": job.title,
-        "description": job.description,
-        "requirements": job.requirements,
-        "benefits": job.benefits,
-        "location": job.location,
-        "remote_work": job.remote_work,
-        "salary_min": job.salary_min,
-        "salary_max": job.salary_max,
-        "employment_type": job.employment_type,
-        "company_id": job.company_id,
-        "is_active": job.is_active,
-        "created_at": job.created_at,
-        "updated_at": job.updated_at,
-        "company": company_info,
-        "application_count": application_count
-    }
+    return _serialize_job(job, company_info)
 
 @router.post("/{job_id}/apply", response_model=ApplicationResponse)
 async def apply_to_job(
     job_id: int,
     application_data: ApplicationCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Permite um usuário se aplicar a uma vaga"""
     
     # Verificar se a vaga existe e está ativa
-    job = db.query(Job).filter(Job.id == job_id, Job.is_active == True).first()
+    job = await db.scalar(select(Job).where(Job.id == job_id, Job.is_active == True))
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -174,10 +207,10 @@ async def apply_to_job(
         )
     
     # Verificar se o usuário já se aplicou a esta vaga para evitar duplicatas
-    existing_application = db.query(Application).filter(
+    existing_application = await db.scalar(select(Application).where(
         Application.candidate_id == current_user.id,
         Application.job_id == job_id
-    ).first()
+    ))
     
     if existing_application:
         raise HTTPException(
@@ -194,10 +227,20 @@ async def apply_to_job(
         status="pending"
     )
     
-    # Adicionar à sessão do banco de dados e fazer commit
+    # Adicionar à sessão do banco de dados e atualizar os contadores na mesma transação
     db.add(application)
-    db.commit()
-    db.refresh(application)
+    for statement in counter_updates(job.id, job.company_id, added=ApplicationStatus.PENDING):
+        await db.execute(statement)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Candidatura concorrente barrada por uq_applications_candidate_job
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Você já se aplicou a esta vaga"
+        )
+    await db.refresh(application)
     
     # Buscar informações do candidato
     candidate_info = {
@@ -221,13 +264,16 @@ async def apply_to_job(
 @router.get("/{job_id}/applications")
 async def get_job_applications(
     job_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Número de resultados por página"),
+    after: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Retorna as aplicações de uma vaga (apenas para a empresa dona da vaga)"""
     
     # Verificar se a vaga existe
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.scalar(select(Job).where(Job.id == job_id))
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -235,20 +281,26 @@ async def get_job_applications(
         )
     
     # Verificar se o usuário é a empresa dona da vaga
-    company = db.query(Company).filter(Company.id == job.company_id).first()
+    company = await db.scalar(select(Company).where(Company.id == job.company_id))
     if not company or company.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Acesso negado. Você não é dono desta vaga"
         )
     
-    # Buscar aplicações
-    applications = db.query(Application).filter(Application.job_id == job_id).all()
+    # Buscar aplicações com os dados do candidato na mesma consulta
+    query = (
+        select(Application, User)
+        .outerjoin(User, User.id == Application.candidate_id)
+        .where(Application.job_id == job_id)
+    )
+    query = apply_keyset(query, Application, after)
+    if limit:
+        query = query.limit(limit)
+    rows = (await db.execute(query)).all()
     
     result = []
-    for app in applications:
-        # Buscar informações do candidato
-        candidate = db.query(User).filter(User.id == app.candidate_id).first()
+    for app, candidate in rows:
         candidate_info = None
         if candidate:
             candidate_info = {
@@ -268,12 +320,15 @@ async def get_job_applications(
             "candidate": candidate_info
         })
     
-    return {"applications": result}
+    cursor = next_cursor([app for app, _ in rows], limit)
+    set_next_cursor(response, cursor)
+    
+    return {"applications": result, "next_cursor": cursor}
 
 @router.get("/my-applications")
 async def get_my_applications(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Retorna as aplicações do candidato logado"""
     
@@ -283,17 +338,18 @@ async def get_my_applications(
             detail="Apenas candidatos podem acessar este endpoint"
         )
     
-    # Buscar aplicações do candidato
-    applications = db.query(Application).filter(Application.candidate_id == current_user.id).all()
+    # Buscar aplicações do candidato com vaga e empresa na mesma consulta
+    rows = (await db.execute(
+        select(Application, Job, Company)
+        .outerjoin(Job, Job.id == Application.job_id)
+        .outerjoin(Company, Company.id == Job.company_id)
+        .where(Application.candidate_id == current_user.id)
+    )).all()
     
     result = []
-    for app in applications:
-        # Buscar informações da vaga
-        job = db.query(Job).filter(Job.id == app.job_id).first()
+    for app, job, company in rows:
         job_info = None
         if job:
-            # Buscar informações da empresa
-            company = db.query(Company).filter(Company.id == job.company_id).first()
             company_info = None
             if company:
                 company_info = {
@@ -0,0 +1,104 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..api.auth import get_current_user, optional_oauth2_scheme
+from ..core.config import settings
+from ..db.database import get_async_db
+from ..models.user import UserType
+from ..db.database import engine, async_engine, replica_engine, replica_health, get_pool_options
+from ..db.pool import pool_status
+from ..utils.llm_cache import llm_cache
+from ..utils.singleflight import SingleFlight
+from ..utils.bulkhead import bulkhead_stats
+from ..utils.resilience import breaker_stats
+from ..utils.ai_usage import ai_usage
+from ..utils.interview_sessions import interview_sessions
+from ..utils.question_bank import question_bank
+from ..utils.interview_feedback import feedback_jobs
+from ..utils.voice_latency import voice_latency
+
+async def require_metrics_access(
+    x_metrics_token: Optional[str] = Header(None),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Métricas expõem custos, sessões e estado interno: só admins ou coletores com METRICS_TOKEN"""
+    if settings.metrics_token and x_metrics_token and secrets.compare_digest(x_metrics_token, settings.metrics_token):
+        return
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Não foi possível validar as credenciais",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = await get_current_user(token, db)
+    if user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso restrito a administradores"
+        )
+
+router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(require_metrics_access)])
+
+@router.get("/db-pool")
+async def get_db_pool_metrics():
+    """Estado dos pools de conexão deste worker (em uso, ociosas, overflow e espera)"""
+    metrics = {
+        "async": pool_status(async_engine.pool),
+        "sync": pool_status(engine.pool),
+        "settings": {
+            **get_pool_options(),
+            "statement_timeout_ms": settings.db_statement_timeout_ms
+        }
+    }
+    if replica_engine is not None:
+        metrics["replica"] = {**pool_status(replica_engine.pool), **replica_health.status()}
+    return metrics
+
+@router.get("/llm-cache")
+async def get_llm_cache_metrics():
+    """Acertos, falhas e ocupação do cache de respostas de LLM deste worker"""
+    return llm_cache.stats()
+
+@router.get("/single-flight")
+async def get_single_flight_metrics():
+    """Execuções e chamadas coalescidas por grupo de single-flight deste worker"""
+    return SingleFlight.all_stats()
+
+@router.get("/bulkheads")
+async def get_bulkhead_metrics():
+    """Vagas ocupadas, profundidade da fila e tempo de espera por upstream deste worker"""
+    return bulkhead_stats()
+
+@router.get("/circuit-breakers")
+async def get_circuit_breaker_metrics():
+    """Estado dos circuit breakers e retries por provedor de IA deste worker"""
+    return breaker_stats()
+
+@router.get("/ai-usage")
+async def get_ai_usage_metrics():
+    """Tokens, áudio, latência e custo estimado das chamadas de IA por rota deste worker"""
+    return ai_usage.snapshot()
+
+@router.get("/interview-sessions")
+async def get_interview_session_metrics():
+    """Sessões do chatbot de entrevista em memória, acertos e recargas do banco deste worker"""
+    return interview_sessions.stats()
+
+@router.get("/question-bank")
+async def get_question_bank_metrics():
+    """Pools carregados do banco de perguntas e aberturas servidas sem LLM deste worker"""
+    return question_bank.stats()
+
+@router.get("/feedback-jobs")
+async def get_feedback_job_metrics():
+    """Jobs de feedback de entrevista em memória por estado deste worker"""
+    return feedback_jobs.stats()
+
+@router.get("/voice-interview")
+async def get_voice_interview_metrics():
+    """Conexões abertas e percentis de latência por etapa dos turnos de voz deste worker"""
+    return voice_latency.stats()
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import os
 import shutil
@@ -8,7 +9,7 @@ from datetime import datetime
 import io
 import re
 
-from ..db.database import get_db
+from ..db.database import get_async_db, get_async_read_db
 from ..models.user import User, Profile
 from ..schemas.profile import (
     ProfileCreate, 
@@ -20,7 +21,10 @@ from ..schemas.profile import (
 )
 from ..api.auth import get_current_user
 from ..core.config import settings
-import openai
+from ..utils.openai_client import get_async_openai_client
+from ..utils.llm_cache import llm_cache, make_cache_key
+from ..utils.bulkhead import BulkheadFullError
+from ..utils.resilience import call_upstream
 from docx import Document
 import PyPDF2
 
@@ -87,7 +91,7 @@ def extract_text_from_file(content: bytes, file_extension: str) -> str:
             detail="Tipo de arquivo não suportado para extração de texto"
         )
 
-def analyze_cv_with_openai(cv_text: str) -> CVAnalysisResponse:
+async def analyze_cv_with_openai(cv_text: str) -> CVAnalysisResponse:
     """Analisa o currículo usando OpenAI"""
     if not settings.openai_api_key:
         # Retornar análise mockada se não houver API key
@@ -129,17 +133,31 @@ def analyze_cv_with_openai(cv_text: str) -> CVAnalysisResponse:
         Responda em português brasileiro e seja construtivo e encorajador.
         """
 
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Você é um especialista em recursos humanos focado em inclusão e acessibilidade para pessoas com deficiência."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
+        system_prompt = "Você é um especialista em recursos humanos focado em inclusão e acessibilidade para pessoas com deficiência."
+        
+        async def request_analysis() -> str:
+            client = get_async_openai_client()
+            response = await call_upstream(
+                "openai",
+                lambda: client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=1000,
+                    temperature=0.7,
+                    timeout=settings.openai_chat_timeout
+                ),
+                bulkhead="openai_chat",
+                operation="chat",
+                model="gpt-3.5-turbo"
+            )
+            return response.choices[0].message.content
         
-        analysis_text = response.choices[0].message.content
+        # O mesmo currículo reenviado reaproveita a análise já paga
+        cache_key = make_cache_key("gpt-3.5-turbo", system_prompt, prompt, max_tokens=1000, temperature=0.7)
+        analysis_text = await llm_cache.get_or_set("cv_analysis", cache_key, request_analysis)
         
         # Extrair informações estruturadas (simplificado)
         strengths = [
@@ -170,6 +188,8 @@ def analyze_cv_with_openai(cv_text: str) -> CVAnalysisResponse:
             accessibility_notes=accessibility_notes
         )
         
+    except BulkheadFullError:
+        raise
     except Exception as e:
         # Retornar análise mockada em caso de erro
         return CVAnalysisResponse(
@@ -195,10 +215,15 @@ def analyze_cv_with_openai(cv_text: str) -> CVAnalysisResponse:
 @router.get("/me", response_model=ProfileSchema)
 async def get_my_profile(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db),
+    write_db: AsyncSession = Depends(get_async_db)
 ):
     """Retorna o perfil do usuário logado"""
-    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+    profile = await db.scalar(select(Profile).where(Profile.user_id == current_user.id))
+    
+    if not profile:
+        # A leitura pode ter vindo da réplica: confirmar no primário antes de criar
+        profile = await write_db.scalar(select(Profile).where(Profile.user_id == current_user.id))
     
     if not profile:
         # Se não existe perfil, criar um perfil padrão
@@ -218,9 +243,9 @@ async def get_my_profile(
             accessibility_needs="",
             experience_summary=""
         )
-        db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        write_db.add(profile)
+        await write_db.commit()
+        await write_db.refresh(profile)
     
     return profile
 
@@ -228,10 +253,10 @@ async def get_my_profile(
 async def update_my_profile(
     profile_update: ProfileUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualiza o perfil do usuário logado"""
-    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+    profile = await db.scalar(select(Profile).where(Profile.user_id == current_user.id))
     
     if not profile:
         # Se não existe perfil, criar um novo
@@ -244,8 +269,8 @@ async def update_my_profile(
         for field, value in update_data.items():
             setattr(profile, field, value)
     
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
     
     return profile
 
@@ -253,7 +278,7 @@ async def update_my_profile(
 async def upload_cv(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload de arquivo de currículo com extração de texto e análise automática"""
     
@@ -300,10 +325,10 @@ async def upload_cv(
         )
     
     # Analisar currículo com OpenAI
-    analysis = analyze_cv_with_openai(cv_text)
+    analysis = await analyze_cv_with_openai(cv_text)
     
     # Atualizar perfil do usuário com informações extraídas
-    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+    profile = await db.scalar(select(Profile).where(Profile.user_id == current_user.id))
     if not profile:
         profile = Profile(
             user_id=current_user.id,
@@ -315,8 +340,8 @@ async def upload_cv(
     
     # Salvar texto extraído no campo experience_summary
     profile.experience_summary = cv_text
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
     
     return {
         "filename": filename,
@@ -378,11 +403,11 @@ async def delete_cv(
 @router.get("/analysis", response_model=CVAnalysisResponse)
 async def get_cv_analysis(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Retorna a análise do currículo do usuário"""
     
-    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+    profile = await db.scalar(select(Profile).where(Profile.user_id == current_user.id))
     
     if not profile or not profile.experience_summary:
         raise HTTPException(
@@ -391,7 +416,7 @@ async def get_cv_analysis(
         )
     
     # Analisar currículo com OpenAI
-    analysis = analyze_cv_with_openai(profile.experience_summary)
+    analysis = await analyze_cv_with_openai(profile.experience_summary)
     
     return analysis
 
@@ -399,11 +424,11 @@ async def get_cv_analysis(
 async def analyze_cv(
     cv_analysis_request: CVAnalysisRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Analisa o currículo usando OpenAI"""
     
     # Analisar currículo com OpenAI
-    analysis = analyze_cv_with_openai(cv_analysis_request.cv_text)
+    analysis = await analyze_cv_with_openai(cv_analysis_request.cv_text)
     
     return analysis
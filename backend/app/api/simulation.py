@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from ..db.database import get_db
 from ..models.user import User
 from ..api.auth import get_current_user
+from ..utils.question_bank import question_bank
 from ..schemas.simulation import (
     SimulationConfig,
     SimulationSession,
@@ -17,6 +18,9 @@ from ..schemas.simulation import (
 
 router = APIRouter(prefix="/simulations", tags=["simulation"])
 
+# Perguntas por simulação (mesmo total anunciado em /start)
+SIMULATION_QUESTION_COUNT = 6
+
 @router.post("/start", response_model=SimulationSession)
 async def start_simulation(
     config: SimulationConfig,
@@ -46,7 +50,7 @@ async def start_simulation(
         "focus_areas": config.focus_areas,
         "status": "active",
         "current_question": 0,
-        "total_questions": 6,  # Simulado
+        "total_questions": SIMULATION_QUESTION_COUNT,
         "started_at": datetime.now(),
         "created_at": datetime.now(),
         "updated_at": datetime.now()
@@ -222,8 +226,26 @@ async def submit_answer(
     current_question = answer_data.current_question
     next_question = current_question + 1
     
-    # Simular perguntas baseadas no progresso
-    mock_questions = [
+    # Perguntas do banco pré-gerado; sem configuração, usa o pool misto intermediário geral.
+    # O id da sessão fixa a sequência sorteada entre as requisições.
+    bank_questions = await question_bank.questions(
+        answer_data.interview_type or "mixed",
+        answer_data.difficulty_level or "intermediate",
+        answer_data.focus_areas or [],
+        count=SIMULATION_QUESTION_COUNT,
+        seed=session_id
+    )
+    questions = [
+        {
+            "id": question["id"],
+            "question_text": question["question_text"],
+            "question_type": question["question_type"],
+            "difficulty": question["difficulty"],
+            "time_limit": 300,
+            "order": order
+        }
+        for order, question in enumerate(bank_questions, start=1)
+    ] or [
         {
             "id": 1,
             "question_text": "Olá! Vamos começar nossa entrevista. Primeiro, me conte um pouco sobre você e sua experiência profissional.",
@@ -275,8 +297,8 @@ async def submit_answer(
     ]
     
     # Verificar se há próxima pergunta
-    if next_question <= len(mock_questions):
-        next_question_data = mock_questions[next_question - 1]
+    if next_question <= len(questions):
+        next_question_data = questions[next_question - 1]
         is_complete = False
     else:
         next_question_data = None
@@ -284,7 +306,7 @@ async def submit_answer(
     
     # Simular resposta da IA
     ai_feedback = f"Entendi sua resposta sobre: '{answer_data.answer_text[:50]}...'. "
-    if next_question <= len(mock_questions):
+    if next_question <= len(questions):
         ai_feedback += "Vamos para a próxima pergunta!"
     else:
         ai_feedback += "Parabéns! Você completou todas as perguntas. Vamos analisar suas respostas."
@@ -296,7 +318,7 @@ async def submit_answer(
         "is_complete": is_complete,
         "progress": {
             "current": next_question,
-            "total": len(mock_questions)
+            "total": len(questions)
         }
     }
 
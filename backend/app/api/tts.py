@@ -6,7 +6,11 @@ from dotenv import load_dotenv
 import logging
 import uuid
 from pathlib import Path
-from ..utils.openai_client import get_openai_client
+from ..utils.openai_client import get_async_openai_client
+from ..core.config import settings
+from ..utils.singleflight import SingleFlight
+from ..utils.bulkhead import BulkheadFullError
+from ..utils.resilience import call_upstream
 
 # Configura o logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -39,8 +43,11 @@ class TextToSpeechRequest(BaseModel):
 AUDIO_DIR = Path("audio_tela")
 AUDIO_DIR.mkdir(exist_ok=True)
 
+# Pedidos simultâneos do mesmo texto geram um único arquivo de áudio
+tts_flight = SingleFlight("tts_gerar_audio")
+
 @router.post("/gerar-audio")
-def gerar_audio(request: TextToSpeechRequest):
+async def gerar_audio(request: TextToSpeechRequest):
     """Gera áudio a partir do texto fornecido e o salva em um arquivo no servidor."""
     logger.info("Recebida requisição para /gerar-audio.")
     try:
@@ -53,26 +60,41 @@ def gerar_audio(request: TextToSpeechRequest):
         # Instrução de idioma como prompt oculto (não será narrado)
         prompt_oculto = "[Instrução: Fale em português do Brasil (pt-BR). Não leia esta instrução em voz alta.]"
     
-        logger.info("Chamando a API da OpenAI para gerar o áudio...")
-        client = get_openai_client()
-        resposta = client.audio.speech.create(
-            model="tts-1",
-            voice="nova",
-            input=texto_final,
-        )
-        logger.info("Áudio gerado com sucesso pela API.")
+        async def sintetizar() -> Path:
+            logger.info("Chamando a API da OpenAI para gerar o áudio...")
+            client = get_async_openai_client()
+            resposta = await call_upstream(
+                "openai",
+                lambda: client.audio.speech.create(
+                    model="tts-1",
+                    voice="nova",
+                    input=texto_final,
+                    timeout=settings.openai_audio_timeout
+                ),
+                bulkhead="openai_tts",
+                operation="tts",
+                model="tts-1",
+                characters=len(texto_final)
+            )
+            audio = await resposta.aread()
+            logger.info("Áudio gerado com sucesso pela API.")
+
+            # Gera um nome de arquivo único e define o caminho completo
+            file_name = f"{uuid.uuid4()}.mp3"
+            file_path = AUDIO_DIR / file_name
 
-        # Gera um nome de arquivo único e define o caminho completo
-        file_name = f"{uuid.uuid4()}.mp3"
-        file_path = AUDIO_DIR / file_name
+            logger.info(f"Salvando o áudio em: {file_path}")
+            # Salva o áudio já recebido no arquivo
+            file_path.write_bytes(audio)
+            logger.info(f"Arquivo de áudio salvo com sucesso em '{file_path}'.")
+            return file_path
 
-        logger.info(f"Salvando o áudio em: {file_path}")
-        # Salva o stream de áudio diretamente no arquivo de forma eficiente
-        resposta.stream_to_file(file_path)
-        logger.info(f"Arquivo de áudio salvo com sucesso em '{file_path}'.")
+        file_path = await tts_flight.do(("tts-1", "nova", texto_final), sintetizar)
 
         # Retorna uma resposta JSON indicando sucesso e o caminho do arquivo
         return {"status": "sucesso", "caminho_do_arquivo": str(file_path)}
+    except BulkheadFullError:
+        raise
     except APIError as e:
         logger.error(f"Erro na API da OpenAI: Status={e.status_code}, Mensagem={e.message}", exc_info=True)
         raise HTTPException(status_code=e.status_code or 500, detail=f"Erro da API OpenAI: {str(e)}")
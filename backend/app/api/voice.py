@@ -1,13 +1,16 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
 from fastapi.responses import JSONResponse
 import openai
-import io
 import json
 import base64
 import logging
 from typing import Dict, Any
 from ..core.config import settings
-from ..utils.openai_client import get_openai_client
+from ..utils.openai_client import get_async_openai_client
+from ..utils.llm_cache import llm_cache, make_cache_key
+from ..utils.bulkhead import BulkheadFullError
+from ..utils.resilience import call_upstream
+from ..utils.speech import synthesize_speech, transcribe_audio as whisper_transcribe
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -70,37 +73,16 @@ async def transcribe_audio(audio_file: UploadFile = File(...)):
                 detail="Erro ao processar arquivo de áudio"
             )
         
-        # 5. Criar um objeto de arquivo para o Whisper
-        try:
-            audio_file_obj = io.BytesIO(audio_content)
-            # Definir nome do arquivo com extensão apropriada
-            filename = audio_file.filename or "audio.webm"
-            if not filename.lower().endswith(('.webm', '.mp4', '.mp3', '.wav', '.m4a')):
-                filename = "audio.webm"  # Fallback para webm
-            audio_file_obj.name = filename
-            
-            logger.info(f"Objeto de arquivo criado - Nome: {filename}")
-            
-        except Exception as e:
-            logger.error(f"Erro ao criar objeto de arquivo: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail="Erro ao preparar arquivo para transcrição"
-            )
+        # 5. Definir nome do arquivo com extensão apropriada para o Whisper
+        filename = audio_file.filename or "audio.webm"
+        if not filename.lower().endswith(('.webm', '.mp4', '.mp3', '.wav', '.m4a')):
+            filename = "audio.webm"  # Fallback para webm
         
         # 6. Transcrever usando Whisper
         try:
             logger.info("Iniciando chamada para OpenAI Whisper API")
             
-            # Usar o gerenciador robusto do OpenAI
-            client = get_openai_client()
-            
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file_obj,
-                language="pt",  # Português brasileiro
-                response_format="text"
-            )
+            transcript = await whisper_transcribe(audio_content, filename)
             
             logger.info("Transcrição concluída com sucesso")
             
@@ -115,6 +97,8 @@ async def transcribe_audio(audio_file: UploadFile = File(...)):
                 }
             }
             
+        except BulkheadFullError:
+            raise
         except openai.APIError as e:
             logger.error(f"Erro da API OpenAI: {str(e)}")
             raise HTTPException(
@@ -128,7 +112,7 @@ async def transcribe_audio(audio_file: UploadFile = File(...)):
                 detail="Erro interno na transcrição de áudio"
             )
         
-    except HTTPException:
+    except (HTTPException, BulkheadFullError):
         # Re-raise HTTPExceptions para manter o status code correto
         raise
     except Exception as e:
@@ -227,19 +211,29 @@ async def interpret_intent(request: Dict[str, Any]):
         """
         
         # Fazer a chamada para GPT-4o-mini usando gerenciador robusto
-        client = get_openai_client()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Comando do usuário: {transcript}"}
-            ],
-            temperature=0.1,  # Baixa temperatura para consistência
-            max_tokens=200
-        )
+        async def request_intent() -> str:
+            client = get_async_openai_client()
+            response = await call_upstream(
+                "openai",
+                lambda: client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": f"Comando do usuário: {transcript}"}
+                    ],
+                    temperature=0.1,  # Baixa temperatura para consistência
+                    max_tokens=200,
+                    timeout=settings.openai_chat_timeout
+                ),
+                bulkhead="openai_chat",
+                operation="chat",
+                model="gpt-4o-mini"
+            )
+            return response.choices[0].message.content.strip()
         
-        # Extrair a resposta
-        gpt_response = response.choices[0].message.content.strip()
+        # Comandos repetidos ("vou para vagas", "ajuda") são respondidos pelo cache
+        cache_key = make_cache_key("gpt-4o-mini", system_prompt, transcript, temperature=0.1, max_tokens=200)
+        gpt_response = await llm_cache.get_or_set("voice_interpret", cache_key, request_intent)
         
         # Tentar fazer parse do JSON
         try:
@@ -258,6 +252,8 @@ async def interpret_intent(request: Dict[str, Any]):
             "original_transcript": transcript
         }
         
+    except BulkheadFullError:
+        raise
     except Exception as e:
         print(f"Erro na interpretação: {str(e)}")
         raise HTTPException(
@@ -297,27 +293,34 @@ async def describe_image(request: Dict[str, Any]):
             )
         
         # Fazer a chamada para GPT-4o-mini Vision usando gerenciador robusto
-        client = get_openai_client()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "Descreva detalhadamente o que você vê nesta tela da Plataforma Farol. Inclua elementos visuais, botões, textos, layout e funcionalidades disponíveis. Seja específico e útil para um usuário com deficiência visual."
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/png;base64,{image_base64}"
+        client = get_async_openai_client()
+        response = await call_upstream(
+            "openai",
+            lambda: client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": "Descreva detalhadamente o que você vê nesta tela da Plataforma Farol. Inclua elementos visuais, botões, textos, layout e funcionalidades disponíveis. Seja específico e útil para um usuário com deficiência visual."
+                            },
+                            {
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": f"data:image/png;base64,{image_base64}"
+                                }
                             }
-                        }
-                    ]
-                }
-            ],
-            max_tokens=500
+                        ]
+                    }
+                ],
+                max_tokens=500,
+                timeout=settings.openai_vision_timeout
+            ),
+            bulkhead="openai_vision",
+            operation="vision",
+            model="gpt-4o-mini"
         )
         
         description = response.choices[0].message.content
@@ -327,6 +330,8 @@ async def describe_image(request: Dict[str, Any]):
             "description": description
         }
         
+    except BulkheadFullError:
+        raise
     except Exception as e:
         print(f"Erro na descrição: {str(e)}")
         raise HTTPException(
@@ -353,17 +358,9 @@ async def generate_speech(request: Dict[str, Any]):
                 detail="Texto é obrigatório"
             )
         
-        # Gerar áudio usando OpenAI TTS com gerenciador robusto
-        client = get_openai_client()
-        response = client.audio.speech.create(
-            model="tts-1",
-            voice="alloy",  # Voz neutra e clara
-            input=text,
-            response_format="mp3"
-        )
-        
-        # Converter para base64 para envio
-        audio_base64 = base64.b64encode(response.content).decode('utf-8')
+        # Gerar áudio usando OpenAI TTS (voz alloy, neutra e clara) e converter para base64
+        audio = await synthesize_speech(text, model="tts-1", voice="alloy")
+        audio_base64 = base64.b64encode(audio).decode('utf-8')
         
         return {
             "success": True,
@@ -371,6 +368,8 @@ async def generate_speech(request: Dict[str, Any]):
             "format": "mp3"
         }
         
+    except BulkheadFullError:
+        raise
     except Exception as e:
         print(f"Erro na geração de fala: {str(e)}")
         raise HTTPException(
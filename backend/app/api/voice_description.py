@@ -9,8 +9,12 @@ import asyncio
 from pathlib import Path
 from dotenv import load_dotenv
 import logging
-from ..utils.openai_client import get_openai_client
+from ..utils.openai_client import get_async_openai_client
+from ..core.config import settings
 from ..utils.playwright_manager import playwright_manager
+from ..utils.singleflight import SingleFlight
+from ..utils.bulkhead import BulkheadFullError, bulkhead
+from ..utils.resilience import call_upstream
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -26,6 +30,10 @@ AUDIO_DIR = Path("audio_tela")
 SCREENSHOT_DIR.mkdir(exist_ok=True)
 AUDIO_DIR.mkdir(exist_ok=True)
 
+# Requisições simultâneas para a mesma URL ou o mesmo texto compartilham o trabalho
+describe_page_flight = SingleFlight("describe_page")
+tts_flight = SingleFlight("tts")
+
 class VoiceDescriptionRequest(BaseModel):
     url: HttpUrl
 
@@ -45,6 +53,11 @@ def aplicar_regras_fala(texto: str) -> str:
     return texto
 
 async def take_screenshot_async(url: str) -> str:
+    """Tira screenshot da página (limitado pelo bulkhead do Chromium)"""
+    async with bulkhead("chromium"):
+        return await _take_screenshot(url)
+
+async def _take_screenshot(url: str) -> str:
     """Tira screenshot da página usando gerenciador robusto do Playwright"""
     logger.info(f"Tirando screenshot da URL: {url}")
     try:
@@ -102,11 +115,14 @@ def preprocess_image_bytes(path, max_width=1024, jpeg_quality=75):
     data = buf.getvalue()
     return data, "image/jpeg"
 
-def descrever_imagem_com_llm(caminho_imagem: str) -> str:
+async def descrever_imagem_com_llm(caminho_imagem: str) -> str:
     """Descreve a imagem usando LLM"""
     logger.info(f"Descrevendo imagem: {caminho_imagem}")
     try:
-        img_bytes, mime = preprocess_image_bytes(caminho_imagem, max_width=1024, jpeg_quality=75)
+        # Redimensionamento com PIL é CPU intensivo: roda fora do event loop
+        img_bytes, mime = await asyncio.to_thread(
+            preprocess_image_bytes, caminho_imagem, max_width=1024, jpeg_quality=75
+        )
 
         prompt = """
         Você é um audiodescritor especialista em acessibilidade digital. Sua missão é traduzir conteúdo visual em uma experiência verbal rica e funcional para um usuário cego.
@@ -132,48 +148,71 @@ def descrever_imagem_com_llm(caminho_imagem: str) -> str:
 
         data_url = f"data:{mime};base64,{base64.b64encode(img_bytes).decode('utf-8')}"
         
-        client = get_openai_client()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {"type": "image_url", "image_url": {"url": data_url}},
-                    ],
-                }
-            ],
-            max_tokens=500,
-            temperature=0.0,
+        client = get_async_openai_client()
+        response = await call_upstream(
+            "openai",
+            lambda: client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": prompt},
+                            {"type": "image_url", "image_url": {"url": data_url}},
+                        ],
+                    }
+                ],
+                max_tokens=500,
+                temperature=0.0,
+                timeout=settings.openai_vision_timeout
+            ),
+            bulkhead="openai_vision",
+            operation="vision",
+            model="gpt-4o-mini"
         )
 
         descricao = response.choices[0].message.content
         logger.info(f"Descrição gerada: {len(descricao)} caracteres")
         return descricao
+    except BulkheadFullError:
+        raise
     except Exception as e:
         logger.exception("Erro ao descrever imagem")
         raise HTTPException(status_code=500, detail=f"Erro ao descrever imagem: {str(e)}")
 
-def gerar_audio_com_openai(texto: str) -> str:
-    """Gera áudio usando OpenAI TTS"""
+async def gerar_audio_com_openai(texto: str) -> str:
+    """Gera áudio usando OpenAI TTS (uma única chamada por texto em andamento)"""
+    return await tts_flight.do(("tts-1", "nova", texto), lambda: _gerar_audio_com_openai(texto))
+
+async def _gerar_audio_com_openai(texto: str) -> str:
     logger.info(f"Gerando áudio para texto de {len(texto)} caracteres")
     try:
         texto_final = aplicar_regras_fala(texto)
         
-        client = get_openai_client()
-        resposta = client.audio.speech.create(
+        client = get_async_openai_client()
+        resposta = await call_upstream(
+            "openai",
+            lambda: client.audio.speech.create(
+                model="tts-1",
+                voice="nova",
+                input=texto_final,
+                timeout=settings.openai_audio_timeout
+            ),
+            bulkhead="openai_tts",
+            operation="tts",
             model="tts-1",
-            voice="nova",
-            input=texto_final,
+            characters=len(texto_final)
         )
+        audio = await resposta.aread()
 
         file_name = f"{uuid.uuid4()}.mp3"
         file_path = AUDIO_DIR / file_name
-        resposta.stream_to_file(file_path)
+        file_path.write_bytes(audio)
         
         logger.info(f"Áudio salvo em: {file_path}")
         return str(file_name)
+    except BulkheadFullError:
+        raise
     except Exception as e:
         logger.exception("Erro ao gerar áudio")
         raise HTTPException(status_code=500, detail=f"Erro ao gerar áudio: {str(e)}")
@@ -183,16 +222,16 @@ async def describe_page(request: VoiceDescriptionRequest):
     """Descreve uma página web e gera áudio da descrição"""
     logger.info(f"Recebida requisição para descrever página: {request.url}")
     
-    try:
+    async def descrever_pagina():
         # 1. Tirar screenshot
         screenshot_filename = await take_screenshot_async(str(request.url))
         screenshot_path = SCREENSHOT_DIR / screenshot_filename
         
         # 2. Descrever com LLM
-        descricao = descrever_imagem_com_llm(str(screenshot_path))
+        descricao = await descrever_imagem_com_llm(str(screenshot_path))
         
         # 3. Gerar áudio
-        audio_filename = gerar_audio_com_openai(descricao)
+        audio_filename = await gerar_audio_com_openai(descricao)
         
         return {
             "status": "sucesso",
@@ -201,6 +240,12 @@ async def describe_page(request: VoiceDescriptionRequest):
             "audio": audio_filename,
             "audio_url": f"/api/v1/voice-description/audio/{audio_filename}"
         }
+    
+    try:
+        # Vários usuários abrindo a mesma página aguardam o mesmo pipeline
+        return await describe_page_flight.do(str(request.url), descrever_pagina)
+    except BulkheadFullError:
+        raise
     except Exception as e:
         logger.exception("Erro na descrição da página")
         raise HTTPException(status_code=500, detail=f"Erro ao descrever página: {str(e)}")
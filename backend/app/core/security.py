@@ -1,12 +1,28 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from .config import settings
 
-# Configuração do contexto de criptografia
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configuração do contexto de criptografia. Hashes com custo diferente de
+# bcrypt_rounds (para mais ou para menos) são refeitos no próximo login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds
+)
+
+# Executor dedicado ao bcrypt: o hash é CPU intensivo e não pode rodar no event loop.
+# O número de threads limita quantos hashes rodam em paralelo; os demais aguardam na fila
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash"
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a senha em texto plano corresponde ao hash"""
@@ -16,6 +32,21 @@ def get_password_hash(password: str) -> str:
     """Gera o hash da senha"""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha fora do event loop. Retorna (válida, novo_hash), onde
+    novo_hash vem preenchido quando o hash armazenado usa outro custo
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    """Gera o hash da senha fora do event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Cria um token JWT de acesso"""
     to_encode = data.copy()
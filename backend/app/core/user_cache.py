@@ -0,0 +1,95 @@
+"""
+Cache em memória dos usuários resolvidos a partir do token JWT.
+Guarda instâncias desanexadas da sessão (com o perfil carregado), com TTL e
+limite de tamanho (LRU). Alterações em User ou Profile feitas pelo ORM
+invalidam a entrada neste processo; nos demais workers vale o TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from .config import settings
+from ..models.user import User, Profile
+
+class UserCache:
+    """Cache LRU com TTL de usuários autenticados"""
+    
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+    
+    def get(self, user_id: int) -> Optional[User]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+    
+    def set(self, user: User):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[user.id] = (user, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id: Optional[int]):
+        if user_id is None:
+            return
+        with self._lock:
+            self._entries.pop(user_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+user_cache = UserCache(settings.auth_user_cache_size, settings.auth_user_cache_ttl_seconds)
+
+# Chave em Session.info com os usuários a invalidar novamente após o commit
+_PENDING_KEY = "user_cache_invalidations"
+
+def _invalidate_user(target, user_id: Optional[int]):
+    # Invalida já no flush e de novo no commit, para que uma requisição
+    # concorrente não recoloque no cache o estado anterior à transação
+    user_cache.invalidate(user_id)
+    session = object_session(target)
+    if session is not None and user_id is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    _invalidate_user(target, target.id)
+
+@event.listens_for(Profile, "after_insert")
+@event.listens_for(Profile, "after_update")
+@event.listens_for(Profile, "after_delete")
+def _profile_changed(mapper, connection, target):
+    _invalidate_user(target, target.user_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        user_cache.invalidate(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
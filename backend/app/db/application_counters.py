@@ -0,0 +1,110 @@
+"""
+Manutenção dos contadores de aplicações desnormalizados em jobs e companies
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select, update, tuple_
+from sqlalchemy.engine import Connection
+
+from ..models.user import Job, Company
+from ..models.application import Application, ApplicationStatus, ApplicationCountersMixin
+
+COUNTER_COLUMNS = ["application_count"] + [
+    ApplicationCountersMixin.status_counter(s) for s in ApplicationStatus
+]
+
+def _counter_deltas(added=None, removed=None) -> Dict[str, int]:
+    """Calcula os incrementos de cada contador para uma mudança de status"""
+    deltas: Dict[str, int] = {}
+    if added is not None:
+        column = ApplicationCountersMixin.status_counter(added)
+        deltas[column] = deltas.get(column, 0) + 1
+    if removed is not None:
+        column = ApplicationCountersMixin.status_counter(removed)
+        deltas[column] = deltas.get(column, 0) - 1
+    total = (added is not None) - (removed is not None)
+    if total:
+        deltas["application_count"] = total
+    return {column: delta for column, delta in deltas.items() if delta}
+
+def _increment(model, row_id: int, deltas: Dict[str, int]):
+    """UPDATE atômico (col = col + delta), seguro sob concorrência"""
+    values = {column: getattr(model, column) + delta for column, delta in deltas.items()}
+    return update(model).where(model.id == row_id).values(**values)
+
+def counter_updates(job_id: int, company_id: int, added=None, removed=None) -> List:
+    """
+    Retorna os UPDATEs que refletem uma aplicação criada (added), removida
+    (removed) ou com status alterado (ambos) nos contadores da vaga e da empresa.
+    Devem ser executados na mesma transação da alteração da aplicação.
+    """
+    deltas = _counter_deltas(added=added, removed=removed)
+    if not deltas:
+        return []
+    return [_increment(Job, job_id, deltas), _increment(Company, company_id, deltas)]
+
+def job_removed_updates(job: Job) -> List:
+    """Retorna o UPDATE que desconta os contadores de uma vaga removida da empresa"""
+    deltas = {column: -getattr(job, column) for column in COUNTER_COLUMNS if getattr(job, column)}
+    if not deltas:
+        return []
+    return [_increment(Company, job.company_id, deltas)]
+
+def _status_count(status: ApplicationStatus):
+    return func.count(Application.id).filter(Application.status == status)
+
+def reconcile_application_counters(conn: Connection, company_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Recalcula em lote os contadores a partir da tabela applications e corrige
+    apenas as linhas divergentes. Retorna quantas vagas e empresas foram ajustadas.
+    """
+    # Contagens reais por vaga
+    job_totals = (
+        select(
+            Job.id.label("job_id"),
+            func.count(Application.id).label("application_count"),
+            *[_status_count(s).label(ApplicationCountersMixin.status_counter(s)) for s in ApplicationStatus]
+        )
+        .select_from(Job)
+        .outerjoin(Application, Application.job_id == Job.id)
+        .group_by(Job.id)
+    )
+    if company_id is not None:
+        job_totals = job_totals.where(Job.company_id == company_id)
+    job_totals = job_totals.subquery()
+
+    jobs_result = conn.execute(
+        update(Job)
+        .where(Job.id == job_totals.c.job_id)
+        .where(
+            tuple_(*[getattr(Job, c) for c in COUNTER_COLUMNS])
+            .is_distinct_from(tuple_(*[job_totals.c[c] for c in COUNTER_COLUMNS]))
+        )
+        .values(**{c: job_totals.c[c] for c in COUNTER_COLUMNS})
+    )
+
+    # Contagens por empresa a partir das vagas já corrigidas
+    company_totals = (
+        select(
+            Company.id.label("company_id"),
+            *[func.coalesce(func.sum(getattr(Job, c)), 0).label(c) for c in COUNTER_COLUMNS]
+        )
+        .select_from(Company)
+        .outerjoin(Job, Job.company_id == Company.id)
+        .group_by(Company.id)
+    )
+    if company_id is not None:
+        company_totals = company_totals.where(Company.id == company_id)
+    company_totals = company_totals.subquery()
+
+    companies_result = conn.execute(
+        update(Company)
+        .where(Company.id == company_totals.c.company_id)
+        .where(
+            tuple_(*[getattr(Company, c) for c in COUNTER_COLUMNS])
+            .is_distinct_from(tuple_(*[company_totals.c[c] for c in COUNTER_COLUMNS]))
+        )
+        .values(**{c: company_totals.c[c] for c in COUNTER_COLUMNS})
+    )
+
+    return {"jobs": jobs_result.rowcount, "companies": companies_result.rowcount}
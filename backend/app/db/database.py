@@ -1,14 +1,146 @@
-from sqlalchemy import create_engine
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
 from ..models.base import Base
+from .pool import TimedQueuePool, TimedAsyncAdaptedQueuePool
+
+def get_pool_options() -> dict:
+    """Parâmetros do pool de conexões definidos em Settings"""
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+def get_async_database_url(database_url: str) -> URL:
+    """Converte a URL do banco para o driver asyncpg (sslmode do libpq vira ssl)"""
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    sslmode = url.query.get("sslmode")
+    if sslmode:
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return url
+
+def _sync_connect_args() -> dict:
+    if not settings.db_statement_timeout_ms:
+        return {}
+    return {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+
+def _async_connect_args() -> dict:
+    if not settings.db_statement_timeout_ms:
+        return {}
+    return {"server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}}
 
 # Criar engine do banco de dados
-engine = create_engine(settings.database_url)
+engine = create_engine(
+    settings.database_url,
+    poolclass=TimedQueuePool,
+    connect_args=_sync_connect_args(),
+    **get_pool_options()
+)
 
 # Criar sessão do banco
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrona (asyncpg) usada pelos routers async
+async_engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    poolclass=TimedAsyncAdaptedQueuePool,
+    connect_args=_async_connect_args(),
+    **get_pool_options()
+)
+
+# Sessão assíncrona; expire_on_commit=False evita recarregar atributos
+# (lazy load não é permitido fora do await) após cada commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Réplica de leitura opcional (mesmos parâmetros de pool do primário)
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.database_replica_url:
+    replica_engine = create_async_engine(
+        get_async_database_url(settings.database_replica_url),
+        poolclass=TimedAsyncAdaptedQueuePool,
+        connect_args=_async_connect_args(),
+        **get_pool_options()
+    )
+    ReplicaSessionLocal = async_sessionmaker(
+        bind=replica_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+# Atraso de replicação em segundos (0 se a réplica já aplicou tudo o que recebeu)
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+# Tempo máximo da verificação de atraso antes de considerar a réplica indisponível
+REPLICA_CHECK_TIMEOUT = 2.0
+
+class ReplicaHealth:
+    """Atraso da réplica, reavaliado no máximo a cada db_replica_check_interval segundos"""
+    
+    def __init__(self):
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _expired(self) -> bool:
+        return time.monotonic() - self.checked_at >= settings.db_replica_check_interval
+    
+    async def is_usable(self) -> bool:
+        """Indica se a réplica está acessível e dentro do atraso tolerado"""
+        if self._expired():
+            async with self._lock:
+                if self._expired():
+                    await self._check()
+        return self.healthy
+    
+    async def _check(self):
+        try:
+            lag = await asyncio.wait_for(self._read_lag(), timeout=REPLICA_CHECK_TIMEOUT)
+            self.lag_seconds, self.error = lag, None
+            self.healthy = lag <= settings.db_replica_max_lag_seconds
+        except Exception as e:
+            self.lag_seconds, self.error = None, str(e) or type(e).__name__
+            self.healthy = False
+        self.checked_at = time.monotonic()
+    
+    async def _read_lag(self) -> float:
+        async with replica_engine.connect() as conn:
+            return float(await conn.scalar(REPLICA_LAG_QUERY))
+    
+    def status(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": settings.db_replica_max_lag_seconds,
+            "error": self.error
+        }
+
+replica_health = ReplicaHealth()
+
 def get_db():
     """Dependency para obter sessão do banco de dados"""
     db = SessionLocal()
@@ -16,3 +148,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Dependency para obter sessão assíncrona do banco de dados"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db(db: AsyncSession = Depends(get_async_db)):
+    """
+    Dependency para endpoints somente leitura: usa a réplica quando configurada
+    e dentro do atraso tolerado, senão a mesma sessão do primário da requisição
+    """
+    if ReplicaSessionLocal is None or not await replica_health.is_usable():
+        yield db
+        return
+    async with ReplicaSessionLocal() as replica_db:
+        yield replica_db
@@ -1,13 +1,47 @@
-from sqlalchemy import create_engine
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect
 from ..core.config import settings
 from ..models.base import Base
 from ..models import *  # Importa todos os modelos
 
+# Diretório do backend (onde ficam alembic.ini e a pasta alembic/)
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Revisão equivalente ao esquema que create_all gerava antes das migrações
+BASELINE_REVISION = "0001"
+
 def create_tables():
     """Cria todas as tabelas no banco de dados"""
     engine = create_engine(settings.database_url)
     Base.metadata.create_all(bind=engine)
 
+def get_alembic_config():
+    """Configuração do Alembic independente do diretório atual"""
+    from alembic.config import Config
+    
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return config
+
+def run_migrations():
+    """Aplica as migrações pendentes (alembic upgrade head)"""
+    from alembic import command
+    
+    config = get_alembic_config()
+    
+    # Bancos criados com create_all antes do histórico de migrações
+    # são marcados com a revisão base e atualizados a partir dela
+    engine = create_engine(settings.database_url)
+    try:
+        inspector = inspect(engine)
+        if not inspector.has_table("alembic_version") and inspector.has_table("users"):
+            command.stamp(config, BASELINE_REVISION)
+    finally:
+        engine.dispose()
+    
+    command.upgrade(config, "head")
+
 if __name__ == "__main__":
-    create_tables()
-    print("Tabelas criadas com sucesso!")
+    run_migrations()
+    print("Migrações aplicadas com sucesso!")
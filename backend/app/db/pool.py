@@ -0,0 +1,93 @@
+"""
+Pools de conexão instrumentados: registram o tempo de espera por conexão
+e expõem o estado atual (em uso, ociosas, overflow) para dimensionamento
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Quantidade de esperas recentes usadas no cálculo dos percentis
+WAIT_SAMPLE_SIZE = 1000
+
+class PoolWaitStats:
+    """Estatísticas do tempo de espera no checkout de conexões"""
+
+    def __init__(self, sample_size: int = WAIT_SAMPLE_SIZE):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=sample_size)
+        self.count = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.count += 1
+            self.timeouts += timed_out
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self._recent.append(seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            recent = sorted(self._recent)
+            count, timeouts = self.count, self.timeouts
+            total, maximum = self.total_seconds, self.max_seconds
+
+        def percentile(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p * len(recent)))] * 1000
+
+        return {
+            "checkouts": count,
+            "timeouts": timeouts,
+            "avg_ms": (total / count * 1000) if count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": maximum * 1000,
+        }
+
+class _TimedCheckoutMixin:
+    """Mede quanto cada checkout esperou por uma conexão livre (ou nova)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool (engine síncrona) com métricas de espera"""
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (engine asyncpg) com métricas de espera"""
+
+def pool_status(pool) -> Dict:
+    """Estado atual do pool e estatísticas de espera"""
+    status = {
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # overflow() fica negativo enquanto o pool base não foi todo aberto
+        "overflow": max(pool.overflow(), 0),
+        "timeout_seconds": pool.timeout(),
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status["wait"] = wait_stats.snapshot()
+    return status
@@ -1,5 +1,6 @@
 # 1º: Todos os imports necessários
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.routing import APIRouter
 
@@ -13,7 +14,16 @@ from .api.matches import router as matches_router
 from .api.interviews import router as interviews_router
 from .api.voice import router as voice_router
 from .api.interview_chatbot import router as interview_chatbot_router
+from .api.interview_voice import router as interview_voice_router
 from .api.voice_description import router as voice_description_router
+from .api.metrics import router as metrics_router
+from .db.database import async_engine, replica_engine
+from .utils.openai_client import AsyncOpenAIClientManager
+from .utils.perplexity_client import PerplexityClientManager
+from .utils.bulkhead import BulkheadFullError
+from .utils.ai_usage import AIUsageRouteMiddleware, ai_usage
+from .utils.question_bank import question_bank
+from .utils.interview_feedback import feedback_jobs
 
 # 2º: Criação da instância principal
 app = FastAPI(
@@ -56,6 +66,9 @@ app.add_middleware(
 )
 print("✅ CORS configurado com allow_origins=['*']")
 
+# Associa as chamadas de IA à rota de origem (contabilidade em /metrics/ai-usage)
+app.add_middleware(AIUsageRouteMiddleware)
+
 # 5º: Criação do api_router com prefixo global
 api_router = APIRouter(prefix="/api/v1")
 
@@ -70,11 +83,57 @@ api_router.include_router(matches_router, tags=["Matches"])
 api_router.include_router(interviews_router, tags=["Interviews"])
 api_router.include_router(voice_router, prefix="/voice", tags=["Voice Assistant"])
 api_router.include_router(interview_chatbot_router, tags=["Interview Chatbot"])
+api_router.include_router(interview_voice_router, tags=["Interview Chatbot"])
 api_router.include_router(voice_description_router, tags=["Voice Description"])
+api_router.include_router(metrics_router, tags=["Metrics"])
 
 # 7º: Chamada final app.include_router
 app.include_router(api_router)
 
+@app.exception_handler(BulkheadFullError)
+async def bulkhead_full_handler(request: Request, exc: BulkheadFullError):
+    """Upstream de IA saturado: responde rápido para o cliente tentar de novo depois"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.on_event("shutdown")
+async def fail_unfinished_feedback_jobs():
+    """Jobs de feedback em andamento morrem com o worker: ficam como failed para serem refeitos"""
+    await feedback_jobs.shutdown()
+
+@app.on_event("shutdown")
+async def flush_ai_usage():
+    """Grava o consumo de IA pendente enquanto o pool do banco ainda está aberto"""
+    await ai_usage.stop()
+
+@app.on_event("shutdown")
+async def dispose_database_engines():
+    """Fecha as conexões do pool assíncrono ao encerrar a aplicação"""
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+@app.on_event("startup")
+async def start_ai_clients():
+    """Cria o cliente HTTP compartilhado da Perplexity e inicia a gravação do consumo de IA"""
+    PerplexityClientManager.start()
+    ai_usage.start()
+
+@app.on_event("startup")
+async def load_question_bank():
+    """Carrega os pools do banco de perguntas para abrir entrevistas sem esperar o LLM"""
+    if question_bank.enabled:
+        await question_bank.reload()
+
+@app.on_event("shutdown")
+async def close_ai_clients():
+    """Fecha os pools HTTP compartilhados dos clientes de IA"""
+    await AsyncOpenAIClientManager.aclose()
+    await PerplexityClientManager.aclose()
+
 @app.get("/")
 async def root():
     return {"message": "Bem-vindo à Plataforma Farol API"}
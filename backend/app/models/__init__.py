@@ -1,8 +1,9 @@
 # Models package
 from .base import Base, BaseModel
 from .user import User, Profile, Company, Job, UserType
-from .application import Application, ApplicationStatus
-from .learning import Course, InterviewSimulation
+from .application import Application, ApplicationStatus, ApplicationCountersMixin
+from .learning import Course, InterviewSimulation, InterviewQuestion
+from .ai_usage import AIUsageRollup
 
 __all__ = [
     "Base",
@@ -14,6 +15,9 @@ __all__ = [
     "UserType",
     "Application",
     "ApplicationStatus",
+    "ApplicationCountersMixin",
     "Course",
-    "InterviewSimulation"
+    "InterviewSimulation",
+    "InterviewQuestion",
+    "AIUsageRollup"
 ]
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Integer, Float, Numeric, DateTime, Index
+from .base import BaseModel
+
+class AIUsageRollup(BaseModel):
+    """Consumo agregado das chamadas de IA por rota, provedor e modelo em um período"""
+    __tablename__ = "ai_usage_rollups"
+    
+    period_start = Column(DateTime(timezone=True), nullable=False)
+    period_end = Column(DateTime(timezone=True), nullable=False)
+    worker = Column(String(255), nullable=False)  # host:pid que gerou o registro
+    route = Column(String(255), nullable=False)
+    provider = Column(String(50), nullable=False)
+    operation = Column(String(50), nullable=False)  # chat, vision, transcription, tts
+    model = Column(String(100), nullable=False)
+    calls = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    audio_seconds = Column(Float, nullable=False, default=0)
+    characters = Column(Integer, nullable=False, default=0)
+    latency_ms_total = Column(Float, nullable=False, default=0)
+    latency_ms_max = Column(Float, nullable=False, default=0)
+    cost_usd = Column(Numeric(12, 6), nullable=False, default=0)
+    
+    __table_args__ = (
+        Index("ix_ai_usage_rollups_period_start", "period_start"),
+        Index("ix_ai_usage_rollups_route_period", "route", "period_start"),
+    )
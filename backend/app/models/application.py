@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Enum, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, String, Text, Enum, Integer, ForeignKey, DateTime, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -11,8 +11,27 @@ class ApplicationStatus(str, enum.Enum):
     ACCEPTED = "accepted"
     REJECTED = "rejected"
 
+class ApplicationCountersMixin:
+    """Contadores de aplicações (total e por status) mantidos incrementalmente"""
+    
+    application_count = Column(Integer, nullable=False, default=0, server_default="0")
+    pending_application_count = Column(Integer, nullable=False, default=0, server_default="0")
+    reviewed_application_count = Column(Integer, nullable=False, default=0, server_default="0")
+    interview_application_count = Column(Integer, nullable=False, default=0, server_default="0")
+    accepted_application_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rejected_application_count = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    @staticmethod
+    def status_counter(status) -> str:
+        """Nome da coluna de contador correspondente a um status"""
+        return f"{ApplicationStatus(status).value}_application_count"
+
 class Application(BaseModel):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Um candidato se aplica no máximo uma vez a cada vaga
+        UniqueConstraint("candidate_id", "job_id", name="uq_applications_candidate_job"),
+    )
     
     candidate_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
@@ -24,3 +43,6 @@ class Application(BaseModel):
     # Relacionamentos
     candidate = relationship("User", back_populates="applications")
     job = relationship("Job", back_populates="applications")
+
+# Índice da paginação por cursor das aplicações de uma vaga
+Index("ix_applications_job_created_at_id", Application.job_id, Application.created_at.desc(), Application.id.desc())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .base import BaseModel
@@ -29,6 +29,31 @@ class InterviewSimulation(BaseModel):
     feedback = Column(Text)   # Feedback gerado pela IA
     score = Column(Integer)   # Pontuação de 0 a 100
     completed_at = Column(DateTime(timezone=True))
+    # Sessão do chatbot de entrevista (ver utils/interview_sessions.py)
+    session_id = Column(String(64), unique=True, index=True)
+    config = Column(Text)                # JSON string com a SimulationConfig
+    conversation_history = Column(Text)  # JSON string com as mensagens da sessão
+    history_summary = Column(Text)       # Resumo incremental das mensagens mais antigas
+    summarized_messages = Column(Integer, default=0)  # Mensagens já incorporadas ao resumo
+    history_version = Column(Integer, nullable=False, default=0, server_default="0")  # Incrementada a cada gravação da sessão
+    feedback_status = Column(String(20))  # pending, running, completed, failed (geração em segundo plano)
     
     # Relacionamentos
     candidate = relationship("User")
+
+class InterviewQuestion(BaseModel):
+    """Banco de perguntas pré-geradas (generate_question_bank.py) por tipo, nível e área"""
+    __tablename__ = "interview_questions"
+    
+    interview_type = Column(String(50), nullable=False)    # technical, behavioral, mixed, case_study
+    difficulty_level = Column(String(50), nullable=False)  # beginner, intermediate, advanced, expert
+    focus_area = Column(String(100), nullable=False)       # frontend, backend, ... ou "geral"
+    kind = Column(String(20), nullable=False)              # opening (saudação + 1ª pergunta) ou question
+    question_type = Column(String(50))                     # technical, behavioral, case_study
+    question_text = Column(Text, nullable=False)
+    model = Column(String(100))                            # Modelo que gerou a pergunta
+    is_active = Column(Boolean, default=True, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_interview_questions_pool", "interview_type", "difficulty_level", "focus_area", "kind"),
+    )
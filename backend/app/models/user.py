@@ -1,7 +1,9 @@
-from sqlalchemy import Column, String, Boolean, Text, Enum, Integer, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, Text, Enum, Integer, ForeignKey, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import enum
 from .base import BaseModel
+from .application import ApplicationCountersMixin
 
 class UserType(str, enum.Enum):
     CANDIDATE = "candidate"
@@ -25,7 +27,7 @@ class User(BaseModel):
 class Profile(BaseModel):
     __tablename__ = "profiles"
     
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     first_name = Column(String(100), nullable=True)
     last_name = Column(String(100), nullable=True)
     phone = Column(String(20))
@@ -45,10 +47,10 @@ class Profile(BaseModel):
     # Relacionamentos
     user = relationship("User", back_populates="profile")
 
-class Company(BaseModel):
+class Company(ApplicationCountersMixin, BaseModel):
     __tablename__ = "companies"
     
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text)
     website = Column(String(500))
@@ -62,8 +64,21 @@ class Company(BaseModel):
     user = relationship("User", back_populates="company")
     jobs = relationship("Job", back_populates="company")
 
-class Job(BaseModel):
+# Configuração de busca textual do Postgres usada nas vagas
+JOB_SEARCH_CONFIG = "portuguese"
+
+# Documento de busca ponderado: título (A) > requisitos (B) > descrição (C)
+JOB_SEARCH_DOCUMENT = (
+    f"setweight(to_tsvector('{JOB_SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{JOB_SEARCH_CONFIG}'::regconfig, coalesce(requirements, '')), 'B') || "
+    f"setweight(to_tsvector('{JOB_SEARCH_CONFIG}'::regconfig, coalesce(description, '')), 'C')"
+)
+
+class Job(ApplicationCountersMixin, BaseModel):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
     title = Column(String(255), nullable=False)
@@ -77,6 +92,17 @@ class Job(BaseModel):
     employment_type = Column(String(50))  # Ex: "full-time", "part-time", "contract"
     is_active = Column(Boolean, default=True)
     
+    # Vetor de busca textual mantido pelo próprio Postgres (coluna gerada);
+    # adiado para não ser carregado junto com a vaga
+    search_vector = deferred(Column(TSVECTOR, Computed(JOB_SEARCH_DOCUMENT, persisted=True)))
+    
     # Relacionamentos
     company = relationship("Company", back_populates="jobs")
     applications = relationship("Application", back_populates="job")
+
+# Índices da paginação por cursor: listagem pública (apenas vagas ativas) e vagas da empresa
+Index("ix_jobs_active_created_at_id", Job.created_at.desc(), Job.id.desc(), postgresql_where=Job.is_active)
+Index("ix_jobs_company_created_at_id", Job.company_id, Job.created_at.desc(), Job.id.desc())
+
+# Vagas ativas de uma empresa (filtro company_id da listagem pública)
+Index("ix_jobs_company_active", Job.company_id, postgresql_where=Job.is_active)
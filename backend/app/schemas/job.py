@@ -68,6 +68,9 @@ class JobInDB(JobBase):
 class Job(JobInDB):
     company: Optional[dict] = None
     application_count: Optional[int] = 0
+    # Preenchidos apenas no modo busca (parâmetro q)
+    rank: Optional[float] = None
+    highlight: Optional[str] = None
 
 class JobWithApplications(Job):
     applications: Optional[List[dict]] = None
@@ -70,3 +70,7 @@ class SimulationHistory(BaseModel):
 class SimulationAnswer(BaseModel):
     answer_text: str
     current_question: int = 0
+    # Configuração da sessão, para servir perguntas do banco pré-gerado
+    interview_type: Optional[str] = None
+    difficulty_level: Optional[str] = None
+    focus_areas: Optional[List[str]] = None
@@ -0,0 +1,247 @@
+"""
+Contabilidade das chamadas de IA: tokens, segundos de áudio, caracteres de
+TTS, latência e custo estimado, agregados em memória por rota, provedor,
+operação e modelo. Os totais do período são gravados periodicamente em
+ai_usage_rollups para encontrar os caminhos mais caros.
+"""
+import asyncio
+import logging
+import os
+import socket
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from sqlalchemy import insert
+
+from ..core.config import settings
+from ..db.database import AsyncSessionLocal
+from ..models.ai_usage import AIUsageRollup
+
+logger = logging.getLogger(__name__)
+
+# Preços de tabela em USD: tokens por 1M, áudio por minuto, caracteres por 1M.
+# Atualizar quando os provedores mudarem os preços; modelos ausentes contam custo zero.
+MODEL_PRICES: Dict[str, Dict[str, float]] = {
+    "gpt-4o-mini": {"prompt": 0.15, "completion": 0.60},
+    "gpt-3.5-turbo": {"prompt": 0.50, "completion": 1.50},
+    "whisper-1": {"audio_minute": 0.006},
+    "tts-1": {"characters": 15.0},
+    "sonar-pro": {"prompt": 3.0, "completion": 15.0},
+    "llama-3.1-sonar-small-128k-online": {"prompt": 0.20, "completion": 0.20},
+}
+
+# Escopo ASGI da requisição atual; o roteador grava nele a rota encontrada (scope["route"])
+_request_scope: ContextVar[Optional[dict]] = ContextVar("ai_usage_request_scope", default=None)
+
+class AIUsageRouteMiddleware:
+    """Middleware ASGI que associa as chamadas de IA à rota que as originou"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+def current_route() -> str:
+    """Template da rota da requisição atual (/jobs/{job_id}), como declarado no roteador"""
+    scope = _request_scope.get()
+    route = scope.get("route") if scope is not None else None
+    if route is None:
+        return "background"
+    return f"{scope.get('method', 'WS')} {route.path}"
+
+def extract_usage(result: Any) -> Dict[str, float]:
+    """Tokens e duração informados na resposta do provedor (OpenAI SDK ou httpx)"""
+    usage = getattr(result, "usage", None)
+    if usage is None and hasattr(result, "json") and hasattr(result, "status_code"):
+        # Resposta httpx da Perplexity
+        try:
+            usage = result.json().get("usage")
+        except (ValueError, httpx.ResponseNotRead):
+            # Respostas em streaming informam o uso no último trecho (ver record_tokens)
+            usage = None
+    measures: Dict[str, float] = {}
+    if usage is not None:
+        get = usage.get if isinstance(usage, dict) else lambda key: getattr(usage, key, None)
+        measures["prompt_tokens"] = get("prompt_tokens") or 0
+        measures["completion_tokens"] = get("completion_tokens") or 0
+    duration = getattr(result, "duration", None)
+    if duration:
+        measures["audio_seconds"] = float(duration)
+    return measures
+
+@dataclass
+class UsageTotals:
+    calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    audio_seconds: float = 0.0
+    characters: int = 0
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+    cost_usd: float = 0.0
+    
+    def merge(self, other: "UsageTotals"):
+        for f in fields(self):
+            if f.name == "latency_ms_max":
+                self.latency_ms_max = max(self.latency_ms_max, other.latency_ms_max)
+            else:
+                setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+UsageKey = Tuple[str, str, str, str]  # (route, provider, operation, model)
+
+def estimate_cost(model: str, prompt_tokens: int = 0, completion_tokens: int = 0,
+                  audio_seconds: float = 0.0, characters: int = 0) -> float:
+    prices = MODEL_PRICES.get(model, {})
+    return (
+        prompt_tokens * prices.get("prompt", 0) / 1_000_000
+        + completion_tokens * prices.get("completion", 0) / 1_000_000
+        + audio_seconds / 60 * prices.get("audio_minute", 0)
+        + characters * prices.get("characters", 0) / 1_000_000
+    )
+
+class AIUsageTracker:
+    """Agregados do worker: totais desde o início e o período ainda não gravado"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[UsageKey, UsageTotals] = {}
+        self._pending: Dict[UsageKey, UsageTotals] = {}
+        self.started_at = datetime.now(timezone.utc)
+        self._period_start = self.started_at
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+    
+    def record(
+        self,
+        provider: str,
+        operation: str,
+        model: str,
+        latency: float,
+        error: bool = False,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        audio_seconds: float = 0.0,
+        characters: int = 0
+    ):
+        """Registra uma tentativa de chamada ao provedor (latência em segundos)"""
+        latency_ms = latency * 1000
+        entry = UsageTotals(
+            calls=1,
+            errors=int(error),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            audio_seconds=audio_seconds,
+            characters=characters,
+            latency_ms_total=latency_ms,
+            latency_ms_max=latency_ms,
+            cost_usd=0.0 if error else estimate_cost(
+                model, prompt_tokens, completion_tokens, audio_seconds, characters
+            )
+        )
+        key = (current_route(), provider, operation, model)
+        with self._lock:
+            for bucket in (self._totals, self._pending):
+                bucket.setdefault(key, UsageTotals()).merge(entry)
+    
+    def record_tokens(self, provider: str, operation: str, model: str,
+                      prompt_tokens: int = 0, completion_tokens: int = 0):
+        """Soma tokens conhecidos só ao fim de um stream, sem contar uma nova chamada"""
+        entry = UsageTotals(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=estimate_cost(model, prompt_tokens, completion_tokens)
+        )
+        key = (current_route(), provider, operation, model)
+        with self._lock:
+            for bucket in (self._totals, self._pending):
+                bucket.setdefault(key, UsageTotals()).merge(entry)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Totais desde o início do worker, dos caminhos mais caros para os mais baratos"""
+        with self._lock:
+            rows = [
+                {
+                    "route": route,
+                    "provider": provider,
+                    "operation": operation,
+                    "model": model,
+                    **vars(totals),
+                    "latency_ms_avg": round(totals.latency_ms_total / totals.calls, 2) if totals.calls else 0.0,
+                }
+                for (route, provider, operation, model), totals in self._totals.items()
+            ]
+        rows.sort(key=lambda row: (row["cost_usd"], row["latency_ms_total"]), reverse=True)
+        return {
+            "worker": self.worker,
+            "since": self.started_at.isoformat(),
+            "total_cost_usd": round(sum(row["cost_usd"] for row in rows), 6),
+            "routes": rows,
+        }
+    
+    async def flush(self):
+        """Grava o período pendente em ai_usage_rollups; em caso de erro devolve ao pendente"""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            period_start, self._period_start = self._period_start, now
+        if not pending:
+            return
+        
+        rows = [
+            {
+                "period_start": period_start,
+                "period_end": now,
+                "worker": self.worker,
+                "route": route[:255],
+                "provider": provider,
+                "operation": operation,
+                "model": model,
+                **vars(totals),
+            }
+            for (route, provider, operation, model), totals in pending.items()
+        ]
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(AIUsageRollup), rows)
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Falha ao gravar consumo de IA, tentando no próximo ciclo: {e}")
+            with self._lock:
+                self._period_start = period_start
+                for key, totals in pending.items():
+                    self._pending.setdefault(key, UsageTotals()).merge(totals)
+    
+    def start(self):
+        """Inicia a gravação periódica (chamado no startup da aplicação)"""
+        interval = settings.ai_usage_rollup_interval_seconds
+        if interval <= 0 or self._task is not None:
+            return
+        
+        async def rollup_loop():
+            while True:
+                await asyncio.sleep(interval)
+                await self.flush()
+        
+        self._task = asyncio.create_task(rollup_loop())
+    
+    async def stop(self):
+        """Interrompe o ciclo e grava o que restou (chamado no shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            await self.flush()
+
+ai_usage = AIUsageTracker()
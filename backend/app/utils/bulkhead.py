@@ -0,0 +1,122 @@
+"""
+Bulkheads por serviço externo (OpenAI, Perplexity, Chromium): limitam as
+chamadas simultâneas de cada upstream e mantêm uma fila limitada. Quando a
+fila enche, a requisição falha rápido com Retry-After em vez de se acumular
+e tirar recursos das demais funcionalidades.
+"""
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from ..core.config import settings
+
+class BulkheadFullError(Exception):
+    """Upstream saturado: fila cheia (429) ou espera na fila esgotada (503)"""
+    
+    def __init__(self, name: str, status_code: int, retry_after: int):
+        self.name = name
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(f"Serviço '{name}' sobrecarregado, tente novamente em {retry_after}s")
+
+class Bulkhead:
+    """Semáforo com fila limitada e métricas de profundidade e espera"""
+    
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        # Média móvel do tempo de uso de uma vaga, usada para estimar o Retry-After
+        self._hold_time_avg = 1.0
+    
+    def retry_after(self) -> int:
+        estimate = self._hold_time_avg * (self.waiting + 1) / self.max_concurrent
+        return max(1, min(settings.bulkhead_max_retry_after_seconds, math.ceil(estimate)))
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Ocupa uma vaga do upstream, aguardando na fila se necessário"""
+        # Contagem síncrona: vale mesmo quando várias requisições chegam no mesmo tick
+        if self.active + self.waiting >= self.max_concurrent + self.max_queue:
+            self.rejected += 1
+            raise BulkheadFullError(self.name, 429, self.retry_after())
+        
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            if self._semaphore.locked():
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise BulkheadFullError(self.name, 503, self.retry_after())
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        
+        waited = time.perf_counter() - started
+        self.accepted += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+        
+        held_since = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            held = time.perf_counter() - held_since
+            self._hold_time_avg = 0.8 * self._hold_time_avg + 0.2 * held
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "queue_timeouts": self.timeouts,
+            "wait_time_avg_ms": round(1000 * self.wait_time_total / self.accepted, 2) if self.accepted else 0.0,
+            "wait_time_max_ms": round(1000 * self.wait_time_max, 2),
+            "hold_time_avg_ms": round(1000 * self._hold_time_avg, 2),
+        }
+
+def _bulkhead(name: str) -> Bulkhead:
+    return Bulkhead(
+        name,
+        max_concurrent=getattr(settings, f"bulkhead_{name}_concurrency"),
+        max_queue=getattr(settings, f"bulkhead_{name}_queue"),
+        queue_timeout=settings.bulkhead_queue_timeout_seconds
+    )
+
+bulkheads: Dict[str, Bulkhead] = {
+    name: _bulkhead(name)
+    for name in (
+        "openai_chat",
+        "openai_vision",
+        "openai_transcription",
+        "openai_tts",
+        "perplexity",
+        "chromium",
+    )
+}
+
+def bulkhead(name: str):
+    """Context manager assíncrono que ocupa uma vaga do upstream informado"""
+    return bulkheads[name].acquire()
+
+def bulkhead_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: b.stats() for name, b in bulkheads.items()}
@@ -0,0 +1,258 @@
+"""
+Geração do feedback das entrevistas em segundo plano
+
+/end-interview só registra o job e responde na hora; o feedback é gerado
+em uma tarefa do worker e o cliente consulta o estado pelo job_id. O
+resultado (texto e pontuação) é gravado em interview_simulations, então a
+consulta funciona em qualquer worker e depois de reinícios.
+
+A tarefa morre com o worker: ao encerrar, os jobs em andamento são gravados
+como failed, e um job pending/running sem atualização há mais de
+interview_feedback_job_timeout_seconds (worker que caiu sem encerrar) também
+é tratado como failed, para que /end-interview possa refazê-lo.
+"""
+import asyncio
+import json
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import select, update
+
+from ..core.config import settings
+from ..db.database import AsyncSessionLocal
+from ..models.learning import InterviewSimulation
+
+logger = logging.getLogger(__name__)
+
+JOB_PREFIX = "fb_"
+UNFINISHED_STATUSES = ("pending", "running")
+INTERRUPTED_ERROR = "Geração do feedback interrompida; finalize a entrevista novamente"
+
+# Linha com a nota pedida no prompt de feedback (ex.: "PONTUAÇÃO: 78")
+_SCORE_PATTERN = re.compile(r"^\W*PONTUA[ÇC][ÃA]O[^:\d]*:\s*(\d{1,3})\b.*$", re.IGNORECASE | re.MULTILINE)
+
+def parse_score(text: str) -> Tuple[str, Optional[int]]:
+    """Separa a pontuação (0-100) do texto do feedback; None se o modelo não a informou"""
+    match = _SCORE_PATTERN.search(text)
+    if match is None:
+        return text.strip(), None
+    score = max(0, min(100, int(match.group(1))))
+    return (text[:match.start()] + text[match.end():]).strip(), score
+
+@dataclass
+class FeedbackJob:
+    job_id: str
+    session_id: str
+    user_id: int
+    status: str = "pending"  # pending, running, completed, failed
+    feedback: Optional[str] = None
+    score: Optional[int] = None
+    error: Optional[str] = None
+    total_messages: int = 0
+    interview_type: Optional[str] = None
+    difficulty_level: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "feedback": self.feedback,
+            "score": self.score,
+            "error": self.error,
+            "total_messages": self.total_messages,
+            "interview_type": self.interview_type,
+            "difficulty_level": self.difficulty_level,
+            "completed_at": self.completed_at,
+        }
+
+class FeedbackJobRegistry:
+    """Jobs de feedback deste worker; os encerrados mais antigos saem da memória primeiro
+    
+    Um job em andamento só sai da memória se não houver nenhum encerrado; a
+    tarefa dele continua registrada e é interrompida no shutdown.
+    """
+    
+    def __init__(self, max_entries: int = 1000, persist: bool = True, stale_after_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.persist = persist
+        self.stale_after_seconds = stale_after_seconds
+        self._jobs: "OrderedDict[str, FeedbackJob]" = OrderedDict()
+        self._tasks: Dict[asyncio.Task, FeedbackJob] = {}
+    
+    @staticmethod
+    def job_id_for(session_id: str) -> str:
+        return f"{JOB_PREFIX}{session_id}"
+    
+    async def _save(self, job: FeedbackJob):
+        if not self.persist:
+            return
+        values = {"feedback_status": job.status}
+        if job.status == "completed":
+            values.update(feedback=job.feedback, score=job.score)
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(InterviewSimulation)
+                    .where(InterviewSimulation.session_id == job.session_id)
+                    .values(**values)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Falha ao gravar feedback da sessão {job.session_id}: {e}")
+    
+    async def _run(self, job: FeedbackJob, generate: Callable[[], Awaitable[str]]):
+        job.status = "running"
+        await self._save(job)
+        try:
+            job.feedback, job.score = parse_score(await generate())
+            job.status = "completed"
+        except Exception as e:
+            logger.warning(f"Falha ao gerar feedback da sessão {job.session_id}: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        job.completed_at = datetime.now()
+        await self._save(job)
+    
+    async def submit(
+        self,
+        session_id: str,
+        user_id: int,
+        generate: Callable[[], Awaitable[str]],
+        total_messages: int = 0,
+        interview_type: Optional[str] = None,
+        difficulty_level: Optional[str] = None
+    ) -> FeedbackJob:
+        """Registra o job e agenda a geração; não espera o LLM"""
+        job = FeedbackJob(
+            job_id=self.job_id_for(session_id),
+            session_id=session_id,
+            user_id=user_id,
+            total_messages=total_messages,
+            interview_type=interview_type,
+            difficulty_level=difficulty_level
+        )
+        self._jobs[job.job_id] = job
+        self._jobs.move_to_end(job.job_id)
+        self._evict()
+        
+        await self._save(job)
+        task = asyncio.create_task(self._run(job, generate))
+        self._tasks[task] = job
+        task.add_done_callback(lambda done: self._tasks.pop(done, None))
+        return job
+    
+    def _evict(self):
+        while len(self._jobs) > self.max_entries:
+            finished = next(
+                (job_id for job_id, job in self._jobs.items() if job.status not in UNFINISHED_STATUSES),
+                None
+            )
+            if finished is None:
+                self._jobs.popitem(last=False)
+            else:
+                del self._jobs[finished]
+    
+    async def get(self, job_id: str, user_id: int) -> Optional[FeedbackJob]:
+        """Job do usuário, da memória ou do banco (gerado por outro worker)"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job if job.user_id == user_id else None
+        if not self.persist or not job_id.startswith(JOB_PREFIX):
+            return None
+        
+        session_id = job_id[len(JOB_PREFIX):]
+        try:
+            async with AsyncSessionLocal() as db:
+                row = (await db.execute(
+                    select(
+                        InterviewSimulation.feedback_status,
+                        InterviewSimulation.feedback,
+                        InterviewSimulation.score,
+                        InterviewSimulation.config,
+                        InterviewSimulation.conversation_history,
+                        InterviewSimulation.created_at,
+                        InterviewSimulation.updated_at
+                    ).where(
+                        InterviewSimulation.session_id == session_id,
+                        InterviewSimulation.candidate_id == user_id,
+                        InterviewSimulation.feedback_status.isnot(None)
+                    )
+                )).first()
+        except Exception as e:
+            logger.warning(f"Falha ao consultar feedback da sessão {session_id}: {e}")
+            return None
+        if row is None:
+            return None
+        
+        status, error, completed_at = row.feedback_status, None, None
+        if status in UNFINISHED_STATUSES:
+            # Sem tarefa neste worker; parado há muito tempo, o worker que o rodava caiu
+            last_update = row.updated_at or row.created_at
+            if datetime.now(timezone.utc) - last_update > timedelta(seconds=self.stale_after_seconds):
+                await self._fail_stale(session_id)
+                status, error, completed_at = "failed", INTERRUPTED_ERROR, datetime.now()
+        else:
+            completed_at = row.updated_at
+        
+        config = json.loads(row.config or "{}")
+        return FeedbackJob(
+            job_id=job_id,
+            session_id=session_id,
+            user_id=user_id,
+            status=status,
+            feedback=row.feedback,
+            score=row.score,
+            error=error,
+            total_messages=len(json.loads(row.conversation_history or "[]")),
+            interview_type=config.get("interview_type"),
+            difficulty_level=config.get("difficulty_level"),
+            completed_at=completed_at
+        )
+    
+    async def _fail_stale(self, session_id: str):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(InterviewSimulation)
+                    .where(
+                        InterviewSimulation.session_id == session_id,
+                        InterviewSimulation.feedback_status.in_(UNFINISHED_STATUSES)
+                    )
+                    .values(feedback_status="failed")
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Falha ao marcar feedback parado da sessão {session_id}: {e}")
+    
+    async def shutdown(self):
+        """Grava como failed os jobs em andamento, cuja tarefa não sobrevive ao worker"""
+        # Pelas tarefas também: um job em andamento pode ter saído da memória
+        jobs = {job.job_id: job for job in [*self._jobs.values(), *self._tasks.values()]}
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in jobs.values():
+            if job.status in UNFINISHED_STATUSES:
+                job.status = "failed"
+                job.error = INTERRUPTED_ERROR
+                job.completed_at = datetime.now()
+                await self._save(job)
+    
+    def stats(self) -> Dict[str, Any]:
+        by_status: Dict[str, int] = {}
+        for job in self._jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {"jobs": len(self._jobs), "running_tasks": len(self._tasks), "by_status": by_status}
+
+feedback_jobs = FeedbackJobRegistry(
+    persist=settings.interview_session_persist,
+    stale_after_seconds=settings.interview_feedback_job_timeout_seconds
+)
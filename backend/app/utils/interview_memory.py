@@ -0,0 +1,108 @@
+"""
+Memória das entrevistas: os turnos mais antigos viram um resumo incremental
+
+O prompt de cada turno leva o resumo da sessão e apenas as mensagens recentes
+que cabem em interview_history_token_budget, então o tamanho do prompt fica
+constante sem descartar o que foi dito no início. Quando o histórico ainda não
+resumido passa do orçamento, as mensagens mais antigas são incorporadas ao
+resumo em segundo plano, sem atrasar a resposta ao candidato. Cada dobra deixa
+só metade do orçamento em mensagens literais, para não resumir a cada turno.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Set, Tuple
+
+from ..core.config import settings
+from .interview_sessions import InterviewSession, interview_sessions
+from .openai_client import get_async_openai_client
+from .resilience import call_upstream
+
+logger = logging.getLogger(__name__)
+
+# Tarefas de resumo em andamento (referência para não serem coletadas)
+_summary_tasks: Set[asyncio.Task] = set()
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa barata: ~4 caracteres por token em português"""
+    return len(text) // 4 + 1
+
+def recent_window_start(history: List[Dict], start: int, budget: int) -> int:
+    """Menor índice i >= start tal que history[i:] cabe no orçamento (sempre inclui a última mensagem)"""
+    used = 0
+    i = len(history)
+    while i > start:
+        cost = estimate_tokens(str(history[i - 1].get("content", "")))
+        if used + cost > budget and i < len(history):
+            break
+        used += cost
+        i -= 1
+    return i
+
+def prompt_context(session: InterviewSession) -> Tuple[str, List[Dict]]:
+    """Resumo e mensagens ainda não resumidas da sessão, para montar o prompt do turno"""
+    return session.summary, session.history[session.summarized_count:]
+
+def format_transcript(messages: List[Dict]) -> str:
+    return "\n".join(
+        f"{'Candidato' if msg.get('role') == 'candidate' else 'Entrevistador'}: {msg.get('content', '')}"
+        for msg in messages
+    )
+
+async def summarize_history(previous_summary: str, messages: List[Dict]) -> str:
+    """Incorpora as mensagens ao resumo anterior com uma chamada curta ao modelo de resumo"""
+    system_prompt = (
+        "Você mantém o resumo de uma entrevista de emprego simulada. Preserve fatos concretos "
+        "ditos pelo candidato (experiências, empresas, ferramentas, resultados, formação), as "
+        "perguntas e tópicos já abordados pelo entrevistador e os pontos que ainda merecem "
+        "aprofundamento. Escreva em português, em tópicos curtos, sem inventar informações."
+    )
+    user_prompt = (
+        f"RESUMO ATUAL:\n{previous_summary or '(vazio)'}\n\n"
+        f"NOVOS TRECHOS DA CONVERSA:\n{format_transcript(messages)}\n\n"
+        "Devolva apenas o resumo atualizado."
+    )
+    client = get_async_openai_client()
+    response = await call_upstream(
+        "openai",
+        lambda: client.chat.completions.create(
+            model=settings.interview_summary_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.2,
+            max_tokens=settings.interview_summary_max_tokens,
+            timeout=settings.openai_chat_timeout
+        ),
+        bulkhead="openai_chat",
+        operation="summary",
+        model=settings.interview_summary_model
+    )
+    return response.choices[0].message.content.strip()
+
+async def _fold_into_summary(session: InterviewSession):
+    try:
+        start = session.summarized_count
+        cut = recent_window_start(session.history, start, settings.interview_history_token_budget // 2)
+        if cut <= start:
+            return
+        summary = await summarize_history(session.summary, session.history[start:cut])
+        await interview_sessions.update_summary(session, summary, cut)
+        logger.info(f"Sessão {session.session_id}: {cut} mensagens resumidas")
+    except Exception as e:
+        # Sem resumo novo, o próximo turno só usa as mensagens que cabem no orçamento
+        logger.warning(f"Falha ao resumir sessão {session.session_id}: {e}")
+    finally:
+        session.summarizing = False
+
+def schedule_summary(session: InterviewSession):
+    """Agenda a dobra das mensagens antigas se o histórico não resumido passou do orçamento"""
+    if session.summarizing:
+        return
+    start = session.summarized_count
+    if recent_window_start(session.history, start, settings.interview_history_token_budget) <= start:
+        return
+    session.summarizing = True
+    task = asyncio.create_task(_fold_into_summary(session))
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
@@ -0,0 +1,314 @@
+"""
+Sessões do chatbot de entrevista guardadas no servidor
+
+Configuração e histórico ficam em memória (LRU com TTL desde o último turno),
+então cada turno do /chat envia apenas a nova mensagem. Uma cópia é gravada
+em interview_simulations, de onde a sessão é recarregada depois de expirar
+localmente, de um reinício ou quando o turno cai em outro worker.
+
+Cada gravação incrementa history_version. A cada turno a cópia em memória é
+comparada com a versão do banco (uma consulta pelo índice de session_id) e
+recarregada se outro worker gravou depois; as gravações são condicionais à
+versão lida, e em conflito o turno é reaplicado sobre o histórico atual.
+"""
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, insert, select, update
+
+from ..core.config import settings
+from ..db.database import AsyncSessionLocal
+from ..models.learning import InterviewSimulation
+
+logger = logging.getLogger(__name__)
+
+# Tentativas de gravar um turno quando outro worker grava a mesma sessão ao mesmo tempo
+MAX_WRITE_ATTEMPTS = 3
+
+@dataclass
+class InterviewSession:
+    session_id: str
+    user_id: int
+    config: Dict[str, Any]
+    history: List[Dict[str, Any]] = field(default_factory=list)
+    started_at: datetime = field(default_factory=datetime.now)
+    last_access: float = field(default_factory=time.monotonic)
+    # Resumo das primeiras summarized_count mensagens (ver utils/interview_memory.py)
+    summary: str = ""
+    summarized_count: int = 0
+    summarizing: bool = False
+    # history_version do banco refletida por esta cópia
+    version: int = 0
+
+class InterviewSessionStore:
+    """Sessões ativas deste worker, com gravação opcional no Postgres"""
+    
+    def __init__(self, max_entries: int, ttl_seconds: float, persist: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self._sessions: "OrderedDict[str, InterviewSession]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._stale_reloads = 0
+        self._write_conflicts = 0
+        self._evictions = 0
+    
+    def _expired(self, session: InterviewSession) -> bool:
+        return time.monotonic() - session.last_access > self.ttl_seconds
+    
+    def _put(self, session: InterviewSession):
+        self._sessions[session.session_id] = session
+        self._sessions.move_to_end(session.session_id)
+        # Remove expiradas a partir das menos usadas e depois o excesso do LRU
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if not self._expired(oldest) and len(self._sessions) <= self.max_entries:
+                break
+            self._sessions.popitem(last=False)
+            self._evictions += 1
+    
+    async def create(
+        self,
+        user_id: int,
+        config: Dict[str, Any],
+        job_title: str,
+        session_id: Optional[str] = None,
+        history: Optional[List[Dict[str, Any]]] = None
+    ) -> InterviewSession:
+        """Abre uma sessão; session_id e history permitem adotar a de um cliente antigo"""
+        started_at = datetime.now()
+        if session_id is None:
+            session_id = f"chat_{user_id}_{int(started_at.timestamp())}_{secrets.token_hex(3)}"
+        session = InterviewSession(session_id, user_id, config, list(history or []), started_at)
+        self._put(session)
+        
+        if self.persist:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(insert(InterviewSimulation).values(
+                        candidate_id=user_id,
+                        job_title=job_title[:255],
+                        session_id=session_id,
+                        config=json.dumps(config, ensure_ascii=False),
+                        conversation_history=json.dumps(session.history, ensure_ascii=False, default=str)
+                    ))
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Falha ao gravar sessão de entrevista {session_id}: {e}")
+        return session
+    
+    async def _load(self, session_id: str) -> Optional[InterviewSession]:
+        if not self.persist:
+            return None
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        try:
+            async with AsyncSessionLocal() as db:
+                row = (await db.execute(
+                    select(
+                        InterviewSimulation.candidate_id,
+                        InterviewSimulation.config,
+                        InterviewSimulation.conversation_history,
+                        InterviewSimulation.history_summary,
+                        InterviewSimulation.summarized_messages,
+                        InterviewSimulation.history_version,
+                        InterviewSimulation.created_at
+                    ).where(
+                        InterviewSimulation.session_id == session_id,
+                        InterviewSimulation.completed_at.is_(None),
+                        func.coalesce(InterviewSimulation.updated_at, InterviewSimulation.created_at) >= cutoff
+                    )
+                )).first()
+        except Exception as e:
+            logger.warning(f"Falha ao carregar sessão de entrevista {session_id}: {e}")
+            return None
+        if row is None or not row.config:
+            return None
+        self._loads += 1
+        return InterviewSession(
+            session_id=session_id,
+            user_id=row.candidate_id,
+            config=json.loads(row.config),
+            history=json.loads(row.conversation_history or "[]"),
+            started_at=row.created_at,
+            summary=row.history_summary or "",
+            summarized_count=row.summarized_messages or 0,
+            version=row.history_version or 0
+        )
+    
+    async def _refresh(self, session: InterviewSession) -> bool:
+        """Atualiza a cópia em memória com o estado do banco; False se a sessão não está mais lá"""
+        fresh = await self._load(session.session_id)
+        if fresh is None:
+            return False
+        session.history = fresh.history
+        session.summary = fresh.summary
+        session.summarized_count = fresh.summarized_count
+        session.version = fresh.version
+        return True
+    
+    async def _sync(self, session: InterviewSession):
+        """Recarrega a sessão se outro worker gravou um turno ou resumo depois desta cópia"""
+        if not self.persist:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                version = await db.scalar(
+                    select(InterviewSimulation.history_version)
+                    .where(InterviewSimulation.session_id == session.session_id)
+                )
+        except Exception as e:
+            logger.warning(f"Falha ao verificar versão da sessão {session.session_id}: {e}")
+            return
+        if version is not None and version != session.version and await self._refresh(session):
+            self._stale_reloads += 1
+    
+    async def get(self, session_id: str, user_id: int) -> Optional[InterviewSession]:
+        """Sessão ativa do usuário, da memória ou do banco; None se não existe ou expirou"""
+        session = self._sessions.get(session_id)
+        if session is not None and self._expired(session):
+            del self._sessions[session_id]
+            self._evictions += 1
+            session = None
+        
+        if session is None:
+            self._misses += 1
+            session = await self._load(session_id)
+            if session is None:
+                return None
+            self._put(session)
+        else:
+            self._hits += 1
+            self._sessions.move_to_end(session_id)
+            if session.user_id == user_id:
+                await self._sync(session)
+        
+        if session.user_id != user_id:
+            return None
+        session.last_access = time.monotonic()
+        return session
+    
+    async def append(self, session: InterviewSession, *messages: Dict[str, Any]):
+        """Acrescenta as mensagens do turno ao histórico e atualiza a cópia no banco"""
+        session.last_access = time.monotonic()
+        if not self.persist:
+            session.history.extend(messages)
+            return
+        
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            history = session.history + list(messages)
+            try:
+                async with AsyncSessionLocal() as db:
+                    version = (await db.execute(
+                        update(InterviewSimulation)
+                        .where(
+                            InterviewSimulation.session_id == session.session_id,
+                            InterviewSimulation.history_version == session.version
+                        )
+                        .values(
+                            conversation_history=json.dumps(history, ensure_ascii=False, default=str),
+                            history_version=InterviewSimulation.history_version + 1
+                        )
+                        .returning(InterviewSimulation.history_version)
+                    )).scalar()
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Falha ao gravar turno da sessão {session.session_id}: {e}")
+                break
+            if version is not None:
+                session.history = history
+                session.version = version
+                return
+            # Outro worker gravou antes: o turno é reaplicado sobre o histórico atual
+            self._write_conflicts += 1
+            if not await self._refresh(session):
+                break
+        else:
+            logger.warning(f"Conflitos seguidos ao gravar turno da sessão {session.session_id}")
+        session.history.extend(messages)
+    
+    async def update_summary(self, session: InterviewSession, summary: str, summarized_count: int):
+        """
+        Troca o resumo da sessão, que passa a cobrir as primeiras summarized_count
+        mensagens. O histórico só cresce no fim, então o resumo de qualquer cópia
+        vale para o banco; ele só é gravado se cobre mais mensagens que o atual.
+        """
+        if not self.persist:
+            session.summary = summary
+            session.summarized_count = summarized_count
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                version = (await db.execute(
+                    update(InterviewSimulation)
+                    .where(
+                        InterviewSimulation.session_id == session.session_id,
+                        func.coalesce(InterviewSimulation.summarized_messages, 0) < summarized_count
+                    )
+                    .values(
+                        history_summary=summary,
+                        summarized_messages=summarized_count,
+                        history_version=InterviewSimulation.history_version + 1
+                    )
+                    .returning(InterviewSimulation.history_version)
+                )).scalar()
+                await db.commit()
+        except Exception as e:
+            # Sem o banco, o resumo ainda vale para a cópia deste worker
+            logger.warning(f"Falha ao gravar resumo da sessão {session.session_id}: {e}")
+            session.summary = summary
+            session.summarized_count = summarized_count
+            return
+        if version is None:
+            # Outro worker já gravou um resumo mais completo; o próximo turno o recarrega
+            return
+        session.summary = summary
+        session.summarized_count = summarized_count
+        # Só avança a versão local se nenhuma outra gravação entrou no meio
+        if version == session.version + 1:
+            session.version = version
+    
+    async def complete(self, session: InterviewSession):
+        """Encerra a sessão: sai da memória e fica marcada como concluída no banco"""
+        self._sessions.pop(session.session_id, None)
+        if not self.persist:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(InterviewSimulation)
+                    .where(InterviewSimulation.session_id == session.session_id)
+                    .values(completed_at=func.now())
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Falha ao concluir sessão {session.session_id}: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "sessions": len(self._sessions),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persist": self.persist,
+            "hits": self._hits,
+            "misses": self._misses,
+            "loaded_from_db": self._loads,
+            "stale_reloads": self._stale_reloads,
+            "write_conflicts": self._write_conflicts,
+            "evictions": self._evictions,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+interview_sessions = InterviewSessionStore(
+    max_entries=settings.interview_session_max_entries,
+    ttl_seconds=settings.interview_session_ttl_seconds,
+    persist=settings.interview_session_persist
+)
@@ -0,0 +1,254 @@
+"""
+Cache de respostas de LLM em dois níveis: memória (LRU) e disco (JSON por
+chave, compartilhado entre os workers do mesmo host e preservado entre
+reinícios). A chave combina modelo, prompt normalizado, hash do conteúdo
+(texto ou bytes) e parâmetros da chamada.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from ..core.config import settings
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+def normalize_prompt(text: str) -> str:
+    """Colapsa espaços e quebras de linha (indentação de prompts em docstrings)"""
+    return " ".join(text.split())
+
+def content_hash(content: Union[str, bytes]) -> str:
+    """SHA-256 do conteúdo; textos são normalizados antes"""
+    if isinstance(content, str):
+        content = normalize_prompt(content).encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+def make_cache_key(model: str, prompt: str, *contents: Union[str, bytes], **params) -> str:
+    """Chave estável para uma chamada ao LLM"""
+    parts = {
+        "model": model,
+        "prompt": normalize_prompt(prompt),
+        "contents": [content_hash(c) for c in contents],
+        "params": params,
+    }
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """Cache LRU em memória com TTL e camada em disco limitada por tamanho"""
+    
+    def __init__(self, memory_entries: int, ttl_seconds: float, cache_dir: Optional[str], max_disk_bytes: int):
+        self.memory_entries = memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        )
+        self._evictions = {"memory": 0, "disk": 0}
+        # Falhas concorrentes da mesma chave geram uma única chamada ao LLM
+        self._flight = SingleFlight("llm_cache")
+    
+    @property
+    def enabled(self) -> bool:
+        return settings.llm_cache_enabled and self.ttl_seconds > 0
+    
+    async def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        producer: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Retorna o valor em cache ou executa producer() e guarda o resultado
+        (precisa ser serializável em JSON). Exceções não são cacheadas e
+        chamadas concorrentes para a mesma chave compartilham uma execução.
+        """
+        key = f"{namespace}:{key}"
+        if not self.enabled:
+            # Sem cache, chamadas idênticas simultâneas ainda compartilham a execução
+            return await self._flight.do(key, producer)
+        
+        found, value = self._memory_get(key)
+        if found:
+            self._count(namespace, "memory_hits")
+            return value
+        
+        found, value = await asyncio.to_thread(self._disk_get, key)
+        if found:
+            self._count(namespace, "disk_hits")
+            # Promove para a memória com o TTL restante do disco
+            self._memory_set(key, value[0], value[1])
+            return value[0]
+        
+        self._count(namespace, "misses")
+        
+        async def produce_and_store():
+            result = await producer()
+            expires_at = time.time() + (ttl or self.ttl_seconds)
+            self._memory_set(key, result, expires_at)
+            await asyncio.to_thread(self._disk_set, key, namespace, result, expires_at)
+            self._count(namespace, "writes")
+            return result
+        
+        return await self._flight.do(key, produce_and_store)
+    
+    def _count(self, namespace: str, field: str):
+        with self._lock:
+            self._stats[namespace][field] += 1
+    
+    # Memória
+    
+    def _memory_get(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._memory[key]
+                return False, None
+            self._memory.move_to_end(key)
+            return True, value
+    
+    def _memory_set(self, key: str, value: Any, expires_at: float):
+        if self.memory_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = (value, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+                self._evictions["memory"] += 1
+    
+    # Disco
+    
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+    
+    def _disk_get(self, key: str):
+        if self.cache_dir is None:
+            return False, None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return False, None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrada de cache LLM ilegível ({path}): {e}")
+            return False, None
+        if entry.get("key") != key or entry["expires_at"] <= time.time():
+            self._disk_remove(path)
+            return False, None
+        # mtime marca o último acesso para a remoção das entradas menos usadas
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True, (entry["value"], entry["expires_at"])
+    
+    def _disk_set(self, key: str, namespace: str, value: Any, expires_at: float):
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps(
+                {"key": key, "namespace": namespace, "expires_at": expires_at, "value": value},
+                ensure_ascii=False
+            ).encode("utf-8")
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Falha ao gravar cache LLM em disco: {e}")
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(data)
+        self._enforce_disk_limit()
+    
+    def _disk_remove(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes -= size
+    
+    def _enforce_disk_limit(self):
+        """Remove entradas expiradas e, se preciso, as acessadas há mais tempo"""
+        with self._lock:
+            if self._disk_bytes is not None and self._disk_bytes <= self.max_disk_bytes:
+                return
+        
+        files = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        
+        # Reduz até 90% do limite para não repetir a varredura a cada gravação
+        target = int(self.max_disk_bytes * 0.9)
+        evicted = 0
+        if total > self.max_disk_bytes:
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+        
+        with self._lock:
+            self._disk_bytes = total
+            self._evictions["disk"] += evicted
+    
+    def stats(self) -> Dict[str, Any]:
+        """Acertos, falhas e ocupação do cache"""
+        with self._lock:
+            namespaces = {}
+            for namespace, counts in self._stats.items():
+                lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+                hits = counts["memory_hits"] + counts["disk_hits"]
+                namespaces[namespace] = {**counts, "hit_rate": hits / lookups if lookups else 0.0}
+            return {
+                "enabled": self.enabled,
+                "memory_entries": len(self._memory),
+                "memory_max_entries": self.memory_entries,
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.max_disk_bytes,
+                "evictions": dict(self._evictions),
+                "namespaces": namespaces,
+            }
+    
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+llm_cache = LLMCache(
+    memory_entries=settings.llm_cache_memory_entries,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    cache_dir=settings.llm_cache_dir,
+    max_disk_bytes=settings.llm_cache_max_disk_mb * 1024 * 1024
+)
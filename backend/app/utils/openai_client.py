@@ -4,9 +4,11 @@ Utilitário para inicialização segura do cliente OpenAI
 import os
 import logging
 from typing import Optional
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import httpx
 
+from ..core.config import settings
+
 logger = logging.getLogger(__name__)
 
 class OpenAIClientManager:
@@ -29,7 +31,7 @@ class OpenAIClientManager:
         # Tentativa 1: Inicialização padrão
         try:
             logger.info("Tentando inicialização padrão do OpenAI...")
-            return OpenAI(api_key=api_key)
+            return OpenAI(api_key=api_key, base_url=settings.openai_base_url)
         except Exception as e:
             logger.warning(f"Falha na inicialização padrão: {e}")
         
@@ -38,6 +40,7 @@ class OpenAIClientManager:
             logger.info("Tentando inicialização com httpx.Client...")
             return OpenAI(
                 api_key=api_key,
+                base_url=settings.openai_base_url,
                 http_client=httpx.Client(
                     timeout=30.0,
                     limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
@@ -51,6 +54,7 @@ class OpenAIClientManager:
             logger.info("Tentando inicialização com configurações mínimas...")
             return OpenAI(
                 api_key=api_key,
+                base_url=settings.openai_base_url,
                 timeout=30.0,
                 max_retries=3
             )
@@ -83,3 +87,55 @@ class OpenAIClientManager:
 def get_openai_client() -> OpenAI:
     """Função de conveniência para obter cliente OpenAI"""
     return OpenAIClientManager.get_client()
+
+class AsyncOpenAIClientManager:
+    """
+    Gerenciador do cliente AsyncOpenAI usado pelos endpoints async.
+    Todas as chamadas compartilham um único pool de conexões httpx
+    (keep-alive/HTTP), dimensionado pelas configurações openai_*.
+    """
+    
+    _instance: Optional[AsyncOpenAI] = None
+    _http_client: Optional[httpx.AsyncClient] = None
+    
+    @classmethod
+    def get_client(cls) -> AsyncOpenAI:
+        """Obtém a instância compartilhada do AsyncOpenAI (criada na primeira chamada)"""
+        if cls._instance is None:
+            cls._instance = cls._create_client()
+        return cls._instance
+    
+    @classmethod
+    def _create_client(cls) -> AsyncOpenAI:
+        api_key = OpenAIClientManager._get_api_key()
+        cls._http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.openai_timeout, connect=settings.openai_connect_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_keepalive_connections,
+                keepalive_expiry=settings.openai_keepalive_expiry
+            )
+        )
+        logger.info(
+            f"Cliente AsyncOpenAI criado (max_connections={settings.openai_max_connections}, "
+            f"keepalive={settings.openai_max_keepalive_connections})"
+        )
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url=settings.openai_base_url,
+            http_client=cls._http_client,
+            # Retries ficam a cargo de utils/resilience (orçamento de tempo + circuit breaker)
+            max_retries=0
+        )
+    
+    @classmethod
+    async def aclose(cls):
+        """Fecha o pool de conexões (chamado no shutdown da aplicação)"""
+        if cls._http_client is not None:
+            await cls._http_client.aclose()
+        cls._instance = None
+        cls._http_client = None
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Função de conveniência para obter o cliente AsyncOpenAI compartilhado"""
+    return AsyncOpenAIClientManager.get_client()
@@ -0,0 +1,49 @@
+"""
+Utilitário para paginação por cursor (keyset) baseada em (created_at, id)
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+
+# Header com o cursor da próxima página
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Gera um cursor opaco a partir da posição (created_at, id) do último item"""
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodifica um cursor gerado por encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido"
+        )
+
+def apply_keyset(query, model, after: Optional[str]):
+    """Ordena por (created_at, id) decrescente e posiciona a consulta após o cursor"""
+    if after:
+        created_at, item_id = decode_cursor(after)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, item_id))
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+def next_cursor(items: list, limit: Optional[int]) -> Optional[str]:
+    """Retorna o cursor da próxima página, ou None se esta for a última"""
+    if not limit or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
+
+def set_next_cursor(response: Response, cursor: Optional[str]):
+    """Expõe o cursor da próxima página no header da resposta"""
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,73 @@
+"""
+Cliente HTTP compartilhado para a API da Perplexity (chatbot de entrevistas)
+"""
+import logging
+from typing import Optional
+
+import httpx
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _http2_available() -> bool:
+    """HTTP/2 no httpx depende do pacote opcional h2 (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class PerplexityClientManager:
+    """
+    Mantém um único httpx.AsyncClient (keep-alive, HTTP/2 quando disponível)
+    criado no startup e fechado no shutdown, evitando um handshake TLS
+    e uma conexão nova a cada mensagem do chat
+    """
+    
+    _client: Optional[httpx.AsyncClient] = None
+    
+    @classmethod
+    def start(cls) -> httpx.AsyncClient:
+        """Cria o cliente compartilhado (idempotente)"""
+        if cls._client is None:
+            cls._client = cls._create_client()
+        return cls._client
+    
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """Obtém o cliente compartilhado, criando-o se o startup não o fez"""
+        return cls.start()
+    
+    @classmethod
+    def _create_client(cls) -> httpx.AsyncClient:
+        http2 = settings.perplexity_http2
+        if http2 and not _http2_available():
+            logger.warning("Pacote h2 não instalado: cliente Perplexity usará HTTP/1.1")
+            http2 = False
+        
+        logger.info(
+            f"Cliente Perplexity criado (http2={http2}, "
+            f"max_connections={settings.perplexity_max_connections})"
+        )
+        return httpx.AsyncClient(
+            base_url=settings.perplexity_base_url,
+            http2=http2,
+            timeout=httpx.Timeout(settings.perplexity_timeout, connect=settings.perplexity_connect_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.perplexity_max_connections,
+                max_keepalive_connections=settings.perplexity_max_keepalive_connections,
+                keepalive_expiry=settings.perplexity_keepalive_expiry
+            )
+        )
+    
+    @classmethod
+    async def aclose(cls):
+        """Fecha as conexões do cliente compartilhado"""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+def get_perplexity_client() -> httpx.AsyncClient:
+    """Função de conveniência para obter o cliente da Perplexity"""
+    return PerplexityClientManager.get_client()
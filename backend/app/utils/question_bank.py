@@ -0,0 +1,157 @@
+"""
+Seleção de perguntas do banco pré-gerado (tabela interview_questions)
+
+O banco é preenchido offline por generate_question_bank.py. Este módulo mantém
+todos os pools ativos em memória, indexados por (tipo, nível, área, kind), e
+os recarrega da tabela a cada question_bank_refresh_seconds, então servir a
+abertura de uma entrevista não espera nem o LLM nem o banco.
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from ..core.config import settings
+from ..db.database import AsyncSessionLocal
+from ..models.learning import InterviewQuestion
+
+logger = logging.getLogger(__name__)
+
+# Área usada quando a configuração não tem pool próprio
+GENERAL_FOCUS_AREA = "geral"
+
+PoolKey = Tuple[str, str, str, str]  # (interview_type, difficulty_level, focus_area, kind)
+
+class QuestionBank:
+    """Pools de perguntas ativas deste worker"""
+    
+    def __init__(self, refresh_seconds: float, enabled: bool = True):
+        self.refresh_seconds = refresh_seconds
+        self.enabled = enabled
+        self._pools: Dict[PoolKey, List[Dict]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._served = 0
+        self._fallbacks = 0
+    
+    async def reload(self):
+        """Carrega todas as perguntas ativas em uma consulta; em erro mantém os pools atuais"""
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(
+                        InterviewQuestion.id,
+                        InterviewQuestion.interview_type,
+                        InterviewQuestion.difficulty_level,
+                        InterviewQuestion.focus_area,
+                        InterviewQuestion.kind,
+                        InterviewQuestion.question_type,
+                        InterviewQuestion.question_text
+                    ).where(InterviewQuestion.is_active.is_(True))
+                    .order_by(InterviewQuestion.id)
+                )).all()
+        except Exception as e:
+            logger.warning(f"Falha ao carregar banco de perguntas: {e}")
+            self._loaded_at = time.monotonic()
+            return
+        
+        pools: Dict[PoolKey, List[Dict]] = defaultdict(list)
+        for row in rows:
+            pools[(row.interview_type, row.difficulty_level, row.focus_area, row.kind)].append({
+                "id": row.id,
+                "question_text": row.question_text,
+                "question_type": row.question_type,
+                "difficulty": row.difficulty_level,
+            })
+        self._pools = dict(pools)
+        self._loaded_at = time.monotonic()
+        logger.info(f"Banco de perguntas carregado: {len(rows)} perguntas em {len(self._pools)} pools")
+    
+    async def _ensure_loaded(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        async with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_seconds:
+                await self.reload()
+    
+    async def _pools_for(self, interview_type: str, difficulty_level: str,
+                         focus_areas: List[str], kind: str) -> List[List[Dict]]:
+        """Pools das áreas da configuração; o pool geral só entra se nenhuma área tiver perguntas"""
+        await self._ensure_loaded()
+        pools = [
+            self._pools[key]
+            for area in focus_areas
+            if (key := (interview_type, difficulty_level, area, kind)) in self._pools
+        ]
+        if not pools:
+            general = self._pools.get((interview_type, difficulty_level, GENERAL_FOCUS_AREA, kind))
+            if general:
+                pools.append(general)
+        return pools
+    
+    async def opening_question(self, interview_type: str, difficulty_level: str,
+                               focus_areas: List[str]) -> Optional[str]:
+        """
+        Saudação + primeira pergunta sorteada do pool; None se não há pool (usar o LLM).
+        A abertura cita a vaga da sua área, e o prompt do entrevistador nomeia a vaga
+        por determine_job_type_from_focus_areas: só há correspondência com uma área
+        (pool da área) ou nenhuma (pool geral, "vaga profissional").
+        """
+        if not self.enabled:
+            return None
+        if len(focus_areas) > 1:
+            self._fallbacks += 1
+            return None
+        await self._ensure_loaded()
+        area = focus_areas[0] if focus_areas else GENERAL_FOCUS_AREA
+        pool = self._pools.get((interview_type, difficulty_level, area, "opening"))
+        if not pool:
+            self._fallbacks += 1
+            return None
+        self._served += 1
+        return random.choice(pool)["question_text"]
+    
+    async def questions(self, interview_type: str, difficulty_level: str, focus_areas: List[str],
+                        count: int, seed: str) -> List[Dict]:
+        """
+        count perguntas distintas intercalando as áreas de foco. A ordem é
+        determinística para o mesmo seed (ex.: id da sessão), então cada
+        requisição da sessão vê a mesma sequência sem guardar estado.
+        """
+        if not self.enabled:
+            return []
+        pools = await self._pools_for(interview_type, difficulty_level, focus_areas, "question")
+        if not pools:
+            self._fallbacks += 1
+            return []
+        
+        rng = random.Random(seed)
+        shuffled = [rng.sample(pool, len(pool)) for pool in pools]
+        selected: List[Dict] = []
+        seen = set()
+        for i in range(max(len(pool) for pool in shuffled)):
+            for pool in shuffled:
+                if i < len(pool) and pool[i]["id"] not in seen:
+                    seen.add(pool[i]["id"])
+                    selected.append(pool[i])
+        self._served += 1
+        return selected[:count]
+    
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "pools": len(self._pools),
+            "questions": sum(len(pool) for pool in self._pools.values()),
+            "loaded_seconds_ago": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            "served": self._served,
+            "fallbacks": self._fallbacks,
+        }
+
+question_bank = QuestionBank(
+    refresh_seconds=settings.question_bank_refresh_seconds,
+    enabled=settings.question_bank_enabled
+)
@@ -0,0 +1,212 @@
+"""
+Camada de resiliência das chamadas aos provedores de IA: circuit breaker por
+provedor e retries com backoff exponencial e jitter dentro de um orçamento
+total de tempo. Com o circuito aberto as chamadas falham imediatamente, o que
+mantém a latência limitada durante um incidente no upstream.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+import openai
+
+from ..core.config import settings
+from .bulkhead import BulkheadFullError, bulkhead as acquire_bulkhead
+from .ai_usage import ai_usage, extract_usage
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(BulkheadFullError):
+    """Circuito aberto: responde 503 com Retry-After, como as rejeições de bulkhead"""
+    
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(name, 503, retry_after)
+        self.args = (f"Serviço '{name}' indisponível no momento, tente novamente em {retry_after}s",)
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Falhas do upstream que justificam retry e contam para o circuit breaker"""
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError, openai.APIConnectionError)):
+        return True
+    if isinstance(exc, (openai.APIStatusError, httpx.HTTPStatusError)):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+def _retry_after_hint(exc: BaseException) -> Optional[float]:
+    """Lê o Retry-After (em segundos) enviado pelo upstream, se houver"""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+class CircuitBreaker:
+    """
+    Fechado: chamadas normais. Aberto após failure_threshold falhas seguidas:
+    rejeita tudo até reset_timeout. Meio-aberto: deixa passar uma única
+    chamada de teste, que fecha ou reabre o circuito.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self.retries = 0
+        self._probe_in_flight = False
+    
+    def _retry_after(self) -> int:
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        return max(1, int(remaining + 0.999))
+    
+    def before_call(self):
+        """Levanta CircuitOpenError se a chamada não pode seguir para o upstream"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self._retry_after())
+            self.state = self.HALF_OPEN
+            logger.info(f"Circuito '{self.name}' meio-aberto: testando o upstream")
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, 1)
+            self._probe_in_flight = True
+    
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuito '{self.name}' fechado")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+    
+    def record_failure(self):
+        self._probe_in_flight = False
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(
+                    f"Circuito '{self.name}' aberto após {self.consecutive_failures} falhas seguidas"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+    
+    def release(self):
+        """Chamada terminou sem dizer nada sobre a saúde do upstream (ex.: bulkhead cheio)"""
+        self._probe_in_flight = False
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "retry_after_seconds": self._retry_after() if self.state == self.OPEN else 0,
+        }
+
+breakers: Dict[str, CircuitBreaker] = {
+    name: CircuitBreaker(
+        name,
+        failure_threshold=settings.ai_breaker_failure_threshold,
+        reset_timeout=settings.ai_breaker_reset_timeout
+    )
+    for name in ("openai", "perplexity")
+}
+
+def _backoff_delay(attempt: int) -> float:
+    """Backoff exponencial com jitter completo"""
+    cap = min(settings.ai_retry_max_delay, settings.ai_retry_base_delay * (2 ** attempt))
+    return random.uniform(0, cap)
+
+async def call_upstream(
+    provider: str,
+    fn: Callable[[], Awaitable[Any]],
+    bulkhead: Optional[str] = None,
+    budget: Optional[float] = None,
+    operation: str = "chat",
+    model: str = "unknown",
+    characters: int = 0
+) -> Any:
+    """
+    Executa fn() passando pelo circuit breaker do provedor, com retries para
+    falhas transitórias (timeout, conexão, 429, 5xx) enquanto houver orçamento.
+    Cada tentativa ocupa uma vaga do bulkhead informado apenas durante a chamada
+    e é contabilizada em ai_usage (tokens e duração vêm da resposta; characters
+    é o tamanho do texto enviado ao TTS).
+    """
+    breaker = breakers[provider]
+    deadline = time.monotonic() + (budget or settings.ai_retry_budget_seconds)
+    attempt = 0
+    
+    async def attempt_call():
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(fn(), timeout=deadline - time.monotonic())
+        except (BulkheadFullError, asyncio.CancelledError):
+            raise
+        except Exception:
+            ai_usage.record(provider, operation, model, time.perf_counter() - started, error=True)
+            raise
+        ai_usage.record(
+            provider, operation, model, time.perf_counter() - started,
+            characters=characters, **extract_usage(result)
+        )
+        return result
+    
+    while True:
+        breaker.before_call()
+        try:
+            if bulkhead is None:
+                result = await attempt_call()
+            else:
+                async with acquire_bulkhead(bulkhead):
+                    result = await attempt_call()
+        except BaseException as e:
+            if not is_transient_error(e):
+                if isinstance(e, (openai.APIStatusError, httpx.HTTPStatusError)):
+                    # O upstream respondeu (ex.: 400): está saudável
+                    breaker.record_success()
+                else:
+                    breaker.release()
+                raise
+            
+            breaker.record_failure()
+            attempt += 1
+            delay = _retry_after_hint(e)
+            if delay is None:
+                delay = _backoff_delay(attempt)
+            if (
+                attempt >= settings.ai_retry_max_attempts
+                or breaker.state == CircuitBreaker.OPEN
+                or time.monotonic() + delay >= deadline
+            ):
+                raise
+            
+            breaker.retries += 1
+            logger.warning(
+                f"Falha transitória em '{provider}' ({type(e).__name__}); "
+                f"tentativa {attempt + 1} em {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            continue
+        
+        breaker.record_success()
+        return result
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: b.stats() for name, b in breakers.items()}
@@ -0,0 +1,57 @@
+"""
+Coalescência de chamadas idênticas em andamento (single-flight): requisições
+concorrentes com a mesma chave aguardam uma única execução e recebem o mesmo
+resultado (ou a mesma exceção). Vale por processo; cada worker tem os seus grupos.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Grupo de chamadas coalescidas, identificado por nome nas métricas"""
+    
+    _groups: Dict[str, "SingleFlight"] = {}
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.shared = 0
+        SingleFlight._groups[name] = self
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa fn() uma única vez por chave enquanto houver chamadas em andamento.
+        A execução roda em uma task própria: se o cliente que a iniciou desconectar,
+        os demais continuam aguardando o mesmo resultado.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+    
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Marca a exceção como consumida mesmo se todos os chamadores saíram antes
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Chamada coalescida '{self.name}' falhou: {task.exception()!r}")
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "shared": self.shared,
+        }
+    
+    @classmethod
+    def all_stats(cls) -> Dict[str, Dict[str, int]]:
+        """Métricas de todos os grupos deste worker"""
+        return {name: group.stats() for name, group in cls._groups.items()}
@@ -0,0 +1,62 @@
+"""
+Transcrição (Whisper) e síntese de fala (TTS) da OpenAI
+
+Usadas pelas rotas /voice (requisição/resposta) e pela entrevista por voz
+em tempo real, com o mesmo bulkhead, circuit breaker e contabilidade de uso.
+"""
+import io
+
+from ..core.config import settings
+from .openai_client import get_async_openai_client
+from .resilience import call_upstream
+from .singleflight import SingleFlight
+
+# Sínteses de fala idênticas em andamento compartilham a mesma chamada
+speak_flight = SingleFlight("voice_speak")
+
+async def transcribe_audio(audio: bytes, filename: str = "audio.webm", operation: str = "transcription") -> str:
+    """Texto do áudio em português; operation separa o uso em /metrics/ai-usage (ex.: transcrições parciais)"""
+    client = get_async_openai_client()
+    
+    async def request_transcription():
+        # Um arquivo novo a cada tentativa
+        audio_file_obj = io.BytesIO(audio)
+        audio_file_obj.name = filename
+        return await client.audio.transcriptions.create(
+            model="whisper-1",
+            file=audio_file_obj,
+            language="pt",  # Português brasileiro
+            response_format="verbose_json",  # inclui a duração, usada na contabilidade de uso
+            timeout=settings.openai_audio_timeout
+        )
+    
+    transcription = await call_upstream(
+        "openai",
+        request_transcription,
+        bulkhead="openai_transcription",
+        operation=operation,
+        model="whisper-1"
+    )
+    return transcription.text
+
+async def synthesize_speech(text: str, model: str = "tts-1", voice: str = "alloy") -> bytes:
+    """Áudio mp3 do texto; a mesma frase pedida ao mesmo tempo é sintetizada uma única vez"""
+    async def synthesize() -> bytes:
+        client = get_async_openai_client()
+        response = await call_upstream(
+            "openai",
+            lambda: client.audio.speech.create(
+                model=model,
+                voice=voice,
+                input=text,
+                response_format="mp3",
+                timeout=settings.openai_audio_timeout
+            ),
+            bulkhead="openai_tts",
+            operation="tts",
+            model=model,
+            characters=len(text)
+        )
+        return response.content
+    
+    return await speak_flight.do((model, voice, text), synthesize)
@@ -0,0 +1,57 @@
+"""
+Latência ponta a ponta dos turnos da entrevista por voz
+
+Cada turno informa a duração de cada etapa (transcrição, primeiro trecho do
+LLM, primeiro áudio, total) medida a partir do fim da fala do candidato. As
+últimas interview_voice_latency_window medições de cada etapa ficam em
+memória para os percentis de /metrics/voice-interview.
+"""
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from ..core.config import settings
+
+def _percentile(ordered: list, fraction: float) -> float:
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+class VoiceLatencyTracker:
+    """Janela deslizante das latências por etapa deste worker"""
+    
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._stages: Dict[str, Deque[float]] = {}
+        self._turns = 0
+        self._partial_reused = 0
+        self.active_connections = 0
+    
+    def record(self, stages: Dict[str, Optional[float]], partial_reused: bool = False):
+        """Registra as etapas de um turno (em ms); etapas None não ocorreram no turno"""
+        self._turns += 1
+        if partial_reused:
+            self._partial_reused += 1
+        for stage, value in stages.items():
+            if value is None:
+                continue
+            if stage not in self._stages:
+                self._stages[stage] = deque(maxlen=self.window)
+            self._stages[stage].append(value)
+    
+    def stats(self) -> Dict:
+        stages = {}
+        for stage, values in self._stages.items():
+            ordered = sorted(values)
+            stages[stage] = {
+                "count": len(ordered),
+                "p50_ms": round(_percentile(ordered, 0.5), 1),
+                "p95_ms": round(_percentile(ordered, 0.95), 1),
+                "max_ms": round(ordered[-1], 1),
+            }
+        return {
+            "active_connections": self.active_connections,
+            "turns": self._turns,
+            "partial_transcript_reused": self._partial_reused,
+            "stages": stages,
+        }
+
+voice_latency = VoiceLatencyTracker(window=settings.interview_voice_latency_window)
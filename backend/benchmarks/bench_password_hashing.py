@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark do hash de senhas no login
+
+Compara, com N logins simultâneos, a verificação bcrypt chamada direto no
+event loop (comportamento antigo) com o executor dedicado de
+app.core.security. Uma tarefa de "batimento" mede o atraso do event loop,
+que é o que as demais requisições sentiriam durante a rajada de logins.
+
+Uso:
+    python benchmarks/bench_password_hashing.py --logins 40 --rounds 12 --workers 2
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Adicionar o diretório backend ao path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+HEARTBEAT_INTERVAL = 0.01
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark de login com bcrypt")
+    parser.add_argument("--logins", type=int, default=40, help="Logins simultâneos")
+    parser.add_argument("--rounds", type=int, default=12, help="Custo do bcrypt")
+    parser.add_argument("--workers", type=int, default=2, help="Threads do executor de hash")
+    return parser.parse_args()
+
+async def heartbeat(stop: asyncio.Event, delays: list):
+    """Registra quanto cada tick do event loop atrasou em relação ao previsto"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        delays.append(time.perf_counter() - start - HEARTBEAT_INTERVAL)
+
+async def run_scenario(name: str, login, count: int):
+    latencies, delays = [], []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(heartbeat(stop, delays))
+    await asyncio.sleep(0)
+
+    # Latência medida desde a chegada da rajada (todos os logins chegam juntos)
+    start = time.perf_counter()
+
+    async def timed_login():
+        await login()
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(timed_login() for _ in range(count)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    latencies.sort()
+    print(f"\n{name}")
+    print(f"   logins/s:            {count / elapsed:8.1f}")
+    print(f"   latência p50 / p95:  {latencies[len(latencies) // 2] * 1000:8.1f} / "
+          f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"   atraso do loop máx:  {max(delays, default=0) * 1000:8.1f} ms "
+          f"(médio {statistics.mean(delays or [0]) * 1000:.1f} ms, {len(delays)} ticks)")
+
+async def main():
+    args = parse_args()
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+
+    from app.core.security import get_password_hash, verify_password, verify_password_async
+
+    password = "senha-de-teste"
+    hashed = get_password_hash(password)
+    print(f"bcrypt rounds={args.rounds}, executor workers={args.workers}, logins simultâneos={args.logins}")
+
+    async def inline_login():
+        # Chamada síncrona dentro da corrotina: bloqueia o event loop
+        assert verify_password(password, hashed)
+
+    async def executor_login():
+        valid, _ = await verify_password_async(password, hashed)
+        assert valid
+
+    await run_scenario("Inline no event loop (antes)", inline_login, args.logins)
+    await run_scenario("Executor dedicado (depois)", executor_login, args.logins)
+
+if __name__ == "__main__":
+    asyncio.run(main())
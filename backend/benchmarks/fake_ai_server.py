@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Servidor falso da OpenAI e da Perplexity para testes de carga
+
+Implementa apenas os endpoints que o backend chama (chat.completions com e sem
+streaming, audio.transcriptions, audio.speech e o chat/completions da
+Perplexity), com latência sorteada de uma distribuição configurável, taxa de
+erros e tamanho das respostas ajustáveis. Nenhuma chamada real é feita.
+
+Uso:
+    python benchmarks/fake_ai_server.py --port 8090 --latency lognormal --latency-ms 800 --error-rate 0.02
+
+Apontando o backend para ele:
+    OPENAI_API_KEY=sk-fake OPENAI_BASE_URL=http://127.0.0.1:8090/v1 \\
+    PERPLEXITY_API_KEY=pplx-fake PERPLEXITY_BASE_URL=http://127.0.0.1:8090 \\
+    uvicorn app.main:app
+
+Contadores por endpoint ficam em GET /_stats.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import Counter
+from typing import List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+
+WORDS = (
+    "a vaga exige experiência com atendimento ao público e boa comunicação "
+    "o candidato demonstrou domínio das ferramentas e interesse em acessibilidade "
+    "conte um pouco sobre um desafio que você superou no trabalho anterior"
+).split()
+
+ERROR_MESSAGES = {
+    429: "Rate limit reached for requests",
+    500: "The server had an error while processing your request",
+    502: "Bad gateway",
+    503: "The engine is currently overloaded, please try again later",
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor falso da OpenAI/Perplexity")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument(
+        "--latency", default="lognormal",
+        choices=["fixed", "uniform", "normal", "lognormal", "exponential"],
+        help="Distribuição da latência de cada resposta"
+    )
+    parser.add_argument("--latency-ms", type=float, default=500, help="Latência mediana/média (ms)")
+    parser.add_argument("--latency-spread", type=float, default=0.5,
+                        help="Dispersão: fração da média (uniform/normal) ou sigma (lognormal)")
+    parser.add_argument("--audio-latency-factor", type=float, default=2.0,
+                        help="Multiplicador da latência para transcrição e fala")
+    parser.add_argument("--token-ms", type=float, default=20, help="Intervalo entre tokens no streaming (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas com erro (0-1)")
+    parser.add_argument("--error-statuses", default="429,500,503", help="Status sorteados nos erros")
+    parser.add_argument("--completion-words", type=int, default=120, help="Palavras por resposta de chat")
+    parser.add_argument("--audio-bytes", type=int, default=48_000, help="Tamanho do mp3 gerado")
+    parser.add_argument("--transcript", default="buscar vagas de analista de dados home office")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+def create_app(args) -> FastAPI:
+    app = FastAPI(title="Fake AI server")
+    rng = random.Random(args.seed)
+    error_statuses = [int(s) for s in args.error_statuses.split(",") if s]
+    stats = Counter()
+
+    def sample_latency(factor: float = 1.0) -> float:
+        mean = args.latency_ms / 1000 * factor
+        if args.latency == "fixed":
+            value = mean
+        elif args.latency == "uniform":
+            value = rng.uniform(mean * (1 - args.latency_spread), mean * (1 + args.latency_spread))
+        elif args.latency == "normal":
+            value = rng.gauss(mean, mean * args.latency_spread)
+        elif args.latency == "exponential":
+            value = rng.expovariate(1 / mean)
+        else:
+            # Mediana = mean; sigma controla a cauda (p99 ≈ mediana * e^(2.33σ))
+            value = rng.lognormvariate(0, args.latency_spread) * mean
+        return max(0.0, value)
+
+    def maybe_error(endpoint: str):
+        if error_statuses and rng.random() < args.error_rate:
+            status = rng.choice(error_statuses)
+            stats[f"{endpoint}:{status}"] += 1
+            headers = {"retry-after": "1"} if status == 429 else {}
+            return JSONResponse(
+                status_code=status,
+                content={"error": {"message": ERROR_MESSAGES.get(status, "error"), "type": "fake_error"}},
+                headers=headers
+            )
+        stats[f"{endpoint}:200"] += 1
+        return None
+
+    def completion_words(body: dict) -> List[str]:
+        count = min(args.completion_words, body.get("max_tokens") or args.completion_words)
+        return [rng.choice(WORDS) for _ in range(count)]
+
+    def usage(body: dict, completion_tokens: int) -> dict:
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    async def chat_completion(endpoint: str, request: Request):
+        body = await request.json()
+        await asyncio.sleep(sample_latency())
+        error = maybe_error(endpoint)
+        if error is not None:
+            return error
+
+        words = completion_words(body)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", "fake-model")
+
+        if body.get("stream"):
+            async def events():
+                for i, word in enumerate(words):
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "delta": {"role": "assistant", "content": word + " "} if i == 0 else {"content": word + " "},
+                            "finish_reason": None,
+                        }],
+                    }
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                    await asyncio.sleep(args.token_ms / 1000)
+                final = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                    "usage": usage(body, len(words)),
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        # Sem streaming, a geração dos tokens também leva tempo
+        await asyncio.sleep(len(words) * args.token_ms / 1000)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": " ".join(words)},
+            }],
+            "usage": usage(body, len(words)),
+        }
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        return await chat_completion("openai_chat", request)
+
+    @app.post("/chat/completions")
+    async def perplexity_chat(request: Request):
+        return await chat_completion("perplexity_chat", request)
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        form = await request.form()
+        await asyncio.sleep(sample_latency(args.audio_latency_factor))
+        error = maybe_error("openai_transcription")
+        if error is not None:
+            return error
+        if form.get("response_format") == "text":
+            return PlainTextResponse(args.transcript)
+        upload = form.get("file")
+        size = len(await upload.read()) if upload is not None else 0
+        # Duração estimada a partir do tamanho (~32 kB/s), mínimo de 1 segundo
+        return {
+            "task": "transcribe",
+            "language": "portuguese",
+            "duration": max(1.0, round(size / 32_000, 2)),
+            "text": args.transcript,
+            "segments": [],
+        }
+
+    @app.post("/v1/audio/speech")
+    async def speech(request: Request):
+        body = await request.json()
+        await asyncio.sleep(sample_latency(args.audio_latency_factor))
+        error = maybe_error("openai_tts")
+        if error is not None:
+            return error
+        # Tamanho proporcional ao texto, limitado por --audio-bytes
+        size = min(args.audio_bytes, 200 + 400 * len(body.get("input", "")))
+        return Response(b"ID3" + rng.randbytes(max(0, size - 3)), media_type="audio/mpeg")
+
+    @app.get("/_stats")
+    async def get_stats():
+        return dict(stats)
+
+    return app
+
+def main():
+    import uvicorn
+
+    args = parse_args()
+    print(
+        f"Servidor falso em http://{args.host}:{args.port} "
+        f"(latência {args.latency} ~{args.latency_ms:.0f} ms, erros {args.error_rate:.0%})"
+    )
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
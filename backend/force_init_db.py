@@ -43,6 +43,12 @@ def force_create_tables():
         print("🏗️  Criando tabelas...")
         Base.metadata.create_all(bind=engine)
         
+        # Marcar o banco como atualizado para o Alembic
+        from alembic import command
+        from app.db.init_db import get_alembic_config
+        command.stamp(get_alembic_config(), "head")
+        print("✅ Banco marcado na última migração (alembic stamp head)")
+        
         # Verificar tabelas criadas
         with engine.connect() as conn:
             result = conn.execute(text("""
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Script para pré-gerar o banco de perguntas de entrevista
+Gera, para cada (tipo de entrevista, nível, área de foco), aberturas (saudação +
+primeira pergunta) e perguntas avulsas com o LLM e grava em interview_questions.
+Pools já existentes são mantidos, a menos que --replace seja usado.
+
+Uso:
+    python generate_question_bank.py
+    python generate_question_bank.py --types technical --levels beginner,intermediate --focus-areas frontend --replace
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+
+# Adicionar o diretório backend ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, insert, select, update
+
+from app.db.database import AsyncSessionLocal
+from app.models.learning import InterviewQuestion
+from app.utils.openai_client import get_async_openai_client, AsyncOpenAIClientManager
+from app.utils.resilience import call_upstream
+from app.utils.question_bank import GENERAL_FOCUS_AREA
+from app.api.interview_chatbot import (
+    INTERVIEW_TYPE_LABELS,
+    DIFFICULTY_LABELS,
+    FOCUS_AREA_LABELS,
+    JOB_TYPE_BY_FOCUS_AREA,
+)
+
+QUESTION_TYPES = {"technical", "behavioral", "case_study"}
+
+def build_prompt(interview_type: str, difficulty_level: str, focus_area: str, openings: int, questions: int) -> str:
+    """Prompt de geração de um pool"""
+    if focus_area == GENERAL_FOCUS_AREA:
+        job_type = "vaga profissional"
+        area = "qualquer área profissional"
+    else:
+        job_type = JOB_TYPE_BY_FOCUS_AREA.get(focus_area, focus_area)
+        area = FOCUS_AREA_LABELS.get(focus_area, focus_area)
+    
+    return f"""
+Você é Farol, recrutador experiente que conduz entrevistas de simulação em português do Brasil,
+com tom acolhedor, informal e acessível (a plataforma atende pessoas com deficiência).
+
+Gere material para entrevistas com esta configuração:
+- Tipo de entrevista: {INTERVIEW_TYPE_LABELS.get(interview_type, interview_type)}
+- Nível: {DIFFICULTY_LABELS.get(difficulty_level, difficulty_level)}
+- Vaga: {job_type}
+- Área de foco: {area}
+
+1. "openings": {openings} aberturas diferentes. Cada uma tem uma saudação calorosa, apresenta o
+   Farol, diz que é uma simulação para a vaga de {job_type} e termina com UMA primeira pergunta
+   simples para o candidato se sentir à vontade. Não use o nome do candidato.
+2. "questions": {questions} perguntas diferentes e adequadas ao tipo e ao nível, cada uma com
+   "text" e "type" ("technical", "behavioral" ou "case_study").
+
+Nunca inclua referências como [1] ou formatação especial.
+Responda apenas com JSON no formato {{"openings": ["..."], "questions": [{{"text": "...", "type": "..."}}]}}.
+"""
+
+async def generate_pool(args, interview_type: str, difficulty_level: str, focus_area: str) -> list:
+    client = get_async_openai_client()
+    response = await call_upstream(
+        "openai",
+        lambda: client.chat.completions.create(
+            model=args.model,
+            messages=[{"role": "user", "content": build_prompt(
+                interview_type, difficulty_level, focus_area, args.openings, args.questions
+            )}],
+            response_format={"type": "json_object"},
+            temperature=0.9,
+            max_tokens=3000
+        ),
+        bulkhead="openai_chat",
+        operation="question_bank",
+        model=args.model
+    )
+    data = json.loads(response.choices[0].message.content)
+    default_type = interview_type if interview_type in QUESTION_TYPES else "behavioral"
+    
+    rows = [
+        {"kind": "opening", "question_type": default_type, "question_text": text.strip()}
+        for text in data.get("openings", []) if isinstance(text, str) and text.strip()
+    ]
+    for question in data.get("questions", []):
+        if isinstance(question, dict) and str(question.get("text", "")).strip():
+            question_type = question.get("type")
+            rows.append({
+                "kind": "question",
+                "question_type": question_type if question_type in QUESTION_TYPES else default_type,
+                "question_text": question["text"].strip()
+            })
+    return rows
+
+async def pool_exists(interview_type: str, difficulty_level: str, focus_area: str) -> bool:
+    async with AsyncSessionLocal() as db:
+        count = await db.scalar(
+            select(func.count()).select_from(InterviewQuestion).where(
+                InterviewQuestion.interview_type == interview_type,
+                InterviewQuestion.difficulty_level == difficulty_level,
+                InterviewQuestion.focus_area == focus_area,
+                InterviewQuestion.is_active.is_(True)
+            )
+        )
+    return count > 0
+
+async def save_pool(args, interview_type: str, difficulty_level: str, focus_area: str, rows: list):
+    async with AsyncSessionLocal() as db:
+        if args.replace:
+            await db.execute(
+                update(InterviewQuestion).where(
+                    InterviewQuestion.interview_type == interview_type,
+                    InterviewQuestion.difficulty_level == difficulty_level,
+                    InterviewQuestion.focus_area == focus_area,
+                    InterviewQuestion.is_active.is_(True)
+                ).values(is_active=False)
+            )
+        await db.execute(insert(InterviewQuestion), [
+            {
+                **row,
+                "interview_type": interview_type,
+                "difficulty_level": difficulty_level,
+                "focus_area": focus_area,
+                "model": args.model,
+                "is_active": True
+            }
+            for row in rows
+        ])
+        await db.commit()
+
+async def run(args) -> dict:
+    combos = [
+        (interview_type, difficulty_level, focus_area)
+        for interview_type in args.types
+        for difficulty_level in args.levels
+        for focus_area in args.focus_areas
+    ]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    totals = {"generated": 0, "skipped": 0, "failed": 0, "questions": 0}
+    
+    async def process(interview_type: str, difficulty_level: str, focus_area: str):
+        label = f"{interview_type}/{difficulty_level}/{focus_area}"
+        if not args.replace and not args.dry_run and await pool_exists(interview_type, difficulty_level, focus_area):
+            totals["skipped"] += 1
+            return
+        async with semaphore:
+            try:
+                rows = await generate_pool(args, interview_type, difficulty_level, focus_area)
+                if not rows:
+                    raise ValueError("resposta sem perguntas")
+                if args.dry_run:
+                    print(json.dumps({label: rows}, ensure_ascii=False, indent=2))
+                else:
+                    await save_pool(args, interview_type, difficulty_level, focus_area, rows)
+                totals["generated"] += 1
+                totals["questions"] += len(rows)
+                print(f"✅ {label}: {len(rows)} perguntas")
+            except Exception as e:
+                totals["failed"] += 1
+                print(f"❌ {label}: {e}")
+    
+    await asyncio.gather(*(process(*combo) for combo in combos))
+    await AsyncOpenAIClientManager.aclose()
+    return totals
+
+def parse_list(value: str) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Pré-gera o banco de perguntas de entrevista")
+    parser.add_argument("--types", type=parse_list, default=list(INTERVIEW_TYPE_LABELS),
+                        help="Tipos de entrevista separados por vírgula")
+    parser.add_argument("--levels", type=parse_list, default=list(DIFFICULTY_LABELS),
+                        help="Níveis separados por vírgula")
+    parser.add_argument("--focus-areas", type=parse_list,
+                        default=list(JOB_TYPE_BY_FOCUS_AREA) + [GENERAL_FOCUS_AREA],
+                        help="Áreas de foco separadas por vírgula")
+    parser.add_argument("--openings", type=int, default=4, help="Aberturas por pool")
+    parser.add_argument("--questions", type=int, default=12, help="Perguntas por pool")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--concurrency", type=int, default=4, help="Gerações simultâneas")
+    parser.add_argument("--replace", action="store_true", help="Desativa e regenera pools existentes")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas imprime, sem gravar")
+    args = parser.parse_args()
+    
+    print(f"🔄 Gerando banco de perguntas ({len(args.types) * len(args.levels) * len(args.focus_areas)} pools)...")
+    totals = asyncio.run(run(args))
+    print(
+        f"🎉 Pools gerados: {totals['generated']}, já existentes: {totals['skipped']}, "
+        f"falhas: {totals['failed']}, perguntas: {totals['questions']}"
+    )
+    if totals["failed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ from pathlib import Path
 # Adicionar o diretório app ao path
 sys.path.append(str(Path(__file__).parent / "app"))
 
-from app.db.init_db import create_tables
+from app.db.init_db import run_migrations
 from app.core.config import settings
 import time
 
@@ -48,10 +48,10 @@ def main():
         sys.exit(1)
     
     try:
-        # Criar tabelas
-        print("📋 Criando tabelas...")
-        create_tables()
-        print("✅ Tabelas criadas com sucesso!")
+        # Aplicar migrações
+        print("📋 Aplicando migrações (alembic upgrade head)...")
+        run_migrations()
+        print("✅ Migrações aplicadas com sucesso!")
         
         print("🎉 Banco de dados inicializado com sucesso!")
         
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script para reconciliar os contadores de aplicações de vagas e empresas
+Recalcula os totais a partir da tabela applications e corrige divergências
+"""
+
+import sys
+import os
+import argparse
+
+# Adicionar o diretório backend ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine
+from app.db.application_counters import reconcile_application_counters
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Reconcilia os contadores de aplicações")
+    parser.add_argument("--company-id", type=int, default=None, help="Reconciliar apenas uma empresa")
+    args = parser.parse_args()
+    
+    print("🔄 Reconciliando contadores de aplicações...")
+    
+    try:
+        with engine.begin() as conn:
+            fixed = reconcile_application_counters(conn, company_id=args.company_id)
+        
+        print(f"✅ Vagas corrigidas: {fixed['jobs']}")
+        print(f"✅ Empresas corrigidas: {fixed['companies']}")
+        print("🎉 Reconciliação concluída com sucesso!")
+        
+    except Exception as e:
+        print(f"❌ Erro ao reconciliar contadores: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Script para resetar o banco de dados
-Remove todas as tabelas e as recria
+Remove todas as tabelas e as recria pelas migrações
 """
 
 import sys
@@ -10,7 +10,7 @@ from pathlib import Path
 # Adicionar o diretório app ao path
 sys.path.append(str(Path(__file__).parent / "app"))
 
-from app.db.init_db import create_tables
+from app.db.init_db import run_migrations
 from app.core.config import settings
 from sqlalchemy import create_engine, text
 
@@ -31,7 +31,6 @@ def reset_database():
                 SELECT tablename FROM pg_tables 
                 WHERE schemaname = 'public' 
                 AND tablename NOT LIKE 'pg_%'
-                AND tablename != 'alembic_version'
             """))
             
             tables = [row[0] for row in result]
@@ -44,6 +43,9 @@ def reset_database():
             else:
                 print("ℹ️  Nenhuma tabela encontrada para remover")
             
+            # Remover tipos enum criados pelas migrações
+            conn.execute(text("DROP TYPE IF EXISTS usertype, applicationstatus CASCADE"))
+            
             # Reabilitar verificação de chaves estrangeiras
             conn.execute(text("SET session_replication_role = DEFAULT;"))
             
@@ -51,8 +53,8 @@ def reset_database():
             conn.commit()
         
         # Recriar tabelas
-        print("📋 Recriando tabelas...")
-        create_tables()
+        print("📋 Recriando tabelas (alembic upgrade head)...")
+        run_migrations()
         print("✅ Banco de dados resetado com sucesso!")
         
     except Exception as e:
@@ -188,9 +188,7 @@ function SimulationActiveContent() {
     try {
       const response = await interviewChatbotService.sendMessage(
         session.session_id,
-        currentMessage.trim(),
-        config!,
-        newMessages
+        currentMessage.trim()
       )
 
       const interviewerMessage: ChatMessage = {
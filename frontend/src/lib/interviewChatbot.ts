@@ -42,6 +42,7 @@ export interface ChatResponse {
 export interface InterviewFeedback {
   session_id: string
   feedback: string
+  score?: number | null
   completed_at: string
   total_messages: number
   interview_type: string
@@ -61,18 +62,12 @@ class InterviewChatbotService {
     }
   }
 
-  async sendMessage(
-    sessionId: string,
-    message: string,
-    config: InterviewConfig,
-    conversationHistory: ChatMessage[]
-  ): Promise<ChatResponse> {
+  // O histórico e a configuração ficam na sessão do servidor
+  async sendMessage(sessionId: string, message: string): Promise<ChatResponse> {
     try {
       const response = await api.post(`${this.baseUrl}/chat`, {
         session_id: sessionId,
-        message,
-        config,
-        conversation_history: conversationHistory
+        message
       })
       return response.data
     } catch (error: any) {
@@ -87,15 +82,29 @@ class InterviewChatbotService {
     conversationHistory: ChatMessage[]
   ): Promise<InterviewFeedback> {
     try {
+      // O feedback é gerado em segundo plano; acompanhar o job até terminar
       const response = await api.post(`${this.baseUrl}/end-interview`, {
         session_id: sessionId,
         config,
         conversation_history: conversationHistory
       })
-      return response.data
+      const jobId: string = response.data.job_id
+      let job = response.data
+      const deadline = Date.now() + 3 * 60 * 1000
+      while (job.status !== 'completed' && job.status !== 'failed') {
+        if (Date.now() > deadline) {
+          throw new Error('Tempo esgotado aguardando o feedback da entrevista')
+        }
+        await new Promise((resolve) => setTimeout(resolve, 1500))
+        job = (await api.get(`${this.baseUrl}/end-interview/${jobId}`)).data
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Erro ao gerar feedback da entrevista')
+      }
+      return job
     } catch (error: any) {
       console.error('Erro ao finalizar entrevista:', error)
-      throw new Error(error.response?.data?.detail || 'Erro ao finalizar entrevista')
+      throw new Error(error.response?.data?.detail || error.message || 'Erro ao finalizar entrevista')
     }
   }
 }
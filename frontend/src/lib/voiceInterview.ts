@@ -0,0 +1,190 @@
+import { api } from '@/lib/api'
+
+export interface VoiceTurnMetrics {
+  stt_ms: number | null
+  llm_first_token_ms: number | null
+  first_audio_ms: number | null
+  total_ms: number | null
+  audio_bytes: number
+  sentences: number
+  partial_transcript_reused: boolean
+}
+
+export interface VoiceInterviewHandlers {
+  onPartialTranscript?: (text: string) => void
+  onTranscript?: (text: string) => void
+  onToken?: (content: string) => void
+  onDone?: (interviewerResponse: string, messageId: string) => void
+  onTurnMetrics?: (metrics: VoiceTurnMetrics) => void
+  onSpeakingChange?: (speaking: boolean) => void
+  onError?: (stage: string, detail: string) => void
+}
+
+/**
+ * Entrevista por voz em tempo real: o áudio do microfone vai em trechos pelo
+ * WebSocket e a resposta volta em texto e em áudio, frase a frase
+ */
+export class VoiceInterviewConnection {
+  private socket: WebSocket | null = null
+  private recorder: MediaRecorder | null = null
+  private pendingAudio: { seq: number; text: string } | null = null
+  private playback: Blob[] = []
+  private player: HTMLAudioElement | null = null
+
+  constructor(private sessionId: string, private handlers: VoiceInterviewHandlers = {}) {}
+
+  private socketUrl(): string {
+    const base = (api.defaults.baseURL || '').replace(/^http/, 'ws')
+    const params = new URLSearchParams({ session_id: this.sessionId, audio_format: 'webm' })
+    // Parciais custam uma transcrição extra do turno cada: só quando alguém as exibe
+    if (this.handlers.onPartialTranscript) params.set('partial_transcripts', 'true')
+    return `${base}/interview-chatbot/voice?${params.toString()}`
+  }
+
+  connect(): Promise<void> {
+    return new Promise((resolve, reject) => {
+      const socket = new WebSocket(this.socketUrl())
+      socket.binaryType = 'blob'
+      this.socket = socket
+
+      // O token vai na primeira mensagem, não na URL (que fica em logs de acesso)
+      socket.onopen = () => {
+        socket.send(JSON.stringify({ type: 'auth', token: localStorage.getItem('authToken') || '' }))
+      }
+      socket.onmessage = (event) => {
+        if (typeof event.data !== 'string') {
+          // Frame binário: mp3 da frase anunciada no evento audio anterior
+          if (this.pendingAudio) {
+            this.enqueueAudio(event.data as Blob)
+            this.pendingAudio = null
+          }
+          return
+        }
+        const message = JSON.parse(event.data)
+        switch (message.type) {
+          case 'ready':
+            resolve()
+            break
+          case 'partial_transcript':
+            this.handlers.onPartialTranscript?.(message.text)
+            break
+          case 'transcript':
+            this.handlers.onTranscript?.(message.text)
+            break
+          case 'token':
+            this.handlers.onToken?.(message.content)
+            break
+          case 'audio':
+            this.pendingAudio = { seq: message.seq, text: message.text }
+            break
+          case 'done':
+            this.handlers.onDone?.(message.interviewer_response, message.message_id)
+            break
+          case 'turn_metrics':
+            this.handlers.onTurnMetrics?.(message)
+            break
+          case 'error':
+            this.handlers.onError?.(message.stage, message.detail)
+            break
+        }
+      }
+      socket.onerror = () => reject(new Error('Erro na conexão da entrevista por voz'))
+      socket.onclose = (event) => {
+        if (event.code === 1008) {
+          reject(new Error(event.reason || 'Sessão de entrevista inválida'))
+        }
+      }
+    })
+  }
+
+  /**
+   * Começa a enviar o microfone em trechos de 250 ms; fala do entrevistador em
+   * andamento é interrompida
+   */
+  async startRecording(stream?: MediaStream): Promise<void> {
+    if (!this.socket) throw new Error('Entrevista por voz não conectada')
+    this.interrupt()
+    const input = stream || (await navigator.mediaDevices.getUserMedia({ audio: true }))
+    const recorder = new MediaRecorder(input, { mimeType: 'audio/webm' })
+    recorder.ondataavailable = (event) => {
+      if (event.data.size > 0 && this.socket?.readyState === WebSocket.OPEN) {
+        this.socket.send(event.data)
+      }
+    }
+    recorder.onstop = () => {
+      // O último trecho chega antes do stop: o turno já está completo
+      this.send({ type: 'end_turn' })
+    }
+    recorder.start(250)
+    this.recorder = recorder
+  }
+
+  stopRecording() {
+    if (this.recorder && this.recorder.state !== 'inactive') {
+      this.recorder.stop()
+    }
+    this.recorder = null
+  }
+
+  sendText(message: string) {
+    this.send({ type: 'text', message })
+  }
+
+  replay() {
+    this.send({ type: 'replay' })
+  }
+
+  /**
+   * Para o áudio e cancela a resposta em andamento (ex.: o candidato voltou a falar)
+   */
+  interrupt() {
+    if (this.player || this.playback.length > 0) {
+      this.send({ type: 'cancel' })
+    }
+    this.playback = []
+    if (this.player) {
+      this.player.pause()
+      this.player = null
+      this.handlers.onSpeakingChange?.(false)
+    }
+  }
+
+  close() {
+    this.stopRecording()
+    this.interrupt()
+    this.socket?.close()
+    this.socket = null
+  }
+
+  private send(message: Record<string, unknown>) {
+    if (this.socket?.readyState === WebSocket.OPEN) {
+      this.socket.send(JSON.stringify(message))
+    }
+  }
+
+  private enqueueAudio(audio: Blob) {
+    this.playback.push(audio)
+    if (!this.player) this.playNext()
+  }
+
+  private playNext() {
+    const next = this.playback.shift()
+    if (!next) {
+      this.player = null
+      this.handlers.onSpeakingChange?.(false)
+      return
+    }
+    const url = URL.createObjectURL(new Blob([next], { type: 'audio/mpeg' }))
+    const player = new Audio(url)
+    this.player = player
+    this.handlers.onSpeakingChange?.(true)
+    player.onended = () => {
+      URL.revokeObjectURL(url)
+      if (this.player === player) this.playNext()
+    }
+    player.play().catch(() => {
+      URL.revokeObjectURL(url)
+      if (this.player === player) this.playNext()
+    })
+  }
+}